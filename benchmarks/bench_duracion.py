@@ -0,0 +1,76 @@
+"""Benchmark del cálculo de horas trabajadas.
+
+Compara el cálculo fila a fila original (`df.apply` + `datetime.combine`)
+con el motor columnar de TimeTracker.
+
+Uso:
+    python -m benchmarks.bench_duracion --sizes 100000 1000000 10000000
+"""
+from utils.time_tracker import TimeTracker
+import argparse
+import time as reloj
+from datetime import datetime, timedelta, date
+
+import numpy as np
+import pandas as pd
+
+
+def generar_registros(n, seed=42):
+    """Genera n registros con horas de inicio/fin aleatorias (incluye turnos nocturnos)"""
+    rng = np.random.default_rng(seed)
+    inicio = rng.integers(0, 86400, n)
+    fin = (inicio + rng.integers(0, 12 * 3600, n)) % 86400
+    return pd.DataFrame({
+        'fecha': date(2025, 4, 1),
+        'hora_inicio': TimeTracker.seconds_to_time(inicio),
+        'hora_fin': TimeTracker.seconds_to_time(fin),
+    })
+
+
+def horas_fila_a_fila(df):
+    """Implementación original de standardize_time_records"""
+    def calcular_horas(row):
+        inicio_dt = datetime.combine(row['fecha'], row['hora_inicio'])
+        fin_dt = datetime.combine(row['fecha'], row['hora_fin'])
+        if fin_dt < inicio_dt:
+            fin_dt += timedelta(days=1)
+        return round((fin_dt - inicio_dt).total_seconds() / 3600, 2)
+
+    return df.apply(calcular_horas, axis=1).to_numpy()
+
+
+def horas_columnar(df):
+    """Motor columnar de TimeTracker"""
+    return TimeTracker.calculate_worked_hours_columns(df['hora_inicio'], df['hora_fin'])
+
+
+def medir(funcion, df):
+    """Devuelve (segundos, resultado) de ejecutar funcion(df)"""
+    inicio = reloj.perf_counter()
+    resultado = funcion(df)
+    return reloj.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10**5, 10**6, 10**7])
+    parser.add_argument('--max-baseline', type=int, default=10**6,
+                        help='Tamaño máximo para ejecutar la versión fila a fila')
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} | {'fila a fila (s)':>15} | {'columnar (s)':>12} | {'aceleración':>11}")
+    print("-" * 58)
+    for n in args.sizes:
+        df = generar_registros(n)
+        t_col, horas_col = medir(horas_columnar, df)
+        if n <= args.max_baseline:
+            t_base, horas_base = medir(horas_fila_a_fila, df)
+            assert np.array_equal(horas_base, horas_col), "Los resultados no coinciden"
+            print(f"{n:>10} | {t_base:>15.3f} | {t_col:>12.3f} | {t_base / t_col:>10.1f}x")
+        else:
+            print(f"{n:>10} | {'(omitido)':>15} | {t_col:>12.3f} | {'-':>11}")
+
+
+if __name__ == "__main__":
+    main()
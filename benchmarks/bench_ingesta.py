@@ -0,0 +1,113 @@
+"""Benchmark de la ingesta masiva de eventos (scripts/ingestion.py).
+
+Compara la inserción fila a fila con el ORM (session.add + commit por lote)
+con BulkIngestor sobre la base local, para registros de tiempo, intervalos de
+aplicaciones y capturas. También mide una segunda pasada con los mismos
+eventos, en la que todos se descartan como repetidos.
+
+Uso:
+    python -m benchmarks.bench_ingesta --sizes 10000 100000 --batch-size 10000
+"""
+from models.local_backend import create_local_engine
+from models.entities import Base, RegistroTiempo, RegistroAplicacion, CapturaTrabajo
+from scripts.ingestion import BulkIngestor
+from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta
+import argparse
+import contextlib
+import hashlib
+import io
+import tempfile
+import time as reloj
+
+import numpy as np
+
+APLICACIONES = ['Excel', 'Word', 'AutoCAD', 'Outlook', 'Teams', 'Revit']
+
+
+def eventos(tabla, n, seed):
+    """Eventos sintéticos con claves naturales distintas"""
+    rng = np.random.default_rng(seed)
+    empleado = rng.integers(1, 200, n)
+    # Cada evento tiene su propio segundo del año: la clave natural no se repite
+    segundo = rng.permutation(n) * 7
+    dia, hora = segundo // 86400, segundo % 86400
+    fechas = [(date(2025, 1, 1) + timedelta(days=int(d))).isoformat() for d in dia]
+    horas = [f"{h // 3600:02d}:{h // 60 % 60:02d}:{h % 60:02d}" for h in hora.tolist()]
+    if tabla == 'registro_tiempo':
+        return [{'id_empleado': f'EM{e:03d}', 'id_actividad': int(e % 12 + 1), 'fecha': f,
+                 'hora_inicio': h, 'hora_fin': '18:00:00', 'ubicacion': 'Remoto',
+                 'aplicaciones_usadas': {'apps': APLICACIONES[e % 3:e % 3 + 2]}}
+                for e, f, h in zip(empleado.tolist(), fechas, horas)]
+    if tabla == 'registro_aplicaciones':
+        return [{'id_empleado': f'EM{e:03d}', 'fecha': f, 'hora_inicio': h, 'hora_fin': h,
+                 'nombre_aplicacion': APLICACIONES[e % len(APLICACIONES)]}
+                for e, f, h in zip(empleado.tolist(), fechas, horas)]
+    return [{'id_empleado': f'EM{e:03d}', 'tipo': 'Inicio', 'ruta_imagen': f'/capturas/{i}.png',
+             'fecha_hora': f'{f} {h}', 'hash_archivo': hashlib.sha256(str(i).encode()).hexdigest()}
+            for i, (e, f, h) in enumerate(zip(empleado.tolist(), fechas, horas))]
+
+
+def _orm(tabla, evento):
+    """Objeto ORM de un evento, convirtiendo fechas y horas como haría un cliente"""
+    if tabla == 'capturas_trabajo':
+        return CapturaTrabajo(**{**evento, 'fecha_hora': datetime.fromisoformat(evento['fecha_hora'])})
+    modelo = RegistroTiempo if tabla == 'registro_tiempo' else RegistroAplicacion
+    return modelo(**{**evento, 'fecha': date.fromisoformat(evento['fecha']),
+                     'hora_inicio': time.fromisoformat(evento['hora_inicio']),
+                     'hora_fin': time.fromisoformat(evento['hora_fin'])})
+
+
+def ingesta_orm(engine, tabla, lista, batch_size):
+    """Línea base: un objeto ORM por evento y un commit por lote"""
+    with Session(engine) as session:
+        for inicio in range(0, len(lista), batch_size):
+            session.add_all([_orm(tabla, e) for e in lista[inicio:inicio + batch_size]])
+            session.commit()
+
+
+def medir(tabla, n, batch_size, seed):
+    """Segundos de la línea base ORM, de BulkIngestor y de la segunda pasada"""
+    lista = eventos(tabla, n, seed)
+    tiempos = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for nombre in ('orm', 'bulk'):
+            engine = create_local_engine(f"{tmp}/{nombre}")
+            Base.metadata.create_all(engine)
+            inicio = reloj.perf_counter()
+            if nombre == 'orm':
+                ingesta_orm(engine, tabla, lista, batch_size)
+            else:
+                ingestor = BulkIngestor(engine, batch_size=batch_size)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    resultado = ingestor.ingest(tabla, lista)
+                assert resultado.inserted == n, resultado
+            tiempos[nombre] = reloj.perf_counter() - inicio
+            if nombre == 'bulk':
+                inicio = reloj.perf_counter()
+                resultado = ingestor.ingest(tabla, lista)
+                assert resultado.duplicates == n, resultado
+                tiempos['repetidos'] = reloj.perf_counter() - inicio
+            engine.dispose()
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5])
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'tabla':>22} | {'eventos':>8} | {'ORM (filas/s)':>13} | {'bulk (filas/s)':>14} | "
+          f"{'repetidos (filas/s)':>19}")
+    print("-" * 90)
+    for tabla in ('registro_tiempo', 'registro_aplicaciones', 'capturas_trabajo'):
+        for n in args.sizes:
+            t = medir(tabla, n, args.batch_size, args.seed)
+            print(f"{tabla:>22} | {n:>8} | {n / t['orm']:>13.0f} | {n / t['bulk']:>14.0f} | "
+                  f"{n / t['repetidos']:>19.0f}")
+
+
+if __name__ == "__main__":
+    main()
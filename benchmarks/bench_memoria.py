@@ -0,0 +1,71 @@
+"""Informe de memoria del dataset unificado con y sin la política de tipos.
+
+Genera la base local sintética, construye el dataset unificado con
+DataStandardizer(compact_dtypes=False) y con la política de
+utils/dtype_policy.py, comprueba que los valores coinciden y muestra los
+bytes por fila de cada columna antes y después.
+
+Uso:
+    python -m benchmarks.bench_memoria --registros 100000
+"""
+from models.local_backend import create_local_engine
+from models.entities import Base
+from scripts.data_standardization import DataStandardizer
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+from utils.dtype_policy import DtypePolicy
+from utils.time_tracker import TimeTracker
+import argparse
+import contextlib
+import io
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+def construir(engine, compact_dtypes):
+    """Dataset unificado ordenado por registro (sin imprimir el progreso)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = DataStandardizer(engine, compact_dtypes=compact_dtypes).create_unified_dataset()
+    return df.sort_values('id_registro', ignore_index=True)
+
+
+def comprobar(antes, despues):
+    """Los valores no cambian al compactar (las horas se comparan en segundos)"""
+    for columna in antes.columns:
+        a, d = antes[columna], despues[columna]
+        if columna in ('hora_inicio', 'hora_fin'):
+            iguales = np.array_equal(TimeTracker.to_seconds(a), TimeTracker.to_seconds(d), equal_nan=True)
+        else:
+            a, d = a.astype(object).where(a.notna(), None), d.astype(object).where(d.notna(), None)
+            iguales = np.array_equal(np.asarray(a, dtype=object), np.asarray(d, dtype=object))
+        assert iguales, f"La columna {columna} cambia al compactar"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--registros', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_local_engine(tmp)
+        Base.metadata.create_all(engine)
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(engine, registros=args.registros, seed=args.seed).generate()
+        antes = construir(engine, compact_dtypes=False)
+        despues = construir(engine, compact_dtypes=True)
+        engine.dispose()
+
+    comprobar(antes, despues)
+    reporte = DtypePolicy.memory_report(antes, despues)
+    with pd.option_context('display.max_rows', None, 'display.width', 120):
+        print(f"{len(antes)} filas del dataset unificado\n")
+        print(reporte)
+    total = reporte.loc['TOTAL']
+    print(f"\n{total['bytes_fila_antes']} -> {total['bytes_fila_despues']} bytes por fila "
+          f"({total['reduccion']:.1%} menos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Latencia de las métricas filtradas por periodo (models/query_filter.py).
+
+Genera la base local sintética y mide todas las consultas de
+ProductivityMetrics (con y sin resumen diario) y la extracción de registros de
+tiempo de DataStandardizer para periodos de una semana, un mes, un trimestre y
+el año completo. Con los filtros en la consulta el tiempo depende del número
+de filas del periodo y no del tamaño de las tablas.
+
+Uso:
+    python -m benchmarks.bench_periodo --registros 300000
+"""
+from models.local_backend import create_local_engine
+from models.query_filter import QueryFilter
+from scripts.data_standardization import DataStandardizer
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+from scripts.parallel_metrics import METRIC_QUERIES
+from scripts.sql_metrics import ProductivityMetrics
+import argparse
+import contextlib
+import io
+import tempfile
+import time as reloj
+
+PERIODOS = {
+    'semana': QueryFilter.week('2025-06-11'),
+    'mes': QueryFilter('2025-06-01', '2025-06-30'),
+    'trimestre': QueryFilter('2025-04-01', '2025-06-30'),
+    'año': QueryFilter('2025-01-01', '2025-12-31'),
+}
+
+
+def medir(funcion, repeat):
+    """Mejor tiempo de `funcion`"""
+    tiempos = []
+    for _ in range(repeat):
+        inicio = reloj.perf_counter()
+        funcion()
+        tiempos.append(reloj.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--registros', type=int, default=300000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_local_engine(tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(engine, registros=args.registros, seed=args.seed).generate()
+            ProductivityMetrics(engine).employees.frame()
+
+        print(f"{'periodo':<10} {'registros':>10} {'resumen':>9} {'registro_tiempo':>16} {'extracción':>11}")
+        for nombre, filtro in PERIODOS.items():
+            standardizer = DataStandardizer(engine, validate=False, filters=filtro)
+            filas = len(standardizer.get_time_records())
+            tiempos = []
+            for use_rollup in (True, False):
+                metricas = ProductivityMetrics(engine, use_rollup=use_rollup, filters=filtro)
+                tiempos.append(medir(lambda: [getattr(metricas, m)() for m in METRIC_QUERIES.values()],
+                                     args.repeat))
+            extraccion = medir(standardizer.get_time_records, args.repeat)
+            print(f"{nombre:<10} {filas:>10} {tiempos[0]:>8.3f}s {tiempos[1]:>15.3f}s {extraccion:>10.3f}s")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
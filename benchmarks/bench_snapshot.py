@@ -0,0 +1,110 @@
+"""Benchmark de la instantánea columnar frente al CSV del dataset unificado.
+
+Compara tamaño en disco y tiempo de carga (completa y filtrada por proyecto y
+semana) entre `df.to_csv` y UnifiedSnapshotStore.
+
+Uso:
+    python -m benchmarks.bench_snapshot --sizes 100000 1000000
+"""
+from scripts.snapshot_store import UnifiedSnapshotStore
+from scripts.generate_deliverables import KPI_COLUMNS
+from utils.time_tracker import TimeTracker
+import argparse
+import os
+import tempfile
+import time as reloj
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+def generar_dataset_unificado(n, num_proyectos=20, num_empleados=200, dias=90, seed=42):
+    """Dataset unificado sintético con las columnas que produce DataStandardizer"""
+    rng = np.random.default_rng(seed)
+    id_proyecto = rng.integers(1, num_proyectos + 1, n)
+    id_actividad = id_proyecto * 100 + rng.integers(0, 10, n)
+    empleado = rng.integers(1, num_empleados + 1, n)
+    inicio = rng.integers(6, 14, n) * 3600
+    fin = inicio + rng.integers(1, 9, n) * 3600
+    fechas = np.array([date(2025, 1, 1) + timedelta(days=int(d)) for d in range(dias)], dtype=object)
+    total = rng.integers(0, 5, n).astype(float)
+    rechazados = np.minimum(rng.integers(0, 3, n), total)
+    return pd.DataFrame({
+        'id_registro': np.arange(1, n + 1),
+        'id_empleado': np.char.add('EM', np.char.zfill(empleado.astype(str), 3)).astype(object),
+        'id_actividad': id_actividad,
+        'fecha': fechas[rng.integers(0, dias, n)],
+        'hora_inicio': TimeTracker.seconds_to_time(inicio),
+        'hora_fin': TimeTracker.seconds_to_time(fin),
+        'descripcion_actividad': [f'Trabajo en actividad {a}' for a in id_actividad],
+        'ubicacion': 'Remoto',
+        'aplicaciones_usadas': '{"apps": ["Excel", "Word"]}',
+        'horas_trabajadas': (fin - inicio) / 3600,
+        'nombre_actividad': [f'Actividad {a}' for a in id_actividad],
+        'prioridad': np.array(['Baja', 'Media', 'Alta', 'Urgente'], dtype=object)[rng.integers(0, 4, n)],
+        'estado': 'En Progreso',
+        'id_proyecto': id_proyecto,
+        'nombre_proyecto': [f'Proyecto {p}' for p in id_proyecto],
+        'cliente': [f'Cliente {p % 7}' for p in id_proyecto],
+        'estado_proyecto': 'En Progreso',
+        'total_entregables': total,
+        'calidad_promedio': rng.random(n) * 100,
+        'entregables_aprobados': total - rechazados,
+        'entregables_rechazados': rechazados,
+        'tasa_rechazo': np.where(total > 0, rechazados / np.maximum(total, 1) * 100, 0),
+    })
+
+
+def tamano_en_disco(path):
+    """Tamaño en bytes de un archivo o directorio"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(raiz, f))
+               for raiz, _, archivos in os.walk(path) for f in archivos)
+
+
+def medir(funcion):
+    inicio = reloj.perf_counter()
+    resultado = funcion()
+    return reloj.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        df = generar_dataset_unificado(n)
+        desde, hasta = date(2025, 2, 1), date(2025, 2, 7)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'dataset_unificado.csv')
+            t_csv_w, _ = medir(lambda: df.to_csv(csv_path, index=False))
+            store = UnifiedSnapshotStore(os.path.join(tmp, 'snapshots'))
+            t_pq_w, snapshot_path = medir(lambda: store.save(df, '20250101'))
+
+            t_csv_r, _ = medir(lambda: pd.read_csv(csv_path))
+            t_pq_r, _ = medir(lambda: store.load())
+
+            def csv_filtrado():
+                d = pd.read_csv(csv_path, usecols=KPI_COLUMNS + ['fecha'], parse_dates=['fecha'])
+                return d[(d['id_proyecto'] == 3) & d['fecha'].between(pd.Timestamp(desde), pd.Timestamp(hasta))]
+
+            t_csv_f, _ = medir(csv_filtrado)
+            t_pq_f, _ = medir(lambda: store.load(
+                columns=KPI_COLUMNS, fecha_desde=desde, fecha_hasta=hasta, proyectos=[3]))
+
+            print(f"\n{n} filas")
+            print(f"{'':28} | {'CSV':>10} | {'Parquet':>10}")
+            print("-" * 54)
+            print(f"{'tamaño (MB)':28} | {tamano_en_disco(csv_path) / 2**20:>10.1f} | "
+                  f"{tamano_en_disco(snapshot_path) / 2**20:>10.1f}")
+            print(f"{'escritura (s)':28} | {t_csv_w:>10.3f} | {t_pq_w:>10.3f}")
+            print(f"{'carga completa (s)':28} | {t_csv_r:>10.3f} | {t_pq_r:>10.3f}")
+            print(f"{'carga KPI 1 proyecto/7 días':28} | {t_csv_f:>10.3f} | {t_pq_f:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark de la construcción del dataset unificado.
+
+Compara la cadena original de pd.merge (tiempo x actividades x empleados x
+entregables agregados, con los rechazados en un groupby y merge aparte y la
+tasa de rechazo con `df.apply` fila a fila) con JoinPlanner, sobre los mismos
+DataFrames ya extraídos de la base local sintética.
+
+Uso:
+    python -m benchmarks.bench_union --sizes 10000 100000 1000000
+"""
+from models.local_backend import create_local_engine
+from models.entities import Base
+from scripts.data_standardization import DataStandardizer
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+import argparse
+import contextlib
+import io
+import tempfile
+import time as reloj
+
+import pandas as pd
+
+
+def union_con_merge(df_empleados, df_actividades, df_tiempo_std, df_entregables_std):
+    """Cadena de merges original de DataStandardizer.build_unified_dataset"""
+    df_unified = pd.merge(df_tiempo_std, df_actividades, on='id_actividad', how='left')
+
+    join_columns = ['idempleado']
+    if 'nombres' in df_empleados.columns:
+        join_columns.append('nombres')
+    if 'apellidos' in df_empleados.columns:
+        join_columns.append('apellidos')
+    df_unified = pd.merge(df_unified, df_empleados[join_columns],
+                          left_on='id_empleado', right_on='idempleado', how='left')
+
+    df_entregables_agg = df_entregables_std.groupby(['id_empleado', 'id_actividad'], observed=True).agg({
+        'id_entregable': 'count',
+        'score_calidad': 'mean',
+        'estado': lambda x: (x == 'Aprobado').sum(),
+    }).reset_index()
+    df_entregables_agg.columns = ['id_empleado', 'id_actividad', 'total_entregables',
+                                  'calidad_promedio', 'entregables_aprobados']
+    rechazados = df_entregables_std[df_entregables_std['estado'] == 'Rechazado'].groupby(
+        ['id_empleado', 'id_actividad'], observed=True).size().reset_index(name='entregables_rechazados')
+    df_entregables_agg = pd.merge(df_entregables_agg, rechazados,
+                                  on=['id_empleado', 'id_actividad'], how='left')
+    df_entregables_agg['entregables_rechazados'] = df_entregables_agg['entregables_rechazados'].fillna(0)
+    df_unified = pd.merge(df_unified, df_entregables_agg, on=['id_empleado', 'id_actividad'], how='left')
+
+    df_unified['tasa_rechazo'] = df_unified.apply(
+        lambda x: x['entregables_rechazados'] / x['total_entregables'] * 100
+        if pd.notnull(x.get('total_entregables')) and x.get('total_entregables') > 0
+        else 0, axis=1)
+    return df_unified
+
+
+def medir(funcion, *args, repeticiones=3):
+    """Mejor tiempo de `repeticiones` ejecuciones y el último resultado"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = reloj.perf_counter()
+        resultado = funcion(*args)
+        mejor = min(mejor, reloj.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def extraer(registros, seed):
+    """DataFrames de entrada de build_unified_dataset sobre una base sintética"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_local_engine(tmp)
+        Base.metadata.create_all(engine)
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(engine, registros=registros, seed=seed).generate()
+            standardizer = DataStandardizer(engine)
+            frames = (standardizer.get_cross_database_data(), standardizer.get_activities_data(),
+                      standardizer.get_standardized_time_records(),
+                      standardizer.standardize_deliverables(standardizer.get_deliverables_data()))
+        engine.dispose()
+    return standardizer, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'registros':>10} | {'merge (s)':>10} | {'JoinPlanner (s)':>15} | {'aceleración':>11}")
+    print("-" * 56)
+    for n in args.sizes:
+        standardizer, frames = extraer(n, args.seed)
+        t_merge, esperado = medir(union_con_merge, *frames, repeticiones=args.repeat)
+        t_plan, obtenido = medir(standardizer.build_unified_dataset, *frames, repeticiones=args.repeat)
+
+        esperado = standardizer.dtype_policy.apply(esperado)
+        pd.testing.assert_frame_equal(obtenido, esperado, check_dtype=False, check_categorical=False)
+        print(f"{n:>10} | {t_merge:>10.3f} | {t_plan:>15.3f} | {t_merge / t_plan:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Coste de validar los bloques extraídos (utils/data_validator.py).
+
+Genera la base local sintética y mide la extracción de registros de tiempo y
+entregables con DataStandardizer(validate=False) y con la validación por
+columnas activada, además de la validación del DataFrame ya extraído frente a
+la validación fila a fila con los métodos escalares.
+
+Uso:
+    python -m benchmarks.bench_validacion --registros 200000 --chunk-size 50000
+"""
+from models.local_backend import create_local_engine
+from models.entities import Base
+from scripts.data_standardization import DataStandardizer, TIME_RECORD_RULES
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+from utils.data_validator import DataValidator
+import argparse
+import contextlib
+import io
+import tempfile
+import time as reloj
+
+
+def extraer(engine, validate, chunk_size, repeat):
+    """Mejor tiempo de extraer registros de tiempo y entregables"""
+    tiempos = []
+    for _ in range(repeat):
+        standardizer = DataStandardizer(engine, chunk_size=chunk_size, validate=validate)
+        inicio = reloj.perf_counter()
+        standardizer.get_time_records()
+        standardizer.get_deliverables_data()
+        tiempos.append(reloj.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def fila_a_fila(df):
+    """Línea base: los métodos escalares sobre cada fila"""
+    validator = DataValidator()
+    for fecha, inicio, fin in zip(df['fecha'].astype(str), df['hora_inicio'].astype(str),
+                                  df['hora_fin'].astype(str)):
+        validator.validate_date_format(fecha)
+        validator.validate_time_format(inicio)
+        validator.validate_time_format(fin)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--registros', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_local_engine(tmp)
+        Base.metadata.create_all(engine)
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(engine, registros=args.registros, seed=args.seed).generate()
+        sin = extraer(engine, False, args.chunk_size, args.repeat)
+        con = extraer(engine, True, args.chunk_size, args.repeat)
+        df = DataStandardizer(engine, compact_dtypes=False, validate=False).get_time_records()
+        engine.dispose()
+
+    inicio = reloj.perf_counter()
+    DataValidator().validate_frame(df, TIME_RECORD_RULES)
+    columnas = reloj.perf_counter() - inicio
+    inicio = reloj.perf_counter()
+    fila_a_fila(df)
+    filas = reloj.perf_counter() - inicio
+
+    print(f"Extracción sin validar: {sin:.3f}s, validando: {con:.3f}s ({con / sin - 1:+.1%})")
+    print(f"{len(df)} registros de tiempo: por columnas {columnas:.3f}s, "
+          f"fila a fila {filas:.3f}s ({filas / columnas:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
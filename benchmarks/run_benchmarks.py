@@ -0,0 +1,223 @@
+"""Suite de benchmarks del pipeline sobre la base local sintética.
+
+Mide por separado cada etapa (extracción, estandarización, dataset unificado,
+documento de KPIs y cada consulta de ProductivityMetrics) para varios
+tamaños de datos: tiempo, registros por segundo, RSS máximo y memoria
+asignada y retenida (tracemalloc, en una pasada aparte para no distorsionar
+los tiempos). Los resultados se guardan en JSON y se pueden comparar con una
+ejecución anterior.
+
+Uso:
+    python -m benchmarks.run_benchmarks --sizes 1000 100000 --repeat 3
+    python -m benchmarks.run_benchmarks --sizes 100000 --compare benchmarks/resultados/anterior.json
+"""
+from models.local_backend import create_local_engine
+from models.entities import Base
+from scripts.data_standardization import DataStandardizer
+from scripts.generate_deliverables import generate_kpi_document
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+from scripts.parallel_metrics import METRIC_QUERIES
+from scripts.sql_metrics import ProductivityMetrics
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time as reloj
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados')
+
+
+class MonitorRSS:
+    """Muestrea el RSS del proceso en un hilo para obtener el máximo de una etapa"""
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.maximo = 0
+        self._parar = threading.Event()
+        self._hilo = None
+
+    @staticmethod
+    def rss_actual():
+        """RSS en bytes (/proc en Linux; ru_maxrss como aproximación en otros sistemas)"""
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            import resource
+            maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maximo if platform.system() == 'Darwin' else maximo * 1024
+
+    def _muestrear(self):
+        while not self._parar.is_set():
+            self.maximo = max(self.maximo, self.rss_actual())
+            self._parar.wait(self.intervalo)
+
+    def __enter__(self):
+        self.maximo = self.rss_actual()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._hilo.join()
+        self.maximo = max(self.maximo, self.rss_actual())
+
+
+def _filas(resultado):
+    """Filas del DataFrame producido por una etapa (0 si produce otra cosa)"""
+    if isinstance(resultado, pd.DataFrame):
+        return len(resultado)
+    return 0
+
+
+def definir_etapas(engine, salida):
+    """Lista de (nombre, función) en orden; cada función devuelve el resultado de la etapa"""
+    standardizer = DataStandardizer(engine)
+    datos = {}
+
+    def guardar(nombre, funcion):
+        def ejecutar():
+            datos[nombre] = funcion()
+            return datos[nombre]
+        return ejecutar
+
+    etapas = [
+        ('extraccion.get_cross_database_data', guardar('empleados', standardizer.get_cross_database_data)),
+        ('extraccion.get_activities_data', guardar('actividades', standardizer.get_activities_data)),
+        ('extraccion.get_time_records', guardar('tiempo', standardizer.get_time_records)),
+        ('extraccion.get_deliverables_data', guardar('entregables', standardizer.get_deliverables_data)),
+        ('estandarizacion.standardize_time_records',
+         lambda: standardizer.standardize_time_records(datos['tiempo'].copy())),
+        ('estandarizacion.standardize_deliverables',
+         lambda: standardizer.standardize_deliverables(datos['entregables'].copy())),
+        ('unificado.create_unified_dataset', guardar('unificado', standardizer.create_unified_dataset)),
+        ('kpi.generate_kpi_document',
+         lambda: generate_kpi_document(datos['unificado'], output_dir=salida)),
+    ]
+    for use_rollup, sufijo in [(True, 'resumen'), (False, 'escaneo')]:
+        metrics = ProductivityMetrics(engine, use_rollup=use_rollup)
+        for metodo in METRIC_QUERIES.values():
+            etapas.append((f'metricas_{sufijo}.{metodo}', getattr(metrics, metodo)))
+    return etapas
+
+
+def medir_etapa(funcion, repeticiones, registros):
+    """Tiempos de `repeticiones` ejecuciones y RSS máximo, más una pasada con tracemalloc"""
+    tiempos = []
+    with MonitorRSS() as monitor:
+        for _ in range(repeticiones):
+            inicio = reloj.perf_counter()
+            resultado = funcion()
+            tiempos.append(reloj.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcion()
+    actual, pico = tracemalloc.get_traced_memory()
+    retenidos = sum(stat.size for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+
+    mediana = statistics.median(tiempos)
+    filas = _filas(resultado)
+    return {
+        'segundos_min': round(min(tiempos), 6),
+        'segundos_mediana': round(mediana, 6),
+        'filas': filas,
+        # Rendimiento sobre el volumen de entrada, comparable entre etapas
+        'registros_por_segundo': round(registros / mediana, 1) if mediana > 0 else None,
+        'rss_max_mb': round(monitor.maximo / 2**20, 1),
+        'asignacion_pico_mb': round(pico / 2**20, 2),
+        'retenido_mb': round(retenidos / 2**20, 2),
+    }
+
+
+def ejecutar_tamano(registros, repeticiones, seed, filtro=None):
+    """Genera la base sintética de `registros` registros y mide todas las etapas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_local_engine(tmp)
+        Base.metadata.create_all(engine)
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(engine, registros=registros, seed=seed).generate()
+
+        resultados = {}
+        for nombre, funcion in definir_etapas(engine, tmp):
+            if filtro and filtro not in nombre:
+                continue
+            # Las etapas imprimen su progreso; en el benchmark solo interesa la medición
+            with contextlib.redirect_stdout(io.StringIO()):
+                resultados[nombre] = medir_etapa(funcion, repeticiones, registros)
+            r = resultados[nombre]
+            print(f"  {nombre:58} {r['segundos_mediana']:>9.4f}s {r['filas']:>9} filas "
+                  f"{r['rss_max_mb']:>8.1f} MB RSS {r['asignacion_pico_mb']:>8.2f} MB asig.")
+        engine.dispose()
+    return resultados
+
+
+def metadatos():
+    """Versión del código y del entorno para poder comparar ejecuciones"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {'fecha': datetime.now().isoformat(timespec='seconds'), 'commit': commit or None,
+            'python': platform.python_version(), 'pandas': pd.__version__,
+            'plataforma': platform.platform()}
+
+
+def comparar(actual, anterior_path):
+    """Imprime la variación de la mediana de cada etapa respecto a otra ejecución"""
+    with open(anterior_path, encoding='utf-8') as f:
+        anterior = json.load(f)
+    print(f"\nComparación con {anterior_path} (commit {anterior['metadatos'].get('commit')})")
+    for tamano, etapas in actual['resultados'].items():
+        previas = anterior['resultados'].get(tamano, {})
+        for nombre, r in etapas.items():
+            if nombre not in previas:
+                continue
+            antes, ahora = previas[nombre]['segundos_mediana'], r['segundos_mediana']
+            cambio = (ahora - antes) / antes * 100 if antes else 0
+            marca = ' <-- regresión' if cambio > 20 else ''
+            print(f"  {tamano:>9} {nombre:58} {antes:>9.4f}s -> {ahora:>9.4f}s ({cambio:+.1f}%){marca}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000],
+                        help="Registros de tiempo de cada base sintética")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--filtro', default=None, help="Solo etapas cuyo nombre contenga este texto")
+    parser.add_argument('--output', default=None, help="Archivo JSON de resultados")
+    parser.add_argument('--compare', default=None, help="JSON de una ejecución anterior")
+    args = parser.parse_args()
+
+    informe = {'metadatos': metadatos(), 'parametros': vars(args), 'resultados': {}}
+    for registros in args.sizes:
+        print(f"\n{registros} registros de tiempo")
+        informe['resultados'][str(registros)] = ejecutar_tamano(
+            registros, args.repeat, args.seed, args.filtro)
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {output}")
+
+    if args.compare:
+        comparar(informe, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,4 +14,50 @@ DB_CONFIG = {
 }
 
 # String de conexion para SQLAlchemy
-SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}/{DB_CONFIG['database']}"
\ No newline at end of file
+SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}/{DB_CONFIG['database']}"
+
+# Backend de base de datos: 'mysql' (producción) o 'sqlite' (base local de
+# pruebas y benchmarks en SQLITE_DIR, ver models/local_backend.py)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql').lower()
+SQLITE_DIR = os.getenv('SQLITE_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'sqlite'))
+
+# Ejecución concurrente de las métricas (scripts/parallel_metrics.py)
+METRICS_MAX_WORKERS = int(os.getenv('METRICS_MAX_WORKERS', '4'))
+METRICS_QUERY_TIMEOUT = float(os.getenv('METRICS_QUERY_TIMEOUT', '300'))
+
+# Segundos durante los que se reutiliza la dimensión de empleados sin verificar
+# si cambió gmadministracion.empleados y carpeta donde se guarda (un archivo
+# por URL de conexión, scripts/employee_cache.py)
+EMPLOYEE_CACHE_TTL = float(os.getenv('EMPLOYEE_CACHE_TTL', '3600'))
+EMPLOYEE_CACHE_DIR = os.getenv('EMPLOYEE_CACHE_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'empleados'))
+
+# Pool de conexiones del motor compartido (models/pooling.py)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'si', 'yes')
+
+# Filas por lote de la ingesta masiva de eventos (scripts/ingestion.py)
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '10000'))
+
+# Agente de seguimiento de actividad (scripts/activity_tracker.py): intervalos
+# acumulados antes de escribir, segundos entre escrituras, eventos en cola,
+# segundos sin eventos tras los que se cierra un intervalo y carpeta donde se
+# guardan los lotes mientras la base de datos no está disponible
+TRACKER_FLUSH_SIZE = int(os.getenv('TRACKER_FLUSH_SIZE', '500'))
+TRACKER_FLUSH_INTERVAL = float(os.getenv('TRACKER_FLUSH_INTERVAL', '60'))
+TRACKER_QUEUE_SIZE = int(os.getenv('TRACKER_QUEUE_SIZE', '10000'))
+TRACKER_IDLE_GAP = float(os.getenv('TRACKER_IDLE_GAP', '300'))
+TRACKER_SPILL_DIR = os.getenv('TRACKER_SPILL_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'tracker'))
+
+# Gráficos del documento de KPIs (scripts/kpi_charts.py): procesos que los
+# dibujan, empleados que se muestran en cada ranking y carpeta de la caché
+# de imágenes (una por contenido, se reutiliza mientras los datos no cambien)
+KPI_CHART_WORKERS = int(os.getenv('KPI_CHART_WORKERS', '4'))
+KPI_CHART_TOP = int(os.getenv('KPI_CHART_TOP', '20'))
+KPI_CHART_CACHE_DIR = os.getenv('KPI_CHART_CACHE_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'graficos'))
@@ -1,9 +1,5 @@
 from utils.principles import MonitoringPrinciples
-from scripts.generate_deliverables import generate_kpi_document
-from scripts.insert_test_data import verify_data_exists
-from scripts.sql_metrics import run_metrics_report
-from tests.test_connection import test_mysql_connection
-from scripts.data_standardization import DataStandardizer
+import argparse
 import os
 import sys
 from datetime import datetime
@@ -25,7 +21,21 @@ def show_system_principles():
     print()
 
 
-def main():
+def main(incremental=False, full=False, chunk_size=None, max_memory_mb=None, kpi_formats=('md',),
+         kpi_charts=False):
+    # pandas, SQLAlchemy y pyarrow se importan al ejecutar el pipeline, no al
+    # importar main (ver tests/test_import_time.py)
+    from scripts.generate_deliverables import generate_kpi_document
+    from scripts.insert_test_data import verify_data_exists
+    from scripts.sql_metrics import run_metrics_report
+    from tests.test_connection import test_mysql_connection
+    from scripts.pipeline import PipelineContext
+    from scripts.incremental_extraction import IncrementalExtractor
+    from scripts.data_standardization import DataStandardizer
+    from scripts.snapshot_store import UnifiedSnapshotStore
+    from utils.dtype_policy import DtypePolicy
+    from utils.app_usage import AppUsage
+
     print("=" * 80)
     print(" SISTEMA DE MONITOREO DE PRODUCTIVIDAD REMOTA Y CALIDAD DE ENTREGABLES ")
     print("=" * 80)
@@ -49,14 +59,19 @@ def main():
         return
 
     print("\n3. Iniciando proceso de estandarización de datos...")
-    standardizer = DataStandardizer()
-    df = standardizer.run()
+    # Cada tabla fuente se extrae una sola vez y se comparte entre etapas
+    standardizer = DataStandardizer(chunk_size=chunk_size, max_memory_mb=max_memory_mb)
+    context = PipelineContext(
+        standardizer,
+        incremental=IncrementalExtractor(standardizer) if incremental else None,
+        full=full)
+    df = context.run()
 
     if df is not None and not df.empty:
         print(
             f"\nDataset unificado creado exitosamente con {len(df)} registros")
         print("\n4. Generando documento de KPIs...")
-        kpi_doc = generate_kpi_document()
+        kpi_doc = generate_kpi_document(df, formats=kpi_formats, charts=kpi_charts)
         print(f"Documento de KPIs generado: {kpi_doc}")
 
         # Guardar el dataset unificado
@@ -64,20 +79,50 @@ def main():
         os.makedirs(output_dir, exist_ok=True)
         dataset_file = os.path.join(
             output_dir, f'dataset_unificado_{datetime.now().strftime("%Y%m%d")}.csv')
-        df.to_csv(dataset_file, index=False)
+        # El CSV mantiene las horas como HH:MM:SS aunque en memoria sean segundos
+        DtypePolicy().restore_times(df).to_csv(dataset_file, index=False)
         print(f"\nDataset unificado guardado en: {dataset_file}")
 
+        # Instantánea columnar (Parquet) con los tipos del dataset
+        snapshot_dir = UnifiedSnapshotStore().save(df, apps=context.aplicaciones)
+        print(f"Instantánea columnar guardada en: {snapshot_dir}")
+
+        # Horas por aplicación a partir de la tabla normalizada de aplicaciones
+        apps_file = os.path.join(
+            output_dir, f'horas_por_aplicacion_{datetime.now().strftime("%Y%m%d")}.csv')
+        AppUsage.hours_by_app(context.aplicaciones, context.tiempo).to_csv(apps_file, index=False)
+        print(f"Horas por aplicación guardadas en: {apps_file}")
+
         print("\n[OK] Proceso completado con exito.")
         print("\nEntregables generados:")
         print(f"- Documento de KPIs: {os.path.basename(kpi_doc)}")
         print(f"- Dataset unificado: {os.path.basename(dataset_file)}")
+        print(f"- Instantánea columnar: {os.path.relpath(snapshot_dir, output_dir)}")
+        print(f"- Horas por aplicación: {os.path.basename(apps_file)}")
 
     else:
         print(
             "\n[ERROR] No se pudo completar el proceso debido a errores en los datos.")
 
     print("\n5. Generando métricas SQL de productividad...")
-    metrics_results = run_metrics_report()
+    metrics_results = run_metrics_report(context)
     
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Sistema de monitoreo de productividad remota")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Extrae solo los registros nuevos desde la última ejecución")
+    parser.add_argument('--full', action='store_true',
+                        help="Con --incremental, fuerza una reconciliación completa")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Lee las tablas por bloques de este número de filas")
+    parser.add_argument('--max-memory-mb', type=int, default=None,
+                        help="Límite de memoria para los datos extraídos")
+    parser.add_argument('--formatos', nargs='+', default=['md'], choices=['md', 'html', 'json'],
+                        help="Formatos del documento de KPIs")
+    parser.add_argument('--graficos', action='store_true',
+                        help="Añade gráficos (en caché) al documento de KPIs")
+    args = parser.parse_args()
+    main(incremental=args.incremental, full=args.full,
+         chunk_size=args.chunk_size, max_memory_mb=args.max_memory_mb,
+         kpi_formats=tuple(args.formatos), kpi_charts=args.graficos)
@@ -1,13 +1,54 @@
-from sqlalchemy import Column, Integer, String, Date, Text, Enum, ForeignKey, Float, Boolean, DateTime, Time, JSON, create_engine
+from sqlalchemy import Column, Integer, String, Date, Text, Enum, ForeignKey, Float, Boolean, DateTime, Time, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
-from config.db_config import SQLALCHEMY_DATABASE_URI
+from config.db_config import SQLALCHEMY_DATABASE_URI, DB_BACKEND, SQLITE_DIR
+import threading
 
-# Crear motor de conexion
-engine = create_engine(SQLALCHEMY_DATABASE_URI)
-Session = sessionmaker(bind=engine)
 Base = declarative_base()
 
+# El motor y la fábrica de sesiones se crean la primera vez que se usan, no al
+# importar: importar los modelos no requiere configuración de base de datos
+_engine = None
+_session_factory = None
+_lock = threading.Lock()
+
+
+def get_engine():
+    """Motor de conexión compartido (se crea en la primera llamada)"""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                from models.pooling import create_pooled_engine, instrument_engine
+                if DB_BACKEND == 'sqlite':
+                    from models.local_backend import create_local_engine
+                    engine = instrument_engine(create_local_engine(SQLITE_DIR))
+                    # En el backend local el esquema se crea con el motor
+                    Base.metadata.create_all(engine)
+                else:
+                    # Pool configurable desde config/db_config.py (DB_POOL_*)
+                    engine = create_pooled_engine(SQLALCHEMY_DATABASE_URI)
+                _engine = engine
+    return _engine
+
+
+def get_session_factory():
+    """sessionmaker ligado al motor compartido"""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(bind=get_engine())
+    return _session_factory
+
+
+def __getattr__(name):
+    # Compatibilidad con `from models.entities import engine, Session`
+    if name == 'engine':
+        return get_engine()
+    if name == 'Session':
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class Proyecto(Base):
     __tablename__ = 'proyectos'
     
@@ -43,6 +84,9 @@ class Actividad(Base):
 
 class Asignacion(Base):
     __tablename__ = 'asignaciones'
+    __table_args__ = (
+        Index('ix_asignaciones_actividad_empleado', 'id_actividad', 'id_empleado'),
+    )
     
     id_asignacion = Column(Integer, primary_key=True, autoincrement=True)
     id_actividad = Column(Integer, ForeignKey('actividades.id_actividad', ondelete='CASCADE'), nullable=False)
@@ -54,6 +98,11 @@ class Asignacion(Base):
 
 class CapturaTrabajo(Base):
     __tablename__ = 'capturas_trabajo'
+    # La ingesta descarta las capturas repetidas buscándolas por el hash del
+    # archivo; no es único para que la migración no falle con datos ya repetidos
+    __table_args__ = (
+        Index('ix_capturas_trabajo_hash', 'hash_archivo'),
+    )
     
     id_captura = Column(Integer, primary_key=True, autoincrement=True)
     id_empleado = Column(String(5), nullable=False) 
@@ -65,6 +114,12 @@ class CapturaTrabajo(Base):
 
 class RegistroAplicacion(Base):
     __tablename__ = 'registro_aplicaciones'
+    # Clave natural de un intervalo de uso de una aplicación (la ingesta busca
+    # los repetidos con ella, como en registro_tiempo)
+    __table_args__ = (
+        Index('ix_registro_aplicaciones_intervalo', 'id_empleado', 'fecha', 'hora_inicio',
+              'nombre_aplicacion'),
+    )
     
     id_registro_app = Column(Integer, primary_key=True, autoincrement=True)
     id_empleado = Column(String(5), nullable=False) 
@@ -77,6 +132,15 @@ class RegistroAplicacion(Base):
 
 class RegistroTiempo(Base):
     __tablename__ = 'registro_tiempo'
+    # Índices cubrientes de las métricas sin resumen diario (incluyen las horas)
+    __table_args__ = (
+        Index('ix_registro_tiempo_empleado_actividad_fecha',
+              'id_empleado', 'id_actividad', 'fecha', 'hora_inicio', 'hora_fin'),
+        Index('ix_registro_tiempo_actividad_empleado',
+              'id_actividad', 'id_empleado', 'hora_inicio', 'hora_fin'),
+        # Consultas filtradas por periodo (ver models/query_filter.py)
+        Index('ix_registro_tiempo_fecha', 'fecha'),
+    )
     
     id_registro = Column(Integer, primary_key=True, autoincrement=True)
     id_empleado = Column(String(5), nullable=False) 
@@ -106,6 +170,11 @@ class TipoEntregable(Base):
 
 class Entregable(Base):
     __tablename__ = 'entregables'
+    __table_args__ = (
+        Index('ix_entregables_empleado_actividad_estado', 'id_empleado', 'id_actividad', 'estado'),
+        Index('ix_entregables_actividad_estado', 'id_actividad', 'estado'),
+        Index('ix_entregables_fecha_entrega', 'fecha_entrega'),
+    )
     
     id_entregable = Column(Integer, primary_key=True, autoincrement=True)
     id_actividad = Column(Integer, ForeignKey('actividades.id_actividad'), nullable=False)
@@ -124,6 +193,11 @@ class Entregable(Base):
 
 class EvaluacionCalidad(Base):
     __tablename__ = 'evaluacion_calidad'
+    # Cubre las métricas de calidad sin leer las filas (observaciones es TEXT)
+    __table_args__ = (
+        Index('ix_evaluacion_calidad_entregable', 'id_entregable', 'calificacion_general',
+              'cumple_formato', 'cumple_contenido', 'cumple_normativa'),
+    )
     
     id_evaluacion = Column(Integer, primary_key=True, autoincrement=True)
     id_entregable = Column(Integer, ForeignKey('entregables.id_entregable'), nullable=False)
@@ -156,5 +230,49 @@ class MetricaProductividad(Base):
     indice_productividad = Column(Float(5, 2))
     observaciones = Column(Text)
 
+class ResumenTiempoDiario(Base):
+    """Resumen de registro_tiempo por empleado, actividad y día (tabla rollup)"""
+    __tablename__ = 'resumen_tiempo_diario'
+    # Las métricas por actividad y proyecto agrupan por id_actividad
+    __table_args__ = (
+        Index('ix_resumen_tiempo_diario_actividad', 'id_actividad', 'id_empleado',
+              'segundos_trabajados', 'total_registros'),
+        # Cubriente para las consultas filtradas por periodo
+        Index('ix_resumen_tiempo_diario_fecha', 'fecha', 'id_actividad', 'id_empleado',
+              'segundos_trabajados', 'total_registros'),
+    )
+
+    id_empleado = Column(String(5), primary_key=True)
+    id_actividad = Column(Integer, ForeignKey('actividades.id_actividad'), primary_key=True)
+    fecha = Column(Date, primary_key=True)
+    segundos_trabajados = Column(Integer, nullable=False, default=0)
+    total_registros = Column(Integer, nullable=False, default=0)
+
+class ControlResumen(Base):
+    """Marca de agua de las tablas de resumen (último registro incorporado)"""
+    __tablename__ = 'control_resumenes'
+
+    nombre_resumen = Column(String(50), primary_key=True)
+    ultimo_id = Column(Integer, nullable=False, default=0)
+    fecha_actualizacion = Column(DateTime, nullable=False)
+
+class PanelControl(Base):
+    """Panel de control materializado por empleado y proyecto"""
+    __tablename__ = 'panel_control'
+
+    id_empleado = Column(String(5), primary_key=True)
+    id_proyecto = Column(Integer, ForeignKey('proyectos.id_proyecto'), primary_key=True)
+    nombre_empleado = Column(String(201))
+    nombre_proyecto = Column(String(150))
+    total_actividades = Column(Integer)
+    actividades_completadas = Column(Integer)
+    pct_completado = Column(Float)
+    total_horas = Column(Float)
+    total_entregables = Column(Integer)
+    entregables_aprobados = Column(Integer)
+    entregables_rechazados = Column(Integer)
+    calificacion_promedio = Column(Float)
+    fecha_actualizacion = Column(DateTime, nullable=False)
+
 # La tabla empleados está en otra base de datos (gmadministracion) 
-# y se accede por referencia
\ No newline at end of file
+# y se accede por referencia
@@ -0,0 +1,64 @@
+from sqlalchemy import text
+from models.pooling import pool_status
+
+# Esquemas que usa el sistema (gmadministracion solo para la tabla empleados)
+SCHEMAS = ('gm_monitor_system', 'gmadministracion')
+
+
+def table_row_estimates(connection):
+    """Lista de (esquema, tabla, filas) de todas las tablas en una sola consulta.
+
+    En MySQL las filas son la estimación de information_schema.TABLES (sin
+    recorrer las tablas); en SQLite se cuentan en una única consulta.
+    """
+    if connection.dialect.name == 'mysql':
+        result = connection.execute(text(
+            "SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA IN (:principal, :administracion) AND TABLE_TYPE = 'BASE TABLE' "
+            "ORDER BY TABLE_SCHEMA, TABLE_NAME"),
+            {'principal': SCHEMAS[0], 'administracion': SCHEMAS[1]})
+        return [(esquema, tabla, int(filas or 0)) for esquema, tabla, filas in result]
+
+    tablas = []
+    for esquema, prefijo in ((SCHEMAS[0], 'main'), (SCHEMAS[1], SCHEMAS[1])):
+        try:
+            nombres = connection.execute(text(
+                f"SELECT name FROM {prefijo}.sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY name")).scalars().all()
+        except Exception:
+            continue
+        tablas += [(esquema, prefijo, nombre) for nombre in nombres]
+    if not tablas:
+        return []
+    conteos = ', '.join(f"(SELECT COUNT(*) FROM {prefijo}.{nombre})" for _, prefijo, nombre in tablas)
+    fila = connection.execute(text(f"SELECT {conteos}")).fetchone()
+    return [(esquema, nombre, int(filas)) for (esquema, _, nombre), filas in zip(tablas, fila)]
+
+
+def check_database(engine=None):
+    """Verifica la conexión y muestra versión, tablas con sus filas y el estado del pool"""
+    try:
+        if engine is None:
+            from models.entities import get_engine
+            engine = get_engine()
+        with engine.connect() as connection:
+            if connection.dialect.name == 'sqlite':
+                version = connection.execute(text("SELECT sqlite_version()")).scalar()
+            else:
+                version = connection.execute(text("SELECT VERSION()")).scalar()
+            print(f"Conectado a {connection.dialect.name} version: {version}")
+            tablas = table_row_estimates(connection)
+    except Exception as e:
+        print(f"Error al conectar a la base de datos: {e}")
+        return False
+
+    esquema_actual = None
+    for esquema, tabla, filas in tablas:
+        if esquema != esquema_actual:
+            print(f"\nTablas disponibles en {esquema}:")
+            esquema_actual = esquema
+        print(f"- {tabla}: ~{filas} registros")
+    if not any(esquema == 'gmadministracion' and tabla == 'empleados' for esquema, tabla, _ in tablas):
+        print("\nNo se encontró gmadministracion.empleados")
+    print(f"\nPool de conexiones: {pool_status(engine)}")
+    return True
@@ -0,0 +1,48 @@
+from sqlalchemy import create_engine, event, text
+import os
+
+# Bases de datos del backend local (una por esquema de MySQL)
+ARCHIVO_PRINCIPAL = 'gm_monitor_system.db'
+ARCHIVO_ADMINISTRACION = 'gmadministracion.db'
+
+
+def _time_to_sec(valor):
+    """TIME_TO_SEC de MySQL para los 'HH:MM:SS[.ffffff]' que guarda SQLite"""
+    if valor is None:
+        return None
+    horas, minutos, segundos = str(valor).split(':')
+    return int(horas) * 3600 + int(minutos) * 60 + int(float(segundos))
+
+
+def _concat(*valores):
+    """CONCAT de MySQL: NULL si algún argumento es NULL"""
+    if any(v is None for v in valores):
+        return None
+    return ''.join(str(v) for v in valores)
+
+
+def create_local_engine(directorio):
+    """Motor SQLite que sustituye a MySQL en pruebas y benchmarks.
+
+    Adjunta gmadministracion.db como esquema `gmadministracion` (con la tabla
+    empleados) y registra las funciones de MySQL que usan las consultas de
+    métricas. El esquema de entities.py lo crea Base.metadata.create_all.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    ruta_admin = os.path.join(directorio, ARCHIVO_ADMINISTRACION)
+    engine = create_engine(f"sqlite:///{os.path.join(directorio, ARCHIVO_PRINCIPAL)}")
+
+    @event.listens_for(engine, "connect")
+    def preparar_conexion(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE '{ruta_admin}' AS gmadministracion")
+        dbapi_connection.execute("PRAGMA journal_mode = WAL")
+        dbapi_connection.execute("PRAGMA synchronous = NORMAL")
+        dbapi_connection.execute("PRAGMA temp_store = MEMORY")
+        dbapi_connection.create_function("TIME_TO_SEC", 1, _time_to_sec, deterministic=True)
+        dbapi_connection.create_function("CONCAT", -1, _concat, deterministic=True)
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS gmadministracion.empleados ("
+            "idempleado VARCHAR(5) PRIMARY KEY, nombres VARCHAR(100), apellidos VARCHAR(100))"))
+    return engine
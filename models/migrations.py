@@ -0,0 +1,143 @@
+from sqlalchemy import func, inspect, select
+from sqlalchemy.schema import CreateIndex, CreateTable
+from models.entities import Base
+import argparse
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def missing_tables(connection, metadata=None):
+    """Tablas declaradas en los modelos que aún no existen en la base de datos"""
+    metadata = metadata if metadata is not None else Base.metadata
+    tablas = set(inspect(connection).get_table_names())
+    return [tabla for tabla in metadata.sorted_tables if tabla.name not in tablas]
+
+
+def missing_indexes(connection, metadata=None):
+    """Índices declarados en los modelos que aún no existen en la base de datos"""
+    metadata = metadata if metadata is not None else Base.metadata
+    inspector = inspect(connection)
+    tablas = set(inspector.get_table_names())
+    faltantes = []
+    for tabla in metadata.sorted_tables:
+        if tabla.name not in tablas:
+            # migrate_tables crea la tabla completa con sus índices
+            continue
+        existentes = {indice['name'] for indice in inspector.get_indexes(tabla.name)}
+        faltantes += sorted((i for i in tabla.indexes if i.name not in existentes),
+                            key=lambda i: i.name)
+    return faltantes
+
+
+def index_ddl(indice, dialect):
+    """CREATE INDEX del índice; en MySQL sin bloquear las escrituras de la tabla"""
+    ddl = str(CreateIndex(indice).compile(dialect=dialect))
+    if dialect.name == 'mysql':
+        ddl += " ALGORITHM=INPLACE LOCK=NONE"
+    return ddl
+
+
+def duplicate_check_sql(indice, dialect):
+    """Consulta que lista los valores repetidos que impedirían crear el índice único.
+
+    Las filas con alguna columna NULL no chocan en un índice único, así que
+    no se cuentan.
+    """
+    columnas = list(indice.columns)
+    consulta = select(*columnas, func.count().label('repetidos')) \
+        .where(*[c.isnot(None) for c in columnas if c.nullable]) \
+        .group_by(*columnas).having(func.count() > 1)
+    return str(consulta.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+
+def migrate_tables(engine=None, dry_run=False):
+    """Crea las tablas de entities.py que falten (resumen diario, panel de control...).
+
+    En MySQL el esquema no se crea al conectar, así que las tablas añadidas
+    después del despliegue inicial se crean aquí, con sus índices. Es
+    idempotente. Devuelve los nombres de las tablas creadas (o por crear).
+    """
+    if engine is None:
+        from models.entities import get_engine
+        engine = get_engine()
+    with engine.connect() as connection:
+        faltantes = missing_tables(connection)
+    if not faltantes:
+        print("Las tablas de la base de datos están al día")
+        return []
+
+    if dry_run:
+        for tabla in faltantes:
+            print(f"{str(CreateTable(tabla).compile(dialect=engine.dialect)).strip()};")
+            for indice in sorted(tabla.indexes, key=lambda i: i.name):
+                print(f"{CreateIndex(indice).compile(dialect=engine.dialect)};")
+    else:
+        Base.metadata.create_all(engine, tables=faltantes, checkfirst=True)
+        for tabla in faltantes:
+            print(f"Tabla {tabla.name} creada")
+    return [tabla.name for tabla in faltantes]
+
+
+def migrate_indexes(engine=None, dry_run=False):
+    """Crea los índices de entities.py que falten en tablas ya existentes.
+
+    Es idempotente: los índices presentes no se tocan. Si un índice no se
+    puede crear (p. ej. un índice único sobre datos repetidos) se informa y se
+    sigue con los demás. Con `dry_run` solo muestra las sentencias y, para los
+    índices únicos, la consulta que lista los repetidos que lo impedirían.
+    Devuelve los nombres de los índices creados (o por crear).
+    """
+    if engine is None:
+        from models.entities import get_engine
+        engine = get_engine()
+    with engine.connect() as connection:
+        faltantes = missing_indexes(connection)
+    if not faltantes:
+        print("Los índices de la base de datos están al día")
+        return []
+
+    creados = []
+    fallidos = []
+    for indice in faltantes:
+        ddl = index_ddl(indice, engine.dialect)
+        if dry_run:
+            if indice.unique:
+                print(f"-- Repetidos que impedirían crear {indice.name} (debe devolver 0 filas):")
+                print(f"{duplicate_check_sql(indice, engine.dialect)};")
+            print(f"{ddl};")
+            creados.append(indice.name)
+            continue
+        try:
+            # Un índice por transacción: si uno falla los anteriores se conservan
+            with engine.begin() as connection:
+                connection.exec_driver_sql(ddl)
+        except Exception as e:
+            print(f"Error al crear el índice {indice.name} en {indice.table.name}: {e}")
+            fallidos.append(indice.name)
+            continue
+        print(f"Índice {indice.name} creado en {indice.table.name}")
+        creados.append(indice.name)
+    if fallidos:
+        print(f"Índices no creados ({len(fallidos)}): {', '.join(fallidos)}")
+    return creados
+
+
+def migrate_schema(engine=None, dry_run=False):
+    """Crea las tablas y después los índices que falten; devuelve (tablas, índices)"""
+    return migrate_tables(engine, dry_run), migrate_indexes(engine, dry_run)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crea las tablas y los índices declarados en los modelos")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Mostrar las sentencias sin ejecutarlas")
+    args = parser.parse_args()
+    migrate_schema(dry_run=args.dry_run)
+    if not args.dry_run:
+        from models.entities import get_engine
+        with get_engine().connect() as connection:
+            # Los índices que no se pudieron crear siguen faltando
+            sys.exit(1 if missing_indexes(connection) else 0)
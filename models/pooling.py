@@ -0,0 +1,112 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+from config.db_config import (SQLALCHEMY_DATABASE_URI, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+                              DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING)
+import threading
+import time as reloj
+
+
+class PoolMetrics:
+    """Contadores de uso del pool de conexiones de un motor"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.conexiones = 0
+        self.invalidaciones = 0
+        self.esperas = 0
+        self.segundos_espera = 0.0
+        self.max_en_uso = 0
+        self.max_overflow = 0
+
+    def checkout(self, pool):
+        with self._lock:
+            self.checkouts += 1
+            self.max_en_uso = max(self.max_en_uso, pool.checkedout())
+            if isinstance(pool, QueuePool):
+                self.max_overflow = max(self.max_overflow, pool.overflow())
+
+    def espera(self, segundos):
+        with self._lock:
+            self.esperas += 1
+            self.segundos_espera += segundos
+
+    def sumar(self, contador):
+        with self._lock:
+            setattr(self, contador, getattr(self, contador) + 1)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mide las esperas por una conexión libre.
+
+    Una petición espera cuando el pool y el overflow están agotados y no hay
+    conexiones devueltas; en ese caso se registra el tiempo hasta obtenerla.
+    """
+
+    metricas = None
+
+    def _do_get(self):
+        saturado = (self._max_overflow > -1 and self.overflow() >= self._max_overflow
+                    and self.checkedin() == 0)
+        inicio = reloj.perf_counter()
+        conexion = super()._do_get()
+        if saturado and self.metricas is not None:
+            self.metricas.espera(reloj.perf_counter() - inicio)
+        return conexion
+
+    def recreate(self):
+        # engine.dispose() crea un pool nuevo: los contadores se conservan
+        nuevo = super().recreate()
+        nuevo.metricas = self.metricas
+        return nuevo
+
+
+def instrument_engine(engine):
+    """Registra PoolMetrics en el pool de `engine` (ver pool_status)"""
+    metricas = PoolMetrics()
+    engine.pool.metricas = metricas
+    event.listen(engine, 'connect', lambda *args: metricas.sumar('conexiones'))
+    event.listen(engine, 'checkout', lambda *args: metricas.checkout(engine.pool))
+    event.listen(engine, 'checkin', lambda *args: metricas.sumar('checkins'))
+    event.listen(engine, 'invalidate', lambda *args: metricas.sumar('invalidaciones'))
+    return engine
+
+
+def pool_options(**overrides):
+    """Argumentos de create_engine para el pool según config/db_config.py"""
+    opciones = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+    opciones.update(overrides)
+    return opciones
+
+
+def create_pooled_engine(url=None, **overrides):
+    """Motor con el pool configurado y sus métricas de uso"""
+    return instrument_engine(create_engine(url or SQLALCHEMY_DATABASE_URI, **pool_options(**overrides)))
+
+
+def pool_status(engine):
+    """Configuración, estado actual y contadores del pool de `engine`"""
+    pool = engine.pool
+    estado = {'pool': type(pool).__name__, 'en_uso': pool.checkedout()}
+    if isinstance(pool, QueuePool):
+        estado.update({'tamano': pool.size(), 'max_overflow': pool._max_overflow,
+                       'timeout': pool.timeout(), 'disponibles': pool.checkedin(),
+                       'overflow': max(pool.overflow(), 0)})
+    metricas = getattr(pool, 'metricas', None)
+    if metricas is not None:
+        with metricas._lock:
+            estado.update({'checkouts': metricas.checkouts, 'checkins': metricas.checkins,
+                           'conexiones': metricas.conexiones, 'invalidaciones': metricas.invalidaciones,
+                           'esperas': metricas.esperas,
+                           'segundos_espera': round(metricas.segundos_espera, 4),
+                           'max_en_uso': metricas.max_en_uso,
+                           'max_overflow_usado': max(metricas.max_overflow, 0)})
+    return estado
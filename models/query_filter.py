@@ -0,0 +1,167 @@
+"""Filtros de periodo, proyecto, cliente y empleado para métricas y extracciones.
+
+Un QueryFilter se traduce en condiciones WHERE sobre las columnas de cada
+tabla de hechos (fecha, id_empleado, id_actividad) con sus valores siempre
+como parámetros enlazados, para que la base de datos use los índices y solo
+lea las filas del periodo. Los proyectos y clientes se resuelven con una
+subconsulta sobre actividades, de modo que la tabla de hechos se filtra por
+id_actividad sin tener que unirla antes con proyectos.
+"""
+from models.entities import Actividad, Proyecto
+from sqlalchemy import bindparam, select, text, Date, DateTime
+from datetime import date, datetime, timedelta
+import os
+import sys
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def _fecha(valor):
+    """date a partir de date, datetime o texto 'YYYY-MM-DD'"""
+    if valor is None or (isinstance(valor, date) and not isinstance(valor, datetime)):
+        return valor
+    if isinstance(valor, datetime):
+        return valor.date()
+    return date.fromisoformat(str(valor))
+
+
+def _valores(valores):
+    """Lista de valores (un escalar es una lista de un elemento); None si no se filtra"""
+    if valores is None:
+        return None
+    if isinstance(valores, (str, int)):
+        return [valores]
+    return list(valores)
+
+
+class QueryFilter:
+    """Periodo [fecha_desde, fecha_hasta] (ambos incluidos), proyectos, clientes y empleados.
+
+    Todos los criterios son opcionales y se combinan con AND; un filtro vacío
+    no añade condiciones y las consultas quedan igual que sin filtro.
+    """
+
+    def __init__(self, fecha_desde=None, fecha_hasta=None, proyectos=None, clientes=None, empleados=None):
+        self.fecha_desde = _fecha(fecha_desde)
+        self.fecha_hasta = _fecha(fecha_hasta)
+        if self.fecha_desde and self.fecha_hasta and self.fecha_desde > self.fecha_hasta:
+            raise ValueError(f"Periodo inválido: {self.fecha_desde} es posterior a {self.fecha_hasta}")
+        self.proyectos = _valores(proyectos)
+        self.clientes = _valores(clientes)
+        self.empleados = _valores(empleados)
+
+    @classmethod
+    def week(cls, fecha, **criterios):
+        """Filtro de la semana (lunes a domingo) que contiene `fecha`"""
+        lunes = _fecha(fecha) - timedelta(days=_fecha(fecha).weekday())
+        return cls(lunes, lunes + timedelta(days=6), **criterios)
+
+    @property
+    def has_period(self):
+        return self.fecha_desde is not None or self.fecha_hasta is not None
+
+    def __bool__(self):
+        return self.has_period or any(v is not None for v in (self.proyectos, self.clientes, self.empleados))
+
+    def __repr__(self):
+        return f"QueryFilter({self.params()})"
+
+    def params(self):
+        """Valores de los parámetros enlazados, por nombre.
+
+        filtro_fin es el día siguiente a fecha_hasta: con `< filtro_fin` se
+        incluye todo el último día también en columnas DATETIME.
+        """
+        params = {}
+        if self.fecha_desde is not None:
+            params['filtro_desde'] = self.fecha_desde
+        if self.fecha_hasta is not None:
+            params['filtro_fin'] = self.fecha_hasta + timedelta(days=1)
+        for nombre in ('proyectos', 'clientes', 'empleados'):
+            if getattr(self, nombre) is not None:
+                params[f'filtro_{nombre}'] = getattr(self, nombre)
+        return params
+
+    def _actividades_sql(self):
+        """Subconsulta con las actividades de los proyectos y clientes del filtro"""
+        if self.clientes is None:
+            return "SELECT id_actividad FROM actividades WHERE id_proyecto IN :filtro_proyectos"
+        condiciones = ["fp.cliente IN :filtro_clientes"]
+        if self.proyectos is not None:
+            condiciones.insert(0, "fa.id_proyecto IN :filtro_proyectos")
+        return ("SELECT fa.id_actividad FROM actividades fa "
+                "JOIN proyectos fp ON fa.id_proyecto = fp.id_proyecto "
+                f"WHERE {' AND '.join(condiciones)}")
+
+    def conditions(self, fecha=None, empleado=None, actividad=None, proyecto=None):
+        """Condiciones SQL (texto con parámetros :filtro_*) sobre las columnas indicadas.
+
+        Con `proyecto` los proyectos y clientes se comparan con esa columna;
+        si no, con `actividad` a través de la subconsulta de actividades.
+        """
+        condiciones = []
+        if fecha is not None:
+            if self.fecha_desde is not None:
+                condiciones.append(f"{fecha} >= :filtro_desde")
+            if self.fecha_hasta is not None:
+                condiciones.append(f"{fecha} < :filtro_fin")
+        if empleado is not None and self.empleados is not None:
+            condiciones.append(f"{empleado} IN :filtro_empleados")
+        if self.proyectos is not None or self.clientes is not None:
+            if proyecto is not None:
+                if self.proyectos is not None:
+                    condiciones.append(f"{proyecto} IN :filtro_proyectos")
+                if self.clientes is not None:
+                    condiciones.append(
+                        f"{proyecto} IN (SELECT id_proyecto FROM proyectos WHERE cliente IN :filtro_clientes)")
+            elif actividad is not None:
+                condiciones.append(f"{actividad} IN ({self._actividades_sql()})")
+        return condiciones
+
+    def where(self, prefijo='WHERE', **columnas):
+        """Cláusula `prefijo cond AND cond ...` (cadena vacía si no hay condiciones)"""
+        condiciones = self.conditions(**columnas)
+        return f"{prefijo} {' AND '.join(condiciones)}" if condiciones else ''
+
+    def bind(self, query):
+        """text(query) con los valores del filtro enlazados a los parámetros que usa"""
+        parametros = []
+        for nombre, valor in self.params().items():
+            if f":{nombre}" not in query:
+                continue
+            if isinstance(valor, list):
+                parametros.append(bindparam(nombre, valor, expanding=True))
+            else:
+                parametros.append(bindparam(nombre, valor, type_=Date))
+        return text(query).bindparams(*parametros)
+
+    def clauses(self, fecha=None, empleado=None, actividad=None, proyecto=None):
+        """Las mismas condiciones como expresiones de SQLAlchemy Core sobre columnas del modelo"""
+        condiciones = []
+        if fecha is not None:
+            # Las columnas DATETIME se comparan con el inicio de cada día
+            convertir = ((lambda d: datetime.combine(d, datetime.min.time()))
+                         if isinstance(fecha.type, DateTime) else (lambda d: d))
+            if self.fecha_desde is not None:
+                condiciones.append(fecha >= convertir(self.fecha_desde))
+            if self.fecha_hasta is not None:
+                condiciones.append(fecha < convertir(self.fecha_hasta + timedelta(days=1)))
+        if empleado is not None and self.empleados is not None:
+            condiciones.append(empleado.in_(self.empleados))
+        if self.proyectos is not None or self.clientes is not None:
+            if proyecto is not None:
+                if self.proyectos is not None:
+                    condiciones.append(proyecto.in_(self.proyectos))
+                if self.clientes is not None:
+                    condiciones.append(proyecto.in_(
+                        select(Proyecto.id_proyecto).where(Proyecto.cliente.in_(self.clientes))))
+            elif actividad is not None:
+                actividades = select(Actividad.id_actividad)
+                if self.proyectos is not None:
+                    actividades = actividades.where(Actividad.id_proyecto.in_(self.proyectos))
+                if self.clientes is not None:
+                    actividades = actividades.join(Proyecto, Actividad.id_proyecto == Proyecto.id_proyecto) \
+                        .where(Proyecto.cliente.in_(self.clientes))
+                condiciones.append(actividad.in_(actividades))
+        return condiciones
@@ -0,0 +1,419 @@
+"""Agente de seguimiento de actividad de los empleados.
+
+Recibe eventos de foco de aplicación e inicio/fin de trabajo desde una fuente
+(archivo NDJSON o simulada), une las muestras consecutivas de la misma
+aplicación en intervalos de registro_aplicaciones en memoria y los escribe por
+lotes con BulkIngestor cuando se acumulan `flush_size` intervalos o pasan
+`flush_interval` segundos. Si la base de datos no está disponible los lotes se
+guardan en disco y se reenvían en la siguiente escritura correcta.
+
+Uso:
+    python -m scripts.activity_tracker eventos.ndjson
+    python -m scripts.activity_tracker --simular 100000 --empleados 50
+"""
+from config.db_config import (TRACKER_FLUSH_SIZE, TRACKER_FLUSH_INTERVAL, TRACKER_QUEUE_SIZE,
+                              TRACKER_IDLE_GAP, TRACKER_SPILL_DIR)
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import glob
+import json
+import random
+import time as reloj
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+FOCO = 'foco'
+INICIO = 'inicio'
+FIN = 'fin'
+
+TABLA_APLICACIONES = 'registro_aplicaciones'
+TABLA_CAPTURAS = 'capturas_trabajo'
+
+
+class ActivityEvent:
+    """Evento de un empleado: foco en una aplicación, inicio o fin de trabajo.
+
+    Los eventos de inicio y fin pueden traer la captura de pantalla tomada
+    (ruta_imagen y hash_archivo).
+    """
+
+    __slots__ = ('id_empleado', 'tipo', 'momento', 'aplicacion', 'id_actividad',
+                 'ruta_imagen', 'hash_archivo')
+
+    def __init__(self, id_empleado, tipo, momento, aplicacion=None, id_actividad=None,
+                 ruta_imagen=None, hash_archivo=None):
+        self.id_empleado = id_empleado
+        self.tipo = tipo
+        self.momento = momento
+        self.aplicacion = aplicacion
+        self.id_actividad = id_actividad
+        self.ruta_imagen = ruta_imagen
+        self.hash_archivo = hash_archivo
+
+    @classmethod
+    def from_dict(cls, datos):
+        """Evento a partir de un diccionario (el momento puede ser texto ISO 8601)"""
+        momento = datos['momento']
+        if isinstance(momento, str):
+            momento = datetime.fromisoformat(momento)
+        return cls(datos['id_empleado'], datos.get('tipo', FOCO), momento, datos.get('aplicacion'),
+                   datos.get('id_actividad'), datos.get('ruta_imagen'), datos.get('hash_archivo'))
+
+    def __repr__(self):
+        return f"ActivityEvent({self.id_empleado}, {self.tipo}, {self.momento}, {self.aplicacion})"
+
+
+class FileEventSource:
+    """Eventos de un archivo NDJSON; con `follow` se siguen leyendo las líneas nuevas"""
+
+    def __init__(self, path, follow=False, poll_interval=1.0, chunk_size=1000):
+        self.path = path
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self.chunk_size = chunk_size
+        self.invalid = 0
+
+    async def __aiter__(self):
+        with open(self.path, encoding='utf-8') as f:
+            while True:
+                lineas = f.readlines(self.chunk_size * 128)
+                if not lineas:
+                    if not self.follow:
+                        return
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                for linea in lineas:
+                    if not linea.strip():
+                        continue
+                    try:
+                        yield ActivityEvent.from_dict(json.loads(linea))
+                    except (ValueError, KeyError, TypeError):
+                        self.invalid += 1
+                # Ceder el bucle entre bloques para no bloquear las escrituras
+                await asyncio.sleep(0)
+
+
+class SimulatedEventSource:
+    """Flujo simulado y reproducible de eventos para pruebas y benchmarks.
+
+    Cada empleado empieza a trabajar, cambia de aplicación cada pocos
+    segundos y termina; `rate` limita los eventos por segundo (sin límite por
+    defecto).
+    """
+
+    APLICACIONES = ['Excel', 'Word', 'AutoCAD', 'Outlook', 'Teams', 'Revit', 'Chrome']
+
+    def __init__(self, events=1000, employees=10, seed=42, start=None, rate=None,
+                 mean_samples=5, sample_seconds=10):
+        self.events = events
+        self.employees = [f'EM{i:03d}' for i in range(1, employees + 1)]
+        self.seed = seed
+        self.start = start or datetime(2025, 5, 1, 8)
+        self.rate = rate
+        self.mean_samples = mean_samples
+        self.sample_seconds = sample_seconds
+
+    async def __aiter__(self):
+        rng = random.Random(self.seed)
+        reloj_empleado = {e: self.start for e in self.employees}
+        aplicacion = {e: rng.choice(self.APLICACIONES) for e in self.employees}
+        for e in self.employees:
+            yield ActivityEvent(e, INICIO, self.start, id_actividad=rng.randint(1, 3))
+        for i in range(self.events):
+            empleado = rng.choice(self.employees)
+            reloj_empleado[empleado] += timedelta(seconds=self.sample_seconds)
+            # En promedio `mean_samples` muestras seguidas de la misma aplicación
+            if rng.random() < 1 / self.mean_samples:
+                aplicacion[empleado] = rng.choice(self.APLICACIONES)
+            yield ActivityEvent(empleado, FOCO, reloj_empleado[empleado], aplicacion[empleado])
+            if self.rate:
+                await asyncio.sleep(1 / self.rate)
+            elif i % 1000 == 0:
+                await asyncio.sleep(0)
+        for e in self.employees:
+            yield ActivityEvent(e, FIN, reloj_empleado[e] + timedelta(seconds=self.sample_seconds))
+
+
+class _Intervalo:
+    """Intervalo abierto de uso de una aplicación de un empleado"""
+
+    __slots__ = ('aplicacion', 'id_actividad', 'inicio', 'ultimo')
+
+    def __init__(self, aplicacion, id_actividad, inicio):
+        self.aplicacion = aplicacion
+        self.id_actividad = id_actividad
+        self.inicio = inicio
+        self.ultimo = inicio
+
+
+class ActivityTracker:
+    """Servicio asyncio que convierte eventos en intervalos y los escribe por lotes.
+
+    `submit` encola un evento y espera si la cola está llena (contrapresión).
+    Un consumidor une los focos consecutivos de la misma aplicación en un
+    intervalo abierto por empleado; el intervalo se cierra al cambiar de
+    aplicación, al terminar el trabajo, al cambiar de día o tras `idle_gap`
+    segundos sin eventos del empleado; el temporizador también cierra los que
+    llevan ese tiempo sin eventos aunque no llegue ninguno nuevo (el momento
+    actual es el del último evento recibido más el tiempo de `clock`
+    transcurrido desde entonces). Los intervalos cerrados se escriben cuando hay
+    `flush_size` o cada `flush_interval` segundos, en un hilo para no detener
+    el bucle. Los lotes que no se pueden escribir se guardan en `spill_dir` y
+    se reenvían después (la ingesta descarta por su clave natural los que ya
+    se hubieran guardado).
+    """
+
+    def __init__(self, engine=None, flush_size=None, flush_interval=None, queue_size=None,
+                 idle_gap=None, spill_dir=None, ingestor=None, clock=None):
+        """Inicializa el agente (los valores por defecto están en config/db_config.py).
+
+        `clock` devuelve segundos monótonos (time.monotonic por defecto).
+        """
+        if ingestor is None:
+            from scripts.ingestion import BulkIngestor
+            ingestor = BulkIngestor(engine)
+        self.ingestor = ingestor
+        self.flush_size = flush_size or TRACKER_FLUSH_SIZE
+        self.flush_interval = TRACKER_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.queue_size = queue_size or TRACKER_QUEUE_SIZE
+        self.idle_gap = timedelta(seconds=TRACKER_IDLE_GAP if idle_gap is None else idle_gap)
+        self.spill_dir = spill_dir or TRACKER_SPILL_DIR
+        self.clock = clock or reloj.monotonic
+
+        self._abiertos = {}
+        # Actividad en curso de cada empleado (la fija el evento de inicio)
+        self._actividad = {}
+        self._pendientes = {TABLA_APLICACIONES: [], TABLA_CAPTURAS: []}
+        self._cola = None
+        self._tareas = []
+        self._lock = None
+        self._ultima_escritura = 0.0
+        # Momento del último evento y lectura de `clock` al procesarlo
+        self._ultimo_momento = None
+        self._recibido = None
+        self.stats = {'eventos': 0, 'intervalos': 0, 'capturas': 0, 'escrituras': 0,
+                      'filas_escritas': 0, 'lotes_en_disco': 0, 'lotes_reenviados': 0,
+                      'esperas_cola': 0}
+
+    # --- Entrada de eventos -------------------------------------------------
+
+    async def start(self):
+        """Arranca el consumidor de la cola y el temporizador de escrituras"""
+        if self._cola is None:
+            self._cola = asyncio.Queue(maxsize=self.queue_size)
+            self._lock = asyncio.Lock()
+            self._ultima_escritura = self.clock()
+            self._tareas = [asyncio.create_task(self._consumir()),
+                            asyncio.create_task(self._temporizador())]
+
+    async def submit(self, event):
+        """Encola un evento (ActivityEvent o dict); espera si la cola está llena"""
+        if self._cola.full():
+            self.stats['esperas_cola'] += 1
+        await self._cola.put(event)
+
+    async def run(self, source):
+        """Procesa todos los eventos de `source` y escribe lo pendiente al terminar"""
+        await self.start()
+        async for event in source:
+            await self.submit(event)
+        await self.close()
+        return self.stats
+
+    async def close(self):
+        """Cierra los intervalos abiertos, vacía la cola y escribe lo pendiente"""
+        if self._cola is None:
+            return
+        await self._cola.join()
+        # Cancelar una escritura a medias dejaría su hilo escribiendo a la vez
+        # que la escritura final: las tareas se cancelan fuera de flush
+        async with self._lock:
+            for tarea in self._tareas:
+                tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        for id_empleado in list(self._abiertos):
+            self._cerrar(id_empleado)
+        await self.flush()
+        self._cola = None
+
+    # --- Intervalos ---------------------------------------------------------
+
+    async def _consumir(self):
+        cola = self._cola
+        while True:
+            event = await cola.get()
+            try:
+                self.process(event if isinstance(event, ActivityEvent) else ActivityEvent.from_dict(event))
+            except Exception as e:
+                print(f"Evento descartado ({event!r}): {e}")
+            finally:
+                cola.task_done()
+            if len(self._pendientes[TABLA_APLICACIONES]) >= self.flush_size:
+                # El consumidor espera a la escritura: la cola se llena y submit espera
+                await self.flush()
+
+    def process(self, event):
+        """Incorpora un evento a los intervalos en memoria (sin acceder a la base de datos)"""
+        self.stats['eventos'] += 1
+        self._ultimo_momento = event.momento
+        self._recibido = self.clock()
+        empleado = event.id_empleado
+        abierto = self._abiertos.get(empleado)
+
+        if abierto is not None and (event.momento - abierto.ultimo > self.idle_gap
+                                    or event.momento.date() != abierto.inicio.date()):
+            # Sin actividad o en otro día: el intervalo termina en la última muestra
+            self._cerrar(empleado)
+            abierto = None
+
+        if event.tipo == FOCO:
+            if abierto is not None and abierto.aplicacion == event.aplicacion:
+                abierto.ultimo = event.momento
+                return
+            actividad = abierto.id_actividad if abierto is not None else None
+            if abierto is not None:
+                self._cerrar(empleado, event.momento)
+            if event.aplicacion:
+                self._abiertos[empleado] = _Intervalo(
+                    event.aplicacion, event.id_actividad or actividad or self._actividad.get(empleado),
+                    event.momento)
+            return
+
+        if event.tipo == INICIO:
+            self._actividad[empleado] = event.id_actividad
+        if event.hash_archivo and event.ruta_imagen:
+            self._captura(event)
+        if event.tipo == FIN:
+            if abierto is not None:
+                self._cerrar(empleado, event.momento)
+            self._actividad.pop(empleado, None)
+
+    def close_idle(self):
+        """Cierra los intervalos sin eventos desde hace más de `idle_gap`; devuelve cuántos"""
+        if self._ultimo_momento is None:
+            return 0
+        ahora = self._ultimo_momento + timedelta(seconds=self.clock() - self._recibido)
+        inactivos = [empleado for empleado, intervalo in self._abiertos.items()
+                     if ahora - intervalo.ultimo > self.idle_gap]
+        for empleado in inactivos:
+            self._cerrar(empleado)
+        return len(inactivos)
+
+    def _cerrar(self, id_empleado, fin=None):
+        """Cierra el intervalo abierto del empleado y lo deja pendiente de escribir"""
+        intervalo = self._abiertos.pop(id_empleado, None)
+        if intervalo is None:
+            return
+        fin = fin if fin is not None and fin.date() == intervalo.inicio.date() else intervalo.ultimo
+        if fin <= intervalo.inicio:
+            return
+        self._pendientes[TABLA_APLICACIONES].append({
+            'id_empleado': id_empleado, 'id_actividad': intervalo.id_actividad,
+            'fecha': intervalo.inicio.date().isoformat(),
+            'hora_inicio': intervalo.inicio.strftime('%H:%M:%S'),
+            'hora_fin': fin.strftime('%H:%M:%S'),
+            'nombre_aplicacion': intervalo.aplicacion, 'estado': 'Activo'})
+        self.stats['intervalos'] += 1
+
+    def _captura(self, event):
+        self._pendientes[TABLA_CAPTURAS].append({
+            'id_empleado': event.id_empleado, 'id_actividad': event.id_actividad or self._actividad.get(event.id_empleado),
+            'tipo': 'Inicio' if event.tipo == INICIO else 'Final',
+            'ruta_imagen': event.ruta_imagen,
+            'fecha_hora': event.momento.strftime('%Y-%m-%d %H:%M:%S'),
+            'hash_archivo': event.hash_archivo})
+        self.stats['capturas'] += 1
+
+    # --- Escrituras ---------------------------------------------------------
+
+    async def _temporizador(self):
+        while True:
+            await asyncio.sleep(min(self.flush_interval, 1.0) or 0.1)
+            self.close_idle()
+            if self.clock() - self._ultima_escritura >= self.flush_interval:
+                await self.flush()
+
+    async def flush(self):
+        """Escribe los intervalos y capturas pendientes (o los guarda en disco si falla)"""
+        async with self._lock or asyncio.Lock():
+            self._ultima_escritura = self.clock()
+            lotes = {tabla: filas for tabla, filas in self._pendientes.items() if filas}
+            self._pendientes = {TABLA_APLICACIONES: [], TABLA_CAPTURAS: []}
+            if not lotes:
+                return
+            escritos = await asyncio.to_thread(self._escribir, lotes)
+            if escritos:
+                await asyncio.to_thread(self._reenviar)
+
+    def _escribir(self, lotes):
+        """Escribe cada lote; True si todos se guardaron en la base de datos"""
+        correcto = True
+        for tabla, filas in lotes.items():
+            try:
+                resultado = self.ingestor.ingest(tabla, filas)
+                fallo = resultado.failed > 0
+            except Exception as e:
+                print(f"Error al escribir {tabla}: {e}")
+                fallo = True
+            if fallo:
+                self._guardar_en_disco(tabla, filas)
+                correcto = False
+            else:
+                self.stats['escrituras'] += 1
+                self.stats['filas_escritas'] += resultado.inserted
+        return correcto
+
+    def _guardar_en_disco(self, tabla, filas):
+        """Guarda un lote como NDJSON en spill_dir para reenviarlo más tarde"""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        nombre = os.path.join(self.spill_dir, f"{tabla}-{reloj.time_ns()}.ndjson")
+        with open(f"{nombre}.tmp", 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(fila) + '\n' for fila in filas)
+        os.replace(f"{nombre}.tmp", nombre)
+        self.stats['lotes_en_disco'] += 1
+        print(f"Base de datos no disponible: {len(filas)} filas de {tabla} guardadas en {nombre}")
+
+    def spilled_files(self):
+        """Lotes guardados en disco pendientes de reenviar, del más antiguo al más nuevo"""
+        return sorted(glob.glob(os.path.join(self.spill_dir, '*.ndjson')),
+                      key=lambda ruta: int(ruta.rsplit('-', 1)[1].split('.')[0]))
+
+    def _reenviar(self):
+        """Reenvía los lotes guardados en disco; se detiene en el primero que falla"""
+        for ruta in self.spilled_files():
+            tabla = os.path.basename(ruta).rsplit('-', 1)[0]
+            try:
+                resultado = self.ingestor.ingest(tabla, ruta)
+            except Exception as e:
+                print(f"Error al reenviar {ruta}: {e}")
+                return
+            if resultado.failed:
+                return
+            os.remove(ruta)
+            self.stats['lotes_reenviados'] += 1
+            self.stats['filas_escritas'] += resultado.inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agente de seguimiento de actividad")
+    parser.add_argument('archivo', nargs='?', help="Archivo NDJSON de eventos")
+    parser.add_argument('--seguir', action='store_true', help="Seguir leyendo las líneas nuevas del archivo")
+    parser.add_argument('--simular', type=int, default=0, help="Número de eventos simulados")
+    parser.add_argument('--empleados', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.archivo:
+        source = FileEventSource(args.archivo, follow=args.seguir)
+    else:
+        source = SimulatedEventSource(events=args.simular or 10000, employees=args.empleados)
+    inicio = reloj.perf_counter()
+    stats = asyncio.run(ActivityTracker().run(source))
+    print(f"Seguimiento terminado en {reloj.perf_counter() - inicio:.2f}s: {stats}")
+
+
+if __name__ == "__main__":
+    main()
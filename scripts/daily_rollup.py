@@ -0,0 +1,96 @@
+from models.entities import RegistroTiempo, ResumenTiempoDiario, ControlResumen
+from models.entities import get_engine
+from sqlalchemy import select, func, delete, or_
+from datetime import datetime
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+NOMBRE_RESUMEN = 'resumen_tiempo_diario'
+
+# Segundos de un registro: equivale a TIMESTAMPDIFF(SECOND, CONCAT(fecha, ' ', hora_inicio),
+# CONCAT(fecha, ' ', hora_fin)) sin construir cadenas por fila
+SEGUNDOS_REGISTRO = (func.time_to_sec(RegistroTiempo.hora_fin) -
+                     func.time_to_sec(RegistroTiempo.hora_inicio))
+
+
+def _upsert(connection, seleccion):
+    """INSERT ... SELECT que suma los totales a las filas ya existentes del resumen"""
+    tabla = ResumenTiempoDiario.__table__
+    columnas = ['id_empleado', 'id_actividad', 'fecha', 'segundos_trabajados', 'total_registros']
+
+    if connection.dialect.name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(tabla).from_select(columnas, seleccion)
+        stmt = stmt.on_duplicate_key_update(
+            segundos_trabajados=tabla.c.segundos_trabajados + stmt.inserted.segundos_trabajados,
+            total_registros=tabla.c.total_registros + stmt.inserted.total_registros)
+    elif connection.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(tabla).from_select(columnas, seleccion)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['id_empleado', 'id_actividad', 'fecha'],
+            set_={'segundos_trabajados': tabla.c.segundos_trabajados + stmt.excluded.segundos_trabajados,
+                  'total_registros': tabla.c.total_registros + stmt.excluded.total_registros})
+    else:
+        raise NotImplementedError(
+            f"Resumen diario no soportado para el dialecto {connection.dialect.name}")
+    connection.execute(stmt)
+
+
+def refresh_daily_rollup(engine=None, full=False, recompute_from=None):
+    """Actualiza resumen_tiempo_diario con los registros nuevos de registro_tiempo.
+
+    Solo agrega los registros con id_registro mayor que la marca de agua
+    guardada en control_resumenes. Con `recompute_from` (fecha) se recalculan
+    además los días desde esa fecha, para recoger ediciones y borrados; con
+    `full=True` se reconstruye el resumen completo. Devuelve el número de
+    registros de tiempo incorporados.
+    """
+    engine = engine if engine is not None else get_engine()
+    with engine.begin() as connection:
+        control = connection.execute(
+            select(ControlResumen.ultimo_id)
+            .where(ControlResumen.nombre_resumen == NOMBRE_RESUMEN)).scalar()
+        ultimo_id = 0 if control is None or full else control
+        max_id = connection.execute(select(func.max(RegistroTiempo.id_registro))).scalar() or 0
+
+        if full:
+            connection.execute(delete(ResumenTiempoDiario))
+        elif recompute_from is not None:
+            connection.execute(delete(ResumenTiempoDiario).where(
+                ResumenTiempoDiario.fecha >= recompute_from))
+
+        condicion = RegistroTiempo.id_registro > ultimo_id
+        if recompute_from is not None and not full:
+            condicion = or_(condicion, RegistroTiempo.fecha >= recompute_from)
+        condicion = condicion & (RegistroTiempo.id_registro <= max_id)
+
+        nuevos = connection.execute(
+            select(func.count()).select_from(RegistroTiempo).where(condicion)).scalar()
+        if nuevos:
+            _upsert(connection, select(
+                RegistroTiempo.id_empleado,
+                RegistroTiempo.id_actividad,
+                RegistroTiempo.fecha,
+                func.sum(SEGUNDOS_REGISTRO),
+                func.count()
+            ).where(condicion).group_by(
+                RegistroTiempo.id_empleado, RegistroTiempo.id_actividad, RegistroTiempo.fecha))
+
+        valores = {'ultimo_id': max_id, 'fecha_actualizacion': datetime.now()}
+        if control is None:
+            connection.execute(ControlResumen.__table__.insert().values(
+                nombre_resumen=NOMBRE_RESUMEN, **valores))
+        else:
+            connection.execute(ControlResumen.__table__.update().where(
+                ControlResumen.nombre_resumen == NOMBRE_RESUMEN).values(**valores))
+
+    print(f"Resumen diario actualizado: {nuevos} registros de tiempo incorporados")
+    return nuevos
+
+
+if __name__ == "__main__":
+    refresh_daily_rollup()
@@ -1,13 +1,18 @@
 from models.entities import (Proyecto, Actividad, Asignacion, CapturaTrabajo,
                              RegistroAplicacion, RegistroTiempo, TipoEntregable,
-                             Entregable, EvaluacionCalidad, MetricaProductividad, engine)
+                             Entregable, EvaluacionCalidad, MetricaProductividad)
+from models.entities import get_engine
+from models.query_filter import QueryFilter
 from utils.data_validator import DataValidator
+from utils.time_tracker import TimeTracker
+from utils.app_usage import AppUsage, APP_USAGE_COLUMNS
+from utils.dtype_policy import DtypePolicy
+from scripts.employee_cache import EmployeeCache, EMPLOYEE_COLUMNS
+from utils.join_planner import JoinPlanner, CLAVES_ENTREGABLES, DELIVERABLE_AGG_COLUMNS
 import pandas as pd
 import numpy as np
-from sqlalchemy import select, text
+from sqlalchemy import select, text, or_, func, case, cast, Integer
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-import json
 import os
 import sys
 
@@ -15,11 +20,140 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
+DEFAULT_CHUNK_SIZE = 50000
+
+# Reglas de DataValidator.validate_frame para cada bloque extraído
+TIME_RECORD_RULES = {
+    'id_registro': ['non_empty'],
+    'id_empleado': ['non_empty'],
+    'id_actividad': ['non_empty', ('range', 1, 2 ** 31 - 1)],
+    'fecha': ['non_empty', 'date'],
+    'hora_inicio': ['non_empty', 'time'],
+    'hora_fin': ['non_empty', 'time'],
+}
+DELIVERABLE_RULES = {
+    'id_entregable': ['non_empty'],
+    'id_actividad': ['non_empty'],
+    'id_empleado': ['non_empty'],
+    'fecha_entrega': ['non_empty', 'datetime'],
+    'version': [('range', 1, 2 ** 15 - 1)],
+    'estado': [('choice', Entregable.__table__.c.estado.type.enums)],
+    'calificacion_general': [('range', 0, 10)],
+}
+
+
+class MemoryLimitExceeded(MemoryError):
+    """Los datos extraídos superan el límite de memoria configurado"""
+
+
 class DataStandardizer:
-    def __init__(self):
-        """Inicializa el estandarizador de datos"""
-        self.engine = engine
-        self.validator = DataValidator()
+    def __init__(self, engine=None, chunk_size=None, max_memory_mb=None, compact_dtypes=True,
+                 pushdown_deliverables=False, validate=True, filters=None):
+        """Inicializa el estandarizador de datos (con el motor por defecto si no se indica).
+
+        Con `chunk_size` las consultas se leen por bloques con un cursor del
+        servidor (stream_results) en lugar de materializar todo con fetchall();
+        `max_memory_mb` limita la memoria de los DataFrames acumulados. Con
+        `compact_dtypes` cada bloque extraído se convierte a los tipos
+        compactos de utils/dtype_policy.py (categóricas, enteros de 32/16 bits,
+        booleanos nullable y horas en segundos). Con `pushdown_deliverables`
+        create_unified_dataset agrega los entregables en la base de datos
+        (get_deliverables_aggregate) en lugar de traer cada evaluación. Con
+        `validate` cada bloque extraído de registros de tiempo y entregables
+        se valida por columnas y `validation` guarda, por tabla, el informe de
+        la última extracción (la suma de sus bloques).
+        `filters` (QueryFilter) limita las extracciones a un periodo,
+        proyectos, clientes o empleados en la propia consulta; cada método
+        acepta otro filtro.
+        """
+        self.engine = engine if engine is not None else get_engine()
+        self.validator = DataValidator() if validate else None
+        self.validation = {}
+        self.chunk_size = chunk_size
+        self.max_memory_mb = max_memory_mb
+        self.dtype_policy = DtypePolicy() if compact_dtypes else None
+        self.pushdown_deliverables = pushdown_deliverables
+        self.employees = EmployeeCache(self.engine)
+        self.filters = filters
+
+    def _filter(self, filters=None):
+        """Filtro de una extracción: el recibido, el de la instancia o uno vacío"""
+        filtro = filters if filters is not None else self.filters
+        return filtro if filtro is not None else QueryFilter()
+
+    def _compact(self, df):
+        """Aplica la política de tipos (si está activa)"""
+        if self.dtype_policy is None:
+            return df
+        return self.dtype_policy.apply(df)
+
+    def _reset_validation(self, tabla):
+        """Descarta el informe de la extracción anterior de `tabla`"""
+        self.validation.pop(tabla, None)
+
+    def _validate(self, df, tabla, rules):
+        """Valida un bloque extraído y lo suma al informe de la extracción en curso"""
+        if self.validator is None or df.empty:
+            return df
+        report = self.validator.validate_frame(df, rules)
+        if not report.ok:
+            print(f"Aviso: datos inválidos en {tabla}: {report}")
+        if tabla in self.validation:
+            self.validation[tabla].merge(report)
+        else:
+            self.validation[tabla] = report
+        return df
+
+    def _fetch_frame(self, query):
+        """Ejecuta una consulta y devuelve su resultado como DataFrame"""
+        if self.chunk_size is None:
+            with self.engine.connect() as connection:
+                result = connection.execute(query)
+                df = pd.DataFrame(result.fetchall())
+                if not df.empty:
+                    df.columns = result.keys()
+                return self._compact(df)
+
+        return self._concat(self._accumulate(self._iter_frames(query)))
+
+    def _concat(self, partes):
+        """Une los bloques leídos; con la política de tipos conserva las categóricas"""
+        if not partes:
+            return pd.DataFrame()
+        # infer_objects unifica los bloques en los que una columna venía toda nula
+        if self.dtype_policy is not None:
+            return self.dtype_policy.concat([p.infer_objects() for p in partes])
+        return pd.concat(partes, ignore_index=True).infer_objects()
+
+    def _iter_frames(self, query, chunk_size=None):
+        """Lee una consulta por bloques con un cursor del servidor.
+
+        Cada bloque de filas se convierte directamente en un DataFrame con
+        columnas tipadas, sin acumular las tuplas de todo el resultado.
+        """
+        chunk_size = chunk_size or self.chunk_size or DEFAULT_CHUNK_SIZE
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=chunk_size).execute(query)
+            columnas = list(result.keys())
+            for filas in result.partitions(chunk_size):
+                yield self._compact(pd.DataFrame.from_records(filas, columns=columnas, coerce_float=True))
+
+    def _accumulate(self, frames):
+        """Acumula bloques de DataFrame respetando el límite max_memory_mb"""
+        partes = []
+        memoria = 0
+        limite = self.max_memory_mb * 1024 * 1024 if self.max_memory_mb else None
+        for df in frames:
+            if df.empty:
+                continue
+            memoria += df.memory_usage(deep=True).sum()
+            if limite is not None and memoria > limite:
+                raise MemoryLimitExceeded(
+                    f"Los datos extraídos superan el límite de {self.max_memory_mb} MB; "
+                    f"use un rango de fechas menor o las agregaciones por bloques")
+            partes.append(df)
+        return partes
 
     def get_table_structure(self, table_name="gmadministracion.empleados"):
         """Obtiene la estructura de una tabla para verificar sus columnas"""
@@ -36,107 +170,214 @@ class DataStandardizer:
             print(f"Error al obtener estructura de la tabla: {e}")
             return None
 
-    def get_cross_database_data(self):
-        """Obtiene datos de empleados desde la otra base de datos"""
-        # Primero obtenemos la estructura real
-        self.get_table_structure("gmadministracion.empleados")
-
-        # Ahora intentamos una consulta más segura que solo selecciona idempleado
-        # y los campos que probablemente existan
-        query = text("""
-                    SELECT e.*, 'Activo' as estado
-                    FROM gmadministracion.empleados e
-                    """)
+    def get_cross_database_data(self, filters=None):
+        """Obtiene los empleados de la otra base de datos desde la dimensión en caché.
+
+        Solo incluye id y nombres, con los nombres de columna canónicos de
+        EMPLOYEE_COLUMNS; la estructura de la tabla se detecta una sola vez
+        (ver scripts/employee_cache.py).
+        """
+        filtro = self._filter(filters)
         try:
-            with self.engine.connect() as connection:
-                result = connection.execute(query)
-                df_empleados = pd.DataFrame(result.fetchall())
-                if not df_empleados.empty:
-                    df_empleados.columns = result.keys()
-                    print(
-                        f"Columnas obtenidas de empleados: {df_empleados.columns.tolist()}")
-                return df_empleados
+            df = self.employees.frame()
+            if filtro.empleados is not None:
+                df = df[df['idempleado'].isin(filtro.empleados)].reset_index(drop=True)
+            return self._compact(df)
         except Exception as e:
             print(f"Error al obtener datos de empleados: {e}")
             # Crear un DataFrame mínimo para que el proceso continue
-            return pd.DataFrame({"idempleado": ["EMP01"], "nombre_completo": ["Usuario Temporal"]})
-
-    def get_activities_data(self):
-        """Obtiene datos de actividades y proyectos"""
-        with Session(self.engine) as session:
-            query = (
-                select(
-                    Actividad.id_actividad,
-                    Actividad.nombre_actividad,
-                    Actividad.descripcion,
-                    Actividad.prioridad,
-                    Actividad.fecha_asignacion,
-                    Actividad.fecha_limite,
-                    Actividad.estado,
-                    Proyecto.id_proyecto,
-                    Proyecto.nombre_proyecto,
-                    Proyecto.cliente,
-                    Proyecto.estado.label('estado_proyecto')
-                )
-                .join(Proyecto, Actividad.id_proyecto == Proyecto.id_proyecto)
+            return pd.DataFrame({"idempleado": ["EMP01"], "nombres": ["Usuario Temporal"]})
+
+    def get_activities_data(self, filters=None):
+        """Obtiene datos de actividades y proyectos (del filtro, si tiene proyectos o clientes)"""
+        query = (
+            select(
+                Actividad.id_actividad,
+                Actividad.nombre_actividad,
+                Actividad.descripcion,
+                Actividad.prioridad,
+                Actividad.fecha_asignacion,
+                Actividad.fecha_limite,
+                Actividad.estado,
+                Proyecto.id_proyecto,
+                Proyecto.nombre_proyecto,
+                Proyecto.cliente,
+                Proyecto.estado.label('estado_proyecto')
             )
-
-            result = session.execute(query)
-            df_actividades = pd.DataFrame(result.fetchall())
-            if not df_actividades.empty:
-                df_actividades.columns = result.keys()
-            return df_actividades
-
-    def get_time_records(self):
-        """Obtiene registros de tiempo trabajado"""
-        with Session(self.engine) as session:
-            query = (
-                select(
-                    RegistroTiempo.id_registro,
-                    RegistroTiempo.id_empleado,
-                    RegistroTiempo.id_actividad,
-                    RegistroTiempo.fecha,
-                    RegistroTiempo.hora_inicio,
-                    RegistroTiempo.hora_fin,
-                    RegistroTiempo.descripcion_actividad,
-                    RegistroTiempo.ubicacion,
-                    RegistroTiempo.aplicaciones_usadas
-                )
+            .join(Proyecto, Actividad.id_proyecto == Proyecto.id_proyecto)
+            .where(*self._filter(filters).clauses(proyecto=Proyecto.id_proyecto))
+        )
+
+        return self._fetch_frame(query)
+
+    def _time_records_query(self, desde_id=None, desde_fecha=None, filters=None):
+        """Consulta de registros de tiempo (ver get_time_records)"""
+        query = (
+            select(
+                RegistroTiempo.id_registro,
+                RegistroTiempo.id_empleado,
+                RegistroTiempo.id_actividad,
+                RegistroTiempo.fecha,
+                RegistroTiempo.hora_inicio,
+                RegistroTiempo.hora_fin,
+                RegistroTiempo.descripcion_actividad,
+                RegistroTiempo.ubicacion,
+                RegistroTiempo.aplicaciones_usadas
             )
-
-            result = session.execute(query)
-            df_tiempo = pd.DataFrame(result.fetchall())
-            if not df_tiempo.empty:
-                df_tiempo.columns = result.keys()
-            return df_tiempo
-
-    def get_deliverables_data(self):
-        """Obtiene datos de entregables y su evaluacion"""
-        with Session(self.engine) as session:
-            query = (
-                select(
-                    Entregable.id_entregable,
-                    Entregable.id_actividad,
-                    Entregable.id_empleado,
-                    Entregable.nombre_archivo,
-                    Entregable.fecha_entrega,
-                    Entregable.version,
-                    Entregable.estado,
-                    TipoEntregable.nombre.label('tipo_entregable'),
-                    EvaluacionCalidad.cumple_formato,
-                    EvaluacionCalidad.cumple_contenido,
-                    EvaluacionCalidad.cumple_normativa,
-                    EvaluacionCalidad.calificacion_general
-                )
-                .join(TipoEntregable, Entregable.id_tipo_entregable == TipoEntregable.id_tipo_entregable)
-                .outerjoin(EvaluacionCalidad, Entregable.id_entregable == EvaluacionCalidad.id_entregable)
+            .order_by(RegistroTiempo.id_registro)
+        )
+
+        condiciones = []
+        if desde_id is not None:
+            condiciones.append(RegistroTiempo.id_registro > desde_id)
+        if desde_fecha is not None:
+            condiciones.append(RegistroTiempo.fecha >= desde_fecha)
+        if condiciones:
+            query = query.where(or_(*condiciones))
+        # El filtro se combina con AND con la condición incremental
+        return query.where(*self._filter(filters).clauses(
+            fecha=RegistroTiempo.fecha, empleado=RegistroTiempo.id_empleado,
+            actividad=RegistroTiempo.id_actividad))
+
+    def get_time_records(self, desde_id=None, desde_fecha=None, filters=None):
+        """Obtiene registros de tiempo trabajado.
+
+        Con `desde_id` y/o `desde_fecha` solo devuelve los registros con
+        id_registro mayor que `desde_id` o con fecha igual o posterior a
+        `desde_fecha` (extracción incremental).
+        """
+        self._reset_validation('registro_tiempo')
+        return self._validate(self._fetch_frame(self._time_records_query(desde_id, desde_fecha, filters)),
+                              'registro_tiempo', TIME_RECORD_RULES)
+
+    def iter_time_records(self, chunk_size=None, desde_id=None, desde_fecha=None, filters=None):
+        """Itera los registros de tiempo estandarizados bloque a bloque"""
+        query = self._time_records_query(desde_id, desde_fecha, filters)
+        self._reset_validation('registro_tiempo')
+        for df in self._iter_frames(query, chunk_size):
+            yield self.standardize_time_records(
+                self._validate(df, 'registro_tiempo', TIME_RECORD_RULES))
+
+    def get_standardized_time_records(self, desde_id=None, desde_fecha=None, filters=None):
+        """Registros de tiempo estandarizados.
+
+        En modo por bloques cada bloque se estandariza en cuanto se lee, de modo
+        que nunca coexisten el resultado crudo completo y el estandarizado.
+        """
+        if self.chunk_size is None:
+            return self.standardize_time_records(self.get_time_records(desde_id, desde_fecha, filters))
+        return self._concat(self._accumulate(self.iter_time_records(
+            desde_id=desde_id, desde_fecha=desde_fecha, filters=filters)))
+
+    def aggregate_time_records(self, by=('id_empleado', 'id_actividad', 'fecha'), chunk_size=None,
+                               filters=None):
+        """Total de horas y registros por `by`, agregando bloque a bloque.
+
+        Solo se mantienen en memoria los agregados parciales, por lo que el
+        consumo depende del número de grupos y no del número de registros.
+        """
+        by = list(by)
+        parciales = None
+        for df in self.iter_time_records(chunk_size=chunk_size, filters=filters):
+            if df.empty:
+                continue
+            parcial = df.groupby(by, observed=True).agg(
+                horas_trabajadas=('horas_trabajadas', 'sum'),
+                total_registros=('id_registro', 'count'))
+            parciales = parcial if parciales is None else parciales.add(parcial, fill_value=0)
+
+        if parciales is None:
+            return pd.DataFrame(columns=by + ['horas_trabajadas', 'total_registros'])
+        parciales['total_registros'] = parciales['total_registros'].astype('int64')
+        # Al sumar parciales con categorías distintas el índice vuelve a object
+        return self._compact(parciales.reset_index())
+
+    def get_deliverables_data(self, desde_id=None, desde_id_evaluacion=None, desde_fecha=None, filters=None):
+        """Obtiene datos de entregables y su evaluacion.
+
+        Con los parámetros `desde_*` solo devuelve los entregables nuevos
+        (id_entregable mayor que `desde_id`), los que recibieron una evaluación
+        nueva (id_evaluacion mayor que `desde_id_evaluacion`) o los entregados
+        desde `desde_fecha`, con todas sus evaluaciones.
+        """
+        query = (
+            select(
+                Entregable.id_entregable,
+                Entregable.id_actividad,
+                Entregable.id_empleado,
+                Entregable.nombre_archivo,
+                Entregable.fecha_entrega,
+                Entregable.version,
+                Entregable.estado,
+                TipoEntregable.nombre.label('tipo_entregable'),
+                EvaluacionCalidad.cumple_formato,
+                EvaluacionCalidad.cumple_contenido,
+                EvaluacionCalidad.cumple_normativa,
+                EvaluacionCalidad.calificacion_general
             )
-
-            result = session.execute(query)
-            df_entregables = pd.DataFrame(result.fetchall())
-            if not df_entregables.empty:
-                df_entregables.columns = result.keys()
-            return df_entregables
+            .join(TipoEntregable, Entregable.id_tipo_entregable == TipoEntregable.id_tipo_entregable)
+            .outerjoin(EvaluacionCalidad, Entregable.id_entregable == EvaluacionCalidad.id_entregable)
+            .order_by(Entregable.id_entregable, EvaluacionCalidad.id_evaluacion)
+        )
+
+        condiciones = []
+        if desde_id is not None:
+            condiciones.append(Entregable.id_entregable > desde_id)
+        if desde_id_evaluacion is not None:
+            condiciones.append(Entregable.id_entregable.in_(
+                select(EvaluacionCalidad.id_entregable)
+                .where(EvaluacionCalidad.id_evaluacion > desde_id_evaluacion)))
+        if desde_fecha is not None:
+            condiciones.append(Entregable.fecha_entrega >= desde_fecha)
+        if condiciones:
+            query = query.where(or_(*condiciones))
+        query = query.where(*self._filter(filters).clauses(
+            fecha=Entregable.fecha_entrega, empleado=Entregable.id_empleado,
+            actividad=Entregable.id_actividad))
+
+        self._reset_validation('entregables')
+        return self._validate(self._fetch_frame(query), 'entregables', DELIVERABLE_RULES)
+
+    def get_deliverables_aggregate(self, filters=None):
+        """Agregados de entregables por (empleado, actividad) calculados en SQL.
+
+        Equivale a JoinPlanner.aggregate_deliverables sobre
+        standardize_deliverables(get_deliverables_data()): cuenta una fila por
+        evaluación y los cumplimientos nulos valen 0. SQL solo devuelve
+        enteros (conteos y sumas) y la calidad media se calcula aquí, para no
+        depender de la precisión de la división DECIMAL de MySQL.
+        """
+        formato, contenido, normativa = (func.coalesce(cast(columna, Integer), 0) for columna in (
+            EvaluacionCalidad.cumple_formato, EvaluacionCalidad.cumple_contenido,
+            EvaluacionCalidad.cumple_normativa))
+        cumplimientos = formato + contenido + normativa
+        query = (
+            select(
+                Entregable.id_empleado,
+                Entregable.id_actividad,
+                func.count(Entregable.id_entregable).label('total_entregables'),
+                func.sum(cumplimientos).label('suma_cumplimientos'),
+                func.sum(case((Entregable.estado == 'Aprobado', 1), else_=0)).label('entregables_aprobados'),
+                func.sum(case((Entregable.estado == 'Rechazado', 1), else_=0)).label('entregables_rechazados'),
+            )
+            .join(TipoEntregable, Entregable.id_tipo_entregable == TipoEntregable.id_tipo_entregable)
+            .outerjoin(EvaluacionCalidad, Entregable.id_entregable == EvaluacionCalidad.id_entregable)
+            .where(*self._filter(filters).clauses(
+                fecha=Entregable.fecha_entrega, empleado=Entregable.id_empleado,
+                actividad=Entregable.id_actividad))
+            .group_by(Entregable.id_empleado, Entregable.id_actividad)
+            .order_by(Entregable.id_empleado, Entregable.id_actividad)
+        )
+        df = self._fetch_frame(query)
+        if df.empty:
+            return df
+
+        # MySQL devuelve SUM como DECIMAL
+        for columna in ['total_entregables', 'suma_cumplimientos', 'entregables_aprobados',
+                        'entregables_rechazados']:
+            df[columna] = pd.to_numeric(df[columna]).astype('int64')
+        df['calidad_promedio'] = df.pop('suma_cumplimientos') / 3 * 100 / df['total_entregables']
+        return self._compact(df[CLAVES_ENTREGABLES + DELIVERABLE_AGG_COLUMNS])
 
     def standardize_time_records(self, df_tiempo):
         """Estandariza los registros de tiempo y calcula horas trabajadas"""
@@ -146,39 +387,28 @@ class DataStandardizer:
         # Convertir columnas a tipos adecuados
         df_tiempo['fecha'] = pd.to_datetime(df_tiempo['fecha']).dt.date
 
-        # Asegurar que hora_inicio y hora_fin son objetos de tiempo
-        df_tiempo['hora_inicio'] = pd.to_datetime(
-            df_tiempo['hora_inicio'], format='%H:%M:%S').dt.time
-        df_tiempo['hora_fin'] = pd.to_datetime(
-            df_tiempo['hora_fin'], format='%H:%M:%S').dt.time
-
-        # Calcular duracion (horas trabajadas)
-        def calcular_horas(row):
-            inicio_dt = datetime.combine(row['fecha'], row['hora_inicio'])
-            fin_dt = datetime.combine(row['fecha'], row['hora_fin'])
-
-            # Si la hora de fin es menor que la de inicio, se asume que termino al día siguiente
-            if fin_dt < inicio_dt:
-                fin_dt += timedelta(days=1)
-
-            duracion = (fin_dt - inicio_dt).total_seconds() / 3600
-            return round(duracion, 2)
+        # Pasar hora_inicio y hora_fin a segundos desde medianoche (columnar)
+        inicio_s = TimeTracker.to_seconds(df_tiempo['hora_inicio'])
+        fin_s = TimeTracker.to_seconds(df_tiempo['hora_fin'])
 
-        df_tiempo['horas_trabajadas'] = df_tiempo.apply(calcular_horas, axis=1)
+        # Sin la política de tipos compactos se conservan como objetos de tiempo
+        if self.dtype_policy is None:
+            df_tiempo['hora_inicio'] = TimeTracker.seconds_to_time(inicio_s)
+            df_tiempo['hora_fin'] = TimeTracker.seconds_to_time(fin_s)
 
-        # Procesar el campo JSON de aplicaciones usadas
-        def parse_apps(json_str):
-            if pd.isnull(json_str):
-                return []
-            try:
-                return json.loads(json_str)
-            except:
-                return []
+        # Calcular duracion (horas trabajadas); si la hora de fin es menor que
+        # la de inicio, se asume que termino al día siguiente
+        df_tiempo['horas_trabajadas'] = TimeTracker.seconds_to_hours(
+            TimeTracker.worked_seconds(inicio_s, fin_s))
 
-        df_tiempo['apps_list'] = df_tiempo['aplicaciones_usadas'].apply(
-            parse_apps)
+        # Las aplicaciones usadas se normalizan aparte (ver standardize_app_usage)
+        return self._compact(df_tiempo)
 
-        return df_tiempo
+    def standardize_app_usage(self, df_tiempo):
+        """Tabla larga (id_registro, app) a partir del JSON aplicaciones_usadas"""
+        if df_tiempo.empty or 'aplicaciones_usadas' not in df_tiempo.columns:
+            return pd.DataFrame(columns=APP_USAGE_COLUMNS)
+        return AppUsage.parse(df_tiempo['aplicaciones_usadas'], df_tiempo['id_registro'])
 
     def standardize_deliverables(self, df_entregables):
         """Estandariza los datos de entregables"""
@@ -214,7 +444,7 @@ class DataStandardizer:
         df_entregables['clasificacion_calidad'] = df_entregables['score_calidad'].apply(
             clasificar_calidad)
 
-        return df_entregables
+        return self._compact(df_entregables)
 
 
     def create_unified_dataset(self):
@@ -223,99 +453,54 @@ class DataStandardizer:
         df_empleados = self.get_cross_database_data()
         df_actividades = self.get_activities_data()
         df_tiempo = self.get_time_records()
-        df_entregables = self.get_deliverables_data()
-
-        # Estandarizar datos
         df_tiempo_std = self.standardize_time_records(df_tiempo)
+
+        # Solo los agregados por (empleado, actividad) cruzan la red
+        if self.pushdown_deliverables:
+            return self.build_unified_dataset(
+                df_empleados, df_actividades, df_tiempo_std, pd.DataFrame(),
+                df_entregables_agg=self.get_deliverables_aggregate())
+
+        df_entregables = self.get_deliverables_data()
         df_entregables_std = self.standardize_deliverables(df_entregables)
 
-        # Crear dataset unificado para actividades remotas
-        if not df_tiempo_std.empty and not df_actividades.empty and not df_empleados.empty:
-            # Unir datos de tiempo con actividades
-            df_unified = pd.merge(
-                df_tiempo_std,
-                df_actividades,
-                on='id_actividad',
-                how='left'
-            )
+        return self.build_unified_dataset(
+            df_empleados, df_actividades, df_tiempo_std, df_entregables_std)
 
-            # Ajustar el código de merge con los datos de empleados
-            empleados_columns = df_empleados.columns.tolist()
-            join_columns = ['idempleado']
-
-            # Determinar qué columnas podemos usar basado en lo que existe
-            if 'nombre' in empleados_columns:
-                join_columns.append('nombre')
-            elif 'nombres' in empleados_columns:
-                join_columns.append('nombres')
-            elif 'nombre_completo' in empleados_columns:
-                join_columns.append('nombre_completo')
-
-            if 'apellidos' in empleados_columns:
-                join_columns.append('apellidos')
-            elif 'apellido' in empleados_columns:
-                join_columns.append('apellido')
-
-            if 'email' in empleados_columns:
-                join_columns.append('email')
-
-            # Hacer el merge con solo las columnas disponibles
-            df_unified = pd.merge(
-                df_unified,
-                df_empleados[join_columns],
-                left_on='id_empleado',
-                right_on='idempleado',
-                how='left'
-            )
+    def build_unified_dataset(self, df_empleados, df_actividades, df_tiempo_std, df_entregables_std,
+                              df_entregables_agg=None):
+        """Une los DataFrames ya extraidos y estandarizados en el dataset unificado.
 
-            # Agregar métricas de entregables si existen
-            if not df_entregables_std.empty:
-                # Agrupar entregables por empleado y actividad
-                df_entregables_agg = df_entregables_std.groupby(['id_empleado', 'id_actividad']).agg({
-                    'id_entregable': 'count',
-                    'score_calidad': 'mean',
-                    'estado': lambda x: (x == 'Aprobado').sum(),
-                }).reset_index()
-
-                df_entregables_agg.columns = [
-                    'id_empleado', 'id_actividad', 'total_entregables',
-                    'calidad_promedio', 'entregables_aprobados'
-                ]
-
-                # Calcular entregables rechazados
-                rechazados = df_entregables_std[df_entregables_std['estado'] == 'Rechazado'].groupby(
-                    ['id_empleado', 'id_actividad']).size().reset_index(name='entregables_rechazados')
-
-                if not rechazados.empty:
-                    df_entregables_agg = pd.merge(
-                        df_entregables_agg,
-                        rechazados,
-                        on=['id_empleado', 'id_actividad'],
-                        how='left'
-                    )
-                    df_entregables_agg['entregables_rechazados'] = df_entregables_agg['entregables_rechazados'].fillna(
-                        0)
-                else:
-                    df_entregables_agg['entregables_rechazados'] = 0
-
-                df_unified = pd.merge(
-                    df_unified,
-                    df_entregables_agg,
-                    on=['id_empleado', 'id_actividad'],
-                    how='left'
-                )
-
-                # Calcular tasa de rechazo
-                df_unified['tasa_rechazo'] = df_unified.apply(
-                    lambda x: x['entregables_rechazados'] /
-                    x['total_entregables'] * 100
-                    if pd.notnull(x.get('total_entregables')) and x.get('total_entregables') > 0
-                    else 0, axis=1
-                )
+        Las dimensiones (actividades con su proyecto y empleados) se indexan una
+        vez y se llevan a los registros de tiempo con JoinPlanner; los
+        entregables se agregan en una sola pasada por (empleado, actividad),
+        salvo que se pasen ya agregados en `df_entregables_agg`.
+        """
+        if df_tiempo_std.empty or df_actividades.empty or df_empleados.empty:
+            return pd.DataFrame()
 
-            return df_unified
+        # La dimensión de empleados ya trae los nombres de columna canónicos
+        join_columns = [c for c in EMPLOYEE_COLUMNS if c in df_empleados.columns]
+
+        planner = JoinPlanner(df_tiempo_std)
+        planner.join(df_actividades, 'id_actividad')
+        planner.join(df_empleados, 'id_empleado', 'idempleado', columns=join_columns)
+
+        # Agregar métricas de entregables si existen
+        if df_entregables_agg is None and not df_entregables_std.empty:
+            df_entregables_agg = JoinPlanner.aggregate_deliverables(df_entregables_std)
+        hay_entregables = df_entregables_agg is not None and not df_entregables_agg.empty
+        if hay_entregables:
+            planner.join(df_entregables_agg, CLAVES_ENTREGABLES, columns=DELIVERABLE_AGG_COLUMNS)
+        df_unified = planner.result()
+
+        if hay_entregables:
+            df_unified['tasa_rechazo'] = JoinPlanner.rejection_rate(
+                df_unified['total_entregables'], df_unified['entregables_rechazados'])
+
+        # Las columnas tomadas de las dimensiones vuelven a los tipos compactos
+        return self._compact(df_unified)
 
-        return pd.DataFrame()
     def run(self):
         """Metodo de ejecución principal para estandarizar datos y crear un conjunto de datos unificado"""
         print("Ejecutando proceso de estandarización de datos...")
@@ -0,0 +1,159 @@
+from models.entities import get_engine
+from config.db_config import EMPLOYEE_CACHE_TTL, EMPLOYEE_CACHE_DIR
+from sqlalchemy import text
+from datetime import datetime
+import hashlib
+import pickle
+import threading
+import time as reloj
+import os
+import sys
+
+import pandas as pd
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+EMPLOYEE_TABLE = 'gmadministracion.empleados'
+
+# Nombre canónico -> columnas posibles en gmadministracion.empleados, por preferencia
+EMPLOYEE_COLUMNS = {
+    'idempleado': ['idempleado'],
+    'nombres': ['nombre', 'nombres', 'nombre_completo'],
+    'apellidos': ['apellidos', 'apellido'],
+    'email': ['email'],
+}
+
+
+class EmployeeCache:
+    """Dimensión de empleados de gmadministracion.empleados guardada en disco.
+
+    Las columnas de la tabla se detectan una sola vez y se guarda solo la
+    proyección id + nombres (con nombres canónicos). Pasados `ttl` segundos
+    se consulta una suma de verificación de la tabla y solo se vuelve a leer
+    si cambió. `name()` y `add_names()` sustituyen al LEFT JOIN entre bases
+    de datos de las consultas de métricas.
+    """
+
+    def __init__(self, engine=None, cache_dir=None, ttl=None):
+        """Inicializa la caché (EMPLOYEE_CACHE_DIR por defecto; `ttl` en segundos)"""
+        self.engine = engine if engine is not None else get_engine()
+        self.cache_dir = cache_dir or EMPLOYEE_CACHE_DIR
+        self.ttl = EMPLOYEE_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entrada = None
+        self._verificado = None
+
+    def _ruta(self):
+        url = self.engine.url.render_as_string(hide_password=True)
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.pkl")
+
+    @staticmethod
+    def probe_columns(connection):
+        """Columnas disponibles de la tabla de empleados con su nombre canónico"""
+        result = connection.execute(text(f"SELECT * FROM {EMPLOYEE_TABLE} WHERE 1 = 0"))
+        disponibles = list(result.keys())
+        result.close()
+        columnas = {}
+        for canonica, alternativas in EMPLOYEE_COLUMNS.items():
+            encontradas = [c for c in alternativas if c in disponibles]
+            if encontradas:
+                columnas[canonica] = encontradas[0]
+        if 'idempleado' not in columnas:
+            raise ValueError(f"{EMPLOYEE_TABLE} no tiene la columna idempleado")
+        return columnas
+
+    @staticmethod
+    def checksum(connection, columnas):
+        """Suma de verificación de la tabla (CHECKSUM TABLE en MySQL).
+
+        En otros motores se usan las filas, el máximo id y la longitud total
+        de las columnas leídas.
+        """
+        if connection.dialect.name == 'mysql':
+            return connection.execute(text(f"CHECKSUM TABLE {EMPLOYEE_TABLE}")).fetchone()[1]
+        longitudes = ' + '.join(f"LENGTH(COALESCE({c}, ''))" for c in columnas.values())
+        fila = connection.execute(text(
+            f"SELECT COUNT(*), MAX({columnas['idempleado']}), SUM({longitudes}) "
+            f"FROM {EMPLOYEE_TABLE}")).fetchone()
+        return tuple(fila)
+
+    def _cargar(self, connection, columnas, checksum):
+        """Lee la proyección id + nombres y la guarda en disco"""
+        seleccion = ', '.join(f"{real} AS {canonica}" for canonica, real in columnas.items())
+        result = connection.execute(text(f"SELECT {seleccion} FROM {EMPLOYEE_TABLE}"))
+        df = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        nombres = df['nombres'] if 'nombres' in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if 'apellidos' in df.columns:
+            # CONCAT de MySQL: nulo si alguna de las partes es nula
+            nombres = nombres + ' ' + df['apellidos']
+        entrada = {'columnas': columnas, 'checksum': checksum, 'df': df,
+                   'nombres': dict(zip(df['idempleado'], nombres.where(nombres.notna(), None))),
+                   'cargado': datetime.now()}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporal = f"{self._ruta()}.{threading.get_ident()}.tmp"
+        with open(temporal, 'wb') as f:
+            pickle.dump(entrada, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, self._ruta())
+        print(f"Dimensión de empleados actualizada: {len(df)} empleados")
+        return entrada
+
+    def _leer_disco(self):
+        if not os.path.exists(self._ruta()):
+            return None
+        try:
+            with open(self._ruta(), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def _actual(self, force=False):
+        """Entrada vigente, verificando la tabla si venció el TTL"""
+        with self._lock:
+            if (not force and self._entrada is not None and self._verificado is not None
+                    and reloj.monotonic() - self._verificado < self.ttl):
+                return self._entrada
+            entrada = self._entrada or self._leer_disco()
+            with self.engine.connect() as connection:
+                try:
+                    columnas = entrada['columnas'] if entrada else self.probe_columns(connection)
+                    checksum = self.checksum(connection, columnas)
+                except Exception:
+                    # La estructura cambió: se vuelven a detectar las columnas
+                    connection.rollback()
+                    columnas = self.probe_columns(connection)
+                    checksum = self.checksum(connection, columnas)
+                if force or entrada is None or entrada['columnas'] != columnas \
+                        or entrada['checksum'] != checksum:
+                    entrada = self._cargar(connection, columnas, checksum)
+            self._entrada, self._verificado = entrada, reloj.monotonic()
+            return entrada
+
+    def refresh(self):
+        """Vuelve a leer la tabla de empleados aunque no haya cambiado"""
+        return self._actual(force=True)['df'].copy()
+
+    def frame(self):
+        """Proyección id + nombres (idempleado, nombres, apellidos y email si existen)"""
+        return self._actual()['df'].copy()
+
+    def columns(self):
+        """Nombre canónico -> columna real en gmadministracion.empleados"""
+        return dict(self._actual()['columnas'])
+
+    def names(self):
+        """Diccionario id_empleado -> 'nombres apellidos'"""
+        return self._actual()['nombres']
+
+    def name(self, id_empleado):
+        """Nombre completo de un empleado (None si no existe)"""
+        return self.names().get(id_empleado)
+
+    def add_names(self, df, id_column='id_empleado', position=1, name_column='nombre_empleado'):
+        """Inserta `name_column` con el nombre de cada `id_column` (en el mismo DataFrame)"""
+        if df.empty or id_column not in df.columns:
+            return df
+        nombres = self.names()
+        df.insert(position, name_column, [nombres.get(i) for i in df[id_column]])
+        return df
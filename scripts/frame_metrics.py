@@ -0,0 +1,295 @@
+from scripts.sql_metrics import ProductivityMetrics, DASHBOARD_COLUMNS
+from utils.time_tracker import TimeTracker
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+class DataFrameMetrics(ProductivityMetrics):
+    """Métricas de productividad calculadas sobre los DataFrames de un PipelineContext.
+
+    Reproduce la semántica de las consultas de ProductivityMetrics (mismas
+    columnas, agrupaciones y orden) sin volver a consultar MySQL. Los datos
+    ya vienen filtrados por el DataStandardizer del contexto, así que los
+    métodos no admiten otro filtro ni el panel materializado (ValueError), y
+    los que solo existen en SQL (métricas del periodo, vista y tabla del
+    panel) lanzan NotImplementedError.
+    """
+
+    # Los cálculos en pandas comparten el contexto y el GIL: sin hilos
+    max_workers = 1
+
+    def __init__(self, context):
+        """Inicializa las métricas a partir de un PipelineContext ya creado"""
+        standardizer = context.standardizer
+        super().__init__(standardizer.engine, use_rollup=False, employees=standardizer.employees)
+        self.context = context
+
+    @staticmethod
+    def _sin_filtro(filters, metodo):
+        """Rechaza un filtro propio: las métricas usan las filas ya extraídas del contexto"""
+        if filters:
+            raise ValueError(f"{metodo}: filters no se aplica a un PipelineContext; "
+                             "filtre el DataStandardizer del contexto")
+
+    @staticmethod
+    def _solo_sql(metodo):
+        """Métodos de ProductivityMetrics que solo se pueden resolver en la base de datos"""
+        raise NotImplementedError(f"{metodo} necesita la base de datos: use ProductivityMetrics")
+
+    @staticmethod
+    def _tipos_sql(resultado):
+        """Devuelve las columnas con los tipos de las consultas SQL.
+
+        Las categóricas vuelven a su tipo base, los enteros compactos o
+        nullable a int64 (float64 si tienen nulos) y los Float64 nullable a
+        float64 con NaN.
+        """
+        for columna in resultado.columns:
+            serie = resultado[columna]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                serie = serie.astype(serie.cat.categories.dtype)
+            if pd.api.types.is_bool_dtype(serie.dtype):
+                continue
+            if pd.api.types.is_integer_dtype(serie.dtype):
+                serie = serie.astype('float64' if serie.hasnans else 'int64')
+            elif pd.api.types.is_float_dtype(serie.dtype):
+                serie = pd.Series(serie.to_numpy(dtype='float64', na_value=np.nan), index=serie.index)
+            resultado[columna] = serie
+        return resultado
+
+    @staticmethod
+    def _redondear(serie, decimales=2):
+        """ROUND de SQL: los empates se alejan del cero (pandas redondea al par).
+
+        El margen relativo absorbe el error de representación binaria, como
+        hacen MySQL (DECIMAL) y SQLite al redondear 8.125 a 8.13.
+        """
+        valores = pd.to_numeric(serie, errors='coerce').astype('float64')
+        factor = 10 ** decimales
+        escalado = valores.abs() * factor
+        redondeado = np.floor(escalado + 0.5 + escalado * 1e-12) / factor
+        return (np.sign(valores) * redondeado).astype('float64')
+
+    def _entregables_unicos(self):
+        """Entregables sin duplicar por evaluación (equivale a la tabla entregables)"""
+        df = self.context.entregables
+        if df.empty:
+            return df
+        return df.drop_duplicates('id_entregable')
+
+    def _nombres_empleados(self):
+        """Serie id_empleado -> CONCAT(nombres, ' ', apellidos)"""
+        df_empleados = self.context.empleados
+        if df_empleados.empty or not {'idempleado', 'nombres', 'apellidos'}.issubset(df_empleados.columns):
+            return pd.Series(dtype=object)
+        nombres = df_empleados['nombres'].astype(object) + ' ' + df_empleados['apellidos'].astype(object)
+        return pd.Series(nombres.values, index=df_empleados['idempleado']).groupby(level=0, observed=True).first()
+
+    def _tiempo_con_actividades(self):
+        """Registros de tiempo unidos a actividades y proyectos, con horas según TIMESTAMPDIFF"""
+        df_tiempo = self.context.tiempo
+        df_actividades = self.context.actividades
+        if df_tiempo.empty or df_actividades.empty:
+            return pd.DataFrame()
+
+        df = df_tiempo[['id_empleado', 'id_actividad', 'hora_inicio', 'hora_fin']].merge(
+            df_actividades[['id_actividad', 'nombre_actividad', 'estado',
+                            'id_proyecto', 'nombre_proyecto']],
+            on='id_actividad', how='inner')
+        # TIMESTAMPDIFF sobre la misma fecha no ajusta los turnos nocturnos
+        df['horas'] = (TimeTracker.to_seconds(df['hora_fin']) -
+                       TimeTracker.to_seconds(df['hora_inicio'])) / 3600
+        return df
+
+    def get_approved_deliverables_percentage(self, filters=None):
+        """Calcula el porcentaje de entregables aprobados por empleado"""
+        self._sin_filtro(filters, 'get_approved_deliverables_percentage')
+        df = self._entregables_unicos()
+        if df.empty:
+            return pd.DataFrame()
+
+        df = df.assign(aprobado=(df['estado'] == 'Aprobado').astype(int))
+        resultado = df.groupby('id_empleado', observed=True).agg(
+            total_entregables=('id_entregable', 'count'),
+            entregables_aprobados=('aprobado', 'sum')).reset_index()
+        resultado.insert(1, 'nombre_empleado',
+                         resultado['id_empleado'].map(self._nombres_empleados()))
+        resultado['porcentaje_aprobados'] = self._redondear(
+            resultado['entregables_aprobados'] / resultado['total_entregables'] * 100)
+        return self._tipos_sql(resultado.sort_values('porcentaje_aprobados', ascending=False).reset_index(drop=True))
+
+    def get_average_time_per_task(self, filters=None):
+        """Calcula el tiempo promedio por tarea en horas"""
+        self._sin_filtro(filters, 'get_average_time_per_task')
+        df = self._tiempo_con_actividades()
+        if df.empty:
+            return pd.DataFrame()
+
+        resultado = df.groupby(['id_actividad', 'nombre_actividad', 'nombre_proyecto'], observed=True).agg(
+            tiempo_promedio_horas=('horas', 'mean'),
+            num_empleados_involucrados=('id_empleado', 'nunique')).reset_index()
+        return self._tipos_sql(resultado.sort_values('tiempo_promedio_horas', ascending=False).reset_index(drop=True))
+
+    def get_deliverable_quality_metrics(self, filters=None):
+        """Obtiene métricas de calidad de entregables"""
+        self._sin_filtro(filters, 'get_deliverable_quality_metrics')
+        df = self.context.entregables
+        if df.empty:
+            return pd.DataFrame()
+
+        df = df.assign(
+            formato=(df['cumple_formato'] == True).astype(int),
+            contenido=(df['cumple_contenido'] == True).astype(int),
+            normativa=(df['cumple_normativa'] == True).astype(int),
+            calificacion=pd.to_numeric(df['calificacion_general'], errors='coerce'))
+        resultado = df.groupby('id_empleado', observed=True).agg(
+            total_entregables=('id_entregable', 'count'),
+            calificacion_promedio=('calificacion', 'mean'),
+            formato=('formato', 'sum'),
+            contenido=('contenido', 'sum'),
+            normativa=('normativa', 'sum')).reset_index()
+        resultado.insert(1, 'nombre_empleado',
+                         resultado['id_empleado'].map(self._nombres_empleados()))
+        resultado['calificacion_promedio'] = self._redondear(resultado['calificacion_promedio'])
+        for origen, destino in [('formato', 'pct_cumple_formato'),
+                                ('contenido', 'pct_cumple_contenido'),
+                                ('normativa', 'pct_cumple_normativa')]:
+            resultado[destino] = resultado.pop(origen) / resultado['total_entregables'] * 100
+        return self._tipos_sql(resultado.sort_values('calificacion_promedio', ascending=False).reset_index(drop=True))
+
+    def get_project_time_investment(self, filters=None):
+        """Calcula el tiempo total invertido por proyecto"""
+        self._sin_filtro(filters, 'get_project_time_investment')
+        df = self._tiempo_con_actividades()
+        if df.empty:
+            return pd.DataFrame()
+
+        resultado = df.groupby(['id_proyecto', 'nombre_proyecto'], observed=True).agg(
+            total_actividades=('id_actividad', 'nunique'),
+            total_horas_trabajadas=('horas', 'sum'),
+            num_empleados=('id_empleado', 'nunique')).reset_index()
+        resultado['promedio_horas_por_actividad'] = self._redondear(
+            resultado['total_horas_trabajadas'] / resultado['total_actividades'])
+        return self._tipos_sql(resultado.sort_values('total_horas_trabajadas', ascending=False).reset_index(drop=True))
+
+    def get_employee_productivity(self, filters=None):
+        """Calcula la productividad por empleado (entregables por hora)"""
+        self._sin_filtro(filters, 'get_employee_productivity')
+        df = self._tiempo_con_actividades()
+        if df.empty:
+            return pd.DataFrame()
+
+        # Mismo LEFT JOIN por (empleado, actividad) que la consulta SQL
+        df_entregables = self._entregables_unicos()
+        if not df_entregables.empty:
+            df = df.merge(df_entregables[['id_empleado', 'id_actividad', 'id_entregable']],
+                          on=['id_empleado', 'id_actividad'], how='left')
+        else:
+            df['id_entregable'] = np.nan
+
+        resultado = df.groupby('id_empleado', observed=True).agg(
+            total_horas=('horas', 'sum'),
+            total_entregables=('id_entregable', 'nunique')).reset_index()
+        resultado.insert(1, 'nombre_empleado',
+                         resultado['id_empleado'].map(self._nombres_empleados()))
+        resultado = resultado[resultado['total_horas'] > 0].copy()
+        resultado['entregables_por_hora'] = self._redondear(
+            resultado['total_entregables'] / resultado['total_horas'])
+        return self._tipos_sql(resultado.sort_values('entregables_por_hora', ascending=False).reset_index(drop=True))
+
+    def get_project_rejection_rate(self, filters=None):
+        """Calcula la tasa de rechazo de entregables por proyecto"""
+        self._sin_filtro(filters, 'get_project_rejection_rate')
+        df = self._entregables_unicos()
+        df_actividades = self.context.actividades
+        if df.empty or df_actividades.empty:
+            return pd.DataFrame()
+
+        df = df[['id_entregable', 'id_actividad', 'estado']].merge(
+            df_actividades[['id_actividad', 'id_proyecto', 'nombre_proyecto']],
+            on='id_actividad', how='inner')
+        df['rechazado'] = (df['estado'] == 'Rechazado').astype(int)
+        resultado = df.groupby(['id_proyecto', 'nombre_proyecto'], observed=True).agg(
+            total_entregables=('id_entregable', 'nunique'),
+            entregables_rechazados=('rechazado', 'sum')).reset_index()
+        resultado['tasa_rechazo'] = self._redondear(
+            resultado['entregables_rechazados'] / resultado['total_entregables'] * 100)
+        return self._tipos_sql(resultado.sort_values('tasa_rechazo', ascending=False).reset_index(drop=True))
+
+    def get_dashboard_data(self, materialized=False, filters=None):
+        """Obtiene datos para el panel de control principal"""
+        self._sin_filtro(filters, 'get_dashboard_data')
+        if materialized:
+            raise ValueError("get_dashboard_data: panel_control materializado no existe en un PipelineContext")
+        df = self._tiempo_con_actividades()
+        df_actividades = self.context.actividades
+        if df.empty:
+            return pd.DataFrame()
+
+        # Igual que la consulta SQL: cada tabla de hechos se agrega por separado
+        # a (empleado, proyecto) y luego se suman las partes
+        claves = ['id_empleado', 'id_proyecto']
+        df['completada'] = df['id_actividad'].where(df['estado'] == 'Completada')
+        partes = [df.groupby(claves, observed=True).agg(
+            total_actividades=('id_actividad', 'nunique'),
+            actividades_completadas=('completada', 'nunique'),
+            total_horas=('horas', 'sum'))]
+
+        df_entregables = self.context.entregables
+        if not df_entregables.empty:
+            df_entregables = df_entregables.merge(
+                df_actividades[['id_actividad', 'id_proyecto']], on='id_actividad', how='inner')
+            unicos = df_entregables.drop_duplicates('id_entregable')
+            partes.append(unicos.assign(
+                aprobado=(unicos['estado'] == 'Aprobado').astype(int),
+                rechazado=(unicos['estado'] == 'Rechazado').astype(int)).groupby(claves, observed=True).agg(
+                    total_entregables=('id_entregable', 'count'),
+                    entregables_aprobados=('aprobado', 'sum'),
+                    entregables_rechazados=('rechazado', 'sum')))
+            calificacion = pd.to_numeric(df_entregables['calificacion_general'], errors='coerce')
+            partes.append(df_entregables.assign(calificacion=calificacion).groupby(claves, observed=True).agg(
+                suma_calificacion=('calificacion', 'sum'),
+                evaluaciones=('calificacion', 'count')))
+
+        resultado = pd.concat(partes, axis=1).fillna(0).reset_index()
+        for columna in ['total_entregables', 'entregables_aprobados', 'entregables_rechazados',
+                        'suma_calificacion', 'evaluaciones']:
+            if columna not in resultado.columns:
+                resultado[columna] = 0
+        # Las partes sin entregables quedan como NaN -> 0.0 al unirlas; son conteos
+        for columna in ['total_entregables', 'entregables_aprobados', 'entregables_rechazados']:
+            resultado[columna] = resultado[columna].astype('int64')
+
+        proyectos = df_actividades.drop_duplicates('id_proyecto').set_index(
+            'id_proyecto')['nombre_proyecto']
+        resultado.insert(1, 'nombre_empleado',
+                         resultado['id_empleado'].map(self._nombres_empleados()))
+        resultado.insert(3, 'nombre_proyecto', resultado['id_proyecto'].map(proyectos))
+        actividades = resultado['total_actividades'].where(resultado['total_actividades'] > 0)
+        resultado['pct_completado'] = self._redondear(
+            resultado['actividades_completadas'] / actividades * 100).fillna(0)
+        evaluaciones = resultado.pop('evaluaciones')
+        resultado['calificacion_promedio'] = self._redondear(
+            resultado.pop('suma_calificacion') / evaluaciones.where(evaluaciones > 0)).fillna(0)
+        return self._tipos_sql(resultado[DASHBOARD_COLUMNS])
+
+    def get_period_metrics(self, filters=None):
+        """No disponible: las métricas del periodo se calculan en la base de datos"""
+        self._solo_sql('get_period_metrics')
+
+    def save_period_metrics(self, filters=None):
+        """No disponible: escribe en metricas_productividad"""
+        self._solo_sql('save_period_metrics')
+
+    def create_dashboard_view(self):
+        """No disponible: la vista del panel se crea en la base de datos"""
+        self._solo_sql('create_dashboard_view')
+
+    def refresh_dashboard_table(self):
+        """No disponible: panel_control se recalcula en la base de datos"""
+        self._solo_sql('refresh_dashboard_table')
@@ -1,170 +1,79 @@
-from scripts.data_standardization import DataStandardizer
 import sys
 import os
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 
 # Añadir directorio raíz al path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
-def generate_kpi_document():
-    """Genera un documento de KPIs basado en los datos del sistema"""
+# Columnas del dataset unificado que usa el documento de KPIs
+KPI_COLUMNS = ['id_empleado', 'horas_trabajadas', 'id_proyecto', 'nombre_proyecto',
+               'entregables_rechazados', 'tasa_rechazo', 'total_entregables']
+
+
+def generate_kpi_document(df=None, snapshot_store=None, output_dir=None, formats=('md',), charts=False,
+                          **snapshot_filters):
+    """Genera un documento de KPIs basado en los datos del sistema.
+
+    Si se recibe `df` (dataset unificado ya construido, p. ej. desde un
+    PipelineContext) se usa directamente en lugar de volver a extraer los datos.
+    Con `snapshot_store` (UnifiedSnapshotStore) se leen de la última instantánea
+    solo las columnas KPI_COLUMNS y las particiones que indiquen
+    `snapshot_filters` (fecha_desde, fecha_hasta, proyectos). El documento se
+    escribe en `output_dir` (entregables/ por defecto). Los KPIs se calculan
+    con scripts/kpi_engine.py.
+
+    Se genera un archivo por cada formato de `formats` ('md', 'html', 'json'
+    o cualquiera registrado en kpi_engine.RENDERERS) y se devuelve la ruta
+    del primero. Con `charts` (True o un ChartRenderer) se añaden los
+    gráficos de scripts/kpi_charts.py.
+    """
     print("Generando documento de KPIs...")
 
     # Crear la carpeta de entregables si no existe
-    output_dir = os.path.join(os.path.dirname(__file__), '..', 'entregables')
+    output_dir = output_dir or os.path.join(os.path.dirname(__file__), '..', 'entregables')
     os.makedirs(output_dir, exist_ok=True)
 
     # Obtener los datos estandarizados
-    standardizer = DataStandardizer()
-    df = standardizer.run()
+    if df is None and snapshot_store is not None:
+        df = snapshot_store.load(columns=KPI_COLUMNS, **snapshot_filters)
+    elif df is None:
+        # Solo se carga pandas/SQLAlchemy si hay que extraer los datos
+        from scripts.data_standardization import DataStandardizer
+        standardizer = DataStandardizer()
+        df = standardizer.run()
 
     if df is None or df.empty:
         print("No hay datos suficientes para generar el documento de KPIs.")
         return
 
-    # Ruta del archivo de salida
-    kpi_file = os.path.join(
-        output_dir, f'kpi_document_{datetime.now().strftime("%Y%m%d")}.md')
-
-    # Calcular KPIs
-    with open(kpi_file, 'w', encoding='utf-8') as f:
-        f.write("# Documento de KPIs - Sistema de Monitoreo de Productividad\n\n")
-        f.write(
-            f"Generado el: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-        # KPI 1: Horas trabajadas
-        f.write("## 1. Horas Trabajadas\n\n")
-
-        if 'horas_trabajadas' in df.columns and 'id_empleado' in df.columns:
-            # Por empleado
-            horas_por_empleado = df.groupby('id_empleado')[
-                'horas_trabajadas'].sum().reset_index()
-            horas_por_empleado = horas_por_empleado.sort_values(
-                'horas_trabajadas', ascending=False)
-
-            f.write("### 1.1 Total de Horas Trabajadas por Empleado\n\n")
-            f.write("| ID Empleado | Horas Totales |\n")
-            f.write("|------------|---------------|\n")
-
-            for _, row in horas_por_empleado.iterrows():
-                f.write(
-                    f"| {row['id_empleado']} | {row['horas_trabajadas']:.2f} |\n")
-
-            f.write("\n")
-
-            # Mostrar estadísticas generales
-            media_horas = horas_por_empleado['horas_trabajadas'].mean()
-            max_horas = horas_por_empleado['horas_trabajadas'].max()
-            min_horas = horas_por_empleado['horas_trabajadas'].min()
-
-            f.write("### 1.2 Estadísticas de Horas Trabajadas\n\n")
-            f.write(
-                f"- **Promedio de horas trabajadas por empleado:** {media_horas:.2f}\n")
-            f.write(
-                f"- **Máximo de horas trabajadas por un empleado:** {max_horas:.2f}\n")
-            f.write(
-                f"- **Mínimo de horas trabajadas por un empleado:** {min_horas:.2f}\n\n")
-
-            # Por proyecto
-            if 'nombre_proyecto' in df.columns:
-                horas_por_proyecto = df.groupby(['id_proyecto', 'nombre_proyecto'])[
-                    'horas_trabajadas'].sum().reset_index()
-                horas_por_proyecto = horas_por_proyecto.sort_values(
-                    'horas_trabajadas', ascending=False)
-
-                f.write("### 1.3 Total de Horas Trabajadas por Proyecto\n\n")
-                f.write("| ID Proyecto | Nombre Proyecto | Horas Totales |\n")
-                f.write("|------------|----------------|---------------|\n")
-
-                for _, row in horas_por_proyecto.iterrows():
-                    f.write(
-                        f"| {row['id_proyecto']} | {row['nombre_proyecto']} | {row['horas_trabajadas']:.2f} |\n")
-
-                f.write("\n")
-
-        # KPI 2: Calidad de entregables
-        f.write("## 2. Calidad de Entregables\n\n")
-
-        # Entregables rechazados
-        if 'entregables_rechazados' in df.columns and 'id_empleado' in df.columns:
-            rechazos_por_empleado = df.groupby(
-                'id_empleado')['entregables_rechazados'].sum().reset_index()
-            rechazos_por_empleado = rechazos_por_empleado.sort_values(
-                'entregables_rechazados', ascending=False)
-
-            f.write("### 2.1 Entregables Rechazados por Empleado\n\n")
-            f.write("| ID Empleado | Entregables Rechazados |\n")
-            f.write("|------------|------------------------|\n")
-
-            for _, row in rechazos_por_empleado.iterrows():
-                f.write(
-                    f"| {row['id_empleado']} | {int(row['entregables_rechazados'])} |\n")
-
-            f.write("\n")
-
-        # Tasa de rechazo
-        if 'tasa_rechazo' in df.columns and 'id_empleado' in df.columns:
-            tasa_por_empleado = df.groupby('id_empleado')[
-                'tasa_rechazo'].mean().reset_index()
-            tasa_por_empleado = tasa_por_empleado.sort_values(
-                'tasa_rechazo', ascending=False)
-
-            f.write("### 2.2 Tasa de Rechazo por Empleado (%)\n\n")
-            f.write("| ID Empleado | Tasa de Rechazo (%) |\n")
-            f.write("|------------|---------------------|\n")
-
-            for _, row in tasa_por_empleado.iterrows():
-                f.write(
-                    f"| {row['id_empleado']} | {row['tasa_rechazo']:.2f}% |\n")
-
-            f.write("\n")
-
-        # KPI 3: Productividad
-        f.write("## 3. Productividad\n\n")
-
-        if 'horas_trabajadas' in df.columns and 'total_entregables' in df.columns:
-            # Calcular entregables por hora
-            df_prod = df.copy()
-            df_prod['entregables_por_hora'] = df_prod.apply(
-                lambda x: x['total_entregables'] /
-                x['horas_trabajadas'] if x['horas_trabajadas'] > 0 else 0,
-                axis=1
-            )
-
-            prod_por_empleado = df_prod.groupby(
-                'id_empleado')['entregables_por_hora'].mean().reset_index()
-            prod_por_empleado = prod_por_empleado.sort_values(
-                'entregables_por_hora', ascending=False)
-
-            f.write("### 3.1 Entregables por Hora Trabajada\n\n")
-            f.write("| ID Empleado | Entregables por Hora |\n")
-            f.write("|------------|----------------------|\n")
-
-            for _, row in prod_por_empleado.iterrows():
-                f.write(
-                    f"| {row['id_empleado']} | {row['entregables_por_hora']:.2f} |\n")
-
-            f.write("\n")
-
-        # Conclusiones y recomendaciones
-        f.write("## 4. Conclusiones y Recomendaciones\n\n")
-        f.write(
-            "- Se recomienda establecer metas de horas productivas por empleado y proyecto.\n")
-        f.write("- Implementar revisiones periódicas de la calidad de entregables.\n")
-        f.write(
-            "- Definir acciones correctivas para mejorar la tasa de aprobación de entregables.\n")
-        f.write(
-            "- Crear un sistema de recompensas para los empleados con mayor eficiencia.\n")
-        f.write(
-            "- Establecer umbrales de alerta para tasas de rechazo superiores al 15%.\n")
-
-    print(f"Documento de KPIs generado exitosamente: {kpi_file}")
-    return kpi_file
+    # Todos los KPIs salen de un groupby por empleado y otro por proyecto
+    from scripts.kpi_engine import compute_kpis, RENDERERS
+    desconocidos = [formato for formato in formats if formato not in RENDERERS]
+    if desconocidos:
+        raise ValueError(f"Formatos de documento desconocidos: {desconocidos}")
+    generado = datetime.now()
+    resultado = compute_kpis(df, generado)
+
+    graficos = None
+    if charts:
+        # matplotlib solo se carga si se piden los gráficos
+        from scripts.kpi_charts import ChartRenderer
+        renderer = charts if isinstance(charts, ChartRenderer) else ChartRenderer()
+        graficos = renderer.render(resultado, output_dir)
+
+    # Cada documento se arma en memoria y se escribe de una vez
+    rutas = []
+    for formato in formats:
+        renderer = RENDERERS[formato]
+        kpi_file = os.path.join(
+            output_dir, f'kpi_document_{generado.strftime("%Y%m%d")}.{renderer.extension}')
+        with open(kpi_file, 'w', encoding='utf-8') as f:
+            f.write(renderer.render(resultado, graficos))
+        rutas.append(kpi_file)
+        print(f"Documento de KPIs generado exitosamente: {kpi_file}")
+
+    return rutas[0] if rutas else None
 
 if __name__ == "__main__":
     generate_kpi_document()
@@ -0,0 +1,243 @@
+"""Generador de datos sintéticos para la base local (DB_BACKEND=sqlite).
+
+Produce proyectos, actividades, empleados, registros de tiempo, entregables y
+evaluaciones con distribuciones parecidas a las de producción y una semilla
+fija, para que los benchmarks sean reproducibles.
+
+Uso:
+    DB_BACKEND=sqlite python -m scripts.generate_synthetic_data --registros 1000000
+"""
+from models.entities import Base, get_engine
+from scripts.daily_rollup import refresh_daily_rollup
+from datetime import date, timedelta
+from sqlalchemy import text
+import numpy as np
+import argparse
+import json
+import time as reloj
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_BATCH_SIZE = 50000
+
+NOMBRES = ['ANA', 'LUIS', 'EVA', 'JUAN', 'ROSA', 'CARLOS', 'MARIA', 'JORGE', 'LUCIA', 'PEDRO']
+APELLIDOS = ['TORRES', 'PEREZ', 'RUIZ', 'GARCIA', 'LOPEZ', 'DIAZ', 'ROJAS', 'CASTRO', 'VEGA', 'SOTO']
+APLICACIONES = ['Excel', 'Word', 'AutoCAD', 'Outlook', 'Teams', 'Revit', 'Chrome', 'PowerPoint']
+UBICACIONES = ['Oficina', 'Remoto', 'Campo']
+ESTADOS_ACTIVIDAD = ['Pendiente', 'En Progreso', 'En Revision', 'Completada', 'Cancelada']
+ESTADOS_ENTREGABLE = ['Pendiente Revision', 'En Revision', 'Aprobado', 'Rechazado']
+PRIORIDADES = ['Baja', 'Media', 'Alta', 'Urgente']
+
+
+def _placeholders(connection, n):
+    """Marcadores de parámetro del driver (qmark en sqlite3, format en pymysql)"""
+    marca = '?' if connection.dialect.paramstyle == 'qmark' else '%s'
+    return ', '.join([marca] * n)
+
+
+def _bulk_insert(connection, tabla, columnas, filas):
+    """INSERT masivo con executemany del driver, sin construir objetos ORM"""
+    if not filas:
+        return
+    sql = (f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+           f"VALUES ({_placeholders(connection, len(columnas))})")
+    connection.exec_driver_sql(sql, filas)
+
+
+class SyntheticDataGenerator:
+    """Genera una base sintética completa con `registros` registros de tiempo"""
+
+    def __init__(self, engine=None, registros=10000, seed=42, dias=365,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self.engine = engine if engine is not None else get_engine()
+        self.registros = int(registros)
+        self.rng = np.random.default_rng(seed)
+        self.dias = dias
+        self.batch_size = batch_size
+
+        # Dimensiones proporcionales al volumen (máximo 999 empleados: id 'EMnnn')
+        self.num_empleados = int(min(999, max(5, self.registros // 2000)))
+        self.num_proyectos = int(max(2, self.num_empleados // 5))
+        self.actividades_por_proyecto = 12
+        self.num_actividades = self.num_proyectos * self.actividades_por_proyecto
+        self.fecha_inicio = date(2025, 1, 1)
+
+        sqlite = self.engine.dialect.name == 'sqlite'
+        # Formatos que SQLAlchemy espera leer en SQLite (en MySQL los convierte el servidor)
+        self._sufijo_hora = '.000000' if sqlite else ''
+        self._booleano = (lambda v: int(v)) if sqlite else bool
+
+    def _hora(self, segundos):
+        return [f"{s // 3600 % 24:02d}:{s // 60 % 60:02d}:00{self._sufijo_hora}" for s in segundos]
+
+    def _empleados(self):
+        ids = [f'EM{i:03d}' for i in range(1, self.num_empleados + 1)]
+        nombres = self.rng.choice(NOMBRES, self.num_empleados)
+        apellidos = self.rng.choice(APELLIDOS, self.num_empleados)
+        return ids, list(zip(ids, nombres.tolist(), apellidos.tolist()))
+
+    def _proyectos(self):
+        filas = []
+        for i in range(1, self.num_proyectos + 1):
+            inicio = self.fecha_inicio - timedelta(days=int(self.rng.integers(0, 120)))
+            fin = inicio + timedelta(days=int(self.rng.integers(180, 540)))
+            estado = 'En Progreso' if i % 7 else 'Finalizado'
+            filas.append((i, f'Proyecto {i}', f'Cliente {i % 25 + 1}', inicio.isoformat(),
+                          fin.isoformat(), estado, f'Proyecto sintético {i}'))
+        return filas
+
+    def _actividades(self):
+        filas = []
+        estados = self.rng.choice(ESTADOS_ACTIVIDAD, self.num_actividades, p=[0.1, 0.4, 0.1, 0.35, 0.05])
+        prioridades = self.rng.choice(PRIORIDADES, self.num_actividades, p=[0.2, 0.4, 0.3, 0.1])
+        for i in range(1, self.num_actividades + 1):
+            proyecto = (i - 1) // self.actividades_por_proyecto + 1
+            asignacion = self.fecha_inicio + timedelta(days=int(self.rng.integers(0, self.dias)))
+            limite = asignacion + timedelta(days=int(self.rng.integers(7, 90)))
+            filas.append((i, proyecto, f'Actividad {i}', f'Descripcion de la actividad {i}',
+                          prioridades[i - 1], asignacion.isoformat(), limite.isoformat(),
+                          estados[i - 1]))
+        return filas
+
+    def _bloque_tiempo(self, desde, n, empleados, fechas, apps_json):
+        """Registros de tiempo [desde, desde + n) generados de forma vectorizada"""
+        rng = self.rng
+        empleado = rng.integers(0, self.num_empleados, n)
+        # Cada empleado trabaja sobre todo en unas pocas actividades
+        actividad = (empleado * 7 + rng.integers(0, 6, n)) % self.num_actividades + 1
+        fecha = rng.integers(0, self.dias, n)
+        inicio = (rng.integers(28, 44, n)) * 900                  # 07:00 - 10:45
+        duracion = rng.integers(2, 25, n) * 900                   # 30 min - 6 h
+        # Un 0.5% de turnos nocturnos que cruzan la medianoche
+        nocturno = rng.random(n) < 0.005
+        inicio = np.where(nocturno, 22 * 3600, inicio)
+        fin = (inicio + duracion) % 86400
+        apps = rng.integers(0, len(apps_json), n)
+        ubicacion = rng.choice(UBICACIONES, n, p=[0.6, 0.3, 0.1])
+        return list(zip(
+            range(desde, desde + n),
+            [empleados[e] for e in empleado],
+            actividad.tolist(),
+            [fechas[f] for f in fecha],
+            self._hora(inicio.tolist()),
+            self._hora(fin.tolist()),
+            [f'Trabajo en actividad {a}' for a in actividad.tolist()],
+            ubicacion.tolist(),
+            [apps_json[a] for a in apps]))
+
+    def _entregables(self, n, empleados, fechas):
+        rng = self.rng
+        empleado = rng.integers(0, self.num_empleados, n)
+        actividad = (empleado * 7 + rng.integers(0, 6, n)) % self.num_actividades + 1
+        estado = rng.choice(ESTADOS_ENTREGABLE, n, p=[0.15, 0.1, 0.6, 0.15])
+        fecha = rng.integers(0, self.dias, n)
+        hora = rng.integers(8, 19, n)
+        return list(zip(
+            range(1, n + 1), actividad.tolist(), [empleados[e] for e in empleado],
+            [1] * n, [f'entregable_{i}.pdf' for i in range(1, n + 1)],
+            [f'/entregables/entregable_{i}.pdf' for i in range(1, n + 1)],
+            [f'{fechas[f]} {h:02d}:00:00{self._sufijo_hora}' for f, h in zip(fecha, hora)],
+            rng.integers(1, 4, n).tolist(), estado.tolist()))
+
+    def _evaluaciones(self, n_entregables, empleados, fechas):
+        rng = self.rng
+        # El 70% de los entregables tiene evaluación y algunos más de una
+        evaluados = np.flatnonzero(rng.random(n_entregables) < 0.7) + 1
+        repetidos = evaluados[rng.random(len(evaluados)) < 0.1]
+        entregable = np.concatenate([evaluados, repetidos])
+        n = len(entregable)
+        calificacion = np.clip(rng.normal(7.5, 1.5, n).round(), 1, 10).astype(int)
+        cumple = rng.random((n, 3)) < np.array([0.9, 0.8, 0.85])
+        fecha = rng.integers(0, self.dias, n)
+        booleano = self._booleano
+        return list(zip(
+            range(1, n + 1), entregable.tolist(), [empleados[0]] * n,
+            [f'{fechas[f]} 17:00:00{self._sufijo_hora}' for f in fecha],
+            [booleano(v) for v in cumple[:, 0]], [booleano(v) for v in cumple[:, 1]],
+            [booleano(v) for v in cumple[:, 2]], calificacion.tolist()))
+
+    def generate(self, refresh_rollup=True):
+        """Vacía la base y la llena con datos sintéticos. Devuelve las filas por tabla"""
+        if self.engine.dialect.name != 'sqlite':
+            print("El generador sintético solo escribe en el backend local (DB_BACKEND=sqlite)")
+            return {}
+
+        inicio = reloj.perf_counter()
+        Base.metadata.drop_all(self.engine)
+        Base.metadata.create_all(self.engine)
+
+        empleados, filas_empleados = self._empleados()
+        fechas = [(self.fecha_inicio + timedelta(days=d)).isoformat() for d in range(self.dias)]
+        # Igual que en producción, aplicaciones_usadas llega como JSON dentro de un texto JSON
+        apps_json = [json.dumps(json.dumps({'apps': APLICACIONES[i:i + k]}))
+                     for k in range(1, 4) for i in range(len(APLICACIONES) - k + 1)]
+        n_entregables = max(1, self.registros // 20)
+        conteos = {}
+
+        with self.engine.begin() as connection:
+            connection.execute(text("DELETE FROM gmadministracion.empleados"))
+            _bulk_insert(connection, 'gmadministracion.empleados',
+                         ['idempleado', 'nombres', 'apellidos'], filas_empleados)
+            _bulk_insert(connection, 'proyectos',
+                         ['id_proyecto', 'nombre_proyecto', 'cliente', 'fecha_inicio',
+                          'fecha_fin_estimada', 'estado', 'descripcion'], self._proyectos())
+            _bulk_insert(connection, 'actividades',
+                         ['id_actividad', 'id_proyecto', 'nombre_actividad', 'descripcion',
+                          'prioridad', 'fecha_asignacion', 'fecha_limite', 'estado'],
+                         self._actividades())
+            _bulk_insert(connection, 'tipos_entregables', ['id_tipo_entregable', 'nombre'],
+                         [(1, 'Informe')])
+            conteos.update(empleados=len(filas_empleados), proyectos=self.num_proyectos,
+                           actividades=self.num_actividades)
+
+            columnas_tiempo = ['id_registro', 'id_empleado', 'id_actividad', 'fecha', 'hora_inicio',
+                               'hora_fin', 'descripcion_actividad', 'ubicacion', 'aplicaciones_usadas']
+            for desde in range(1, self.registros + 1, self.batch_size):
+                n = min(self.batch_size, self.registros - desde + 1)
+                _bulk_insert(connection, 'registro_tiempo', columnas_tiempo,
+                             self._bloque_tiempo(desde, n, empleados, fechas, apps_json))
+            conteos['registro_tiempo'] = self.registros
+
+            _bulk_insert(connection, 'entregables',
+                         ['id_entregable', 'id_actividad', 'id_empleado', 'id_tipo_entregable',
+                          'nombre_archivo', 'ruta_archivo', 'fecha_entrega', 'version', 'estado'],
+                         self._entregables(n_entregables, empleados, fechas))
+            evaluaciones = self._evaluaciones(n_entregables, empleados, fechas)
+            _bulk_insert(connection, 'evaluacion_calidad',
+                         ['id_evaluacion', 'id_entregable', 'id_evaluador', 'fecha_evaluacion',
+                          'cumple_formato', 'cumple_contenido', 'cumple_normativa',
+                          'calificacion_general'], evaluaciones)
+            conteos.update(entregables=n_entregables, evaluacion_calidad=len(evaluaciones))
+
+        if refresh_rollup:
+            refresh_daily_rollup(self.engine, full=True)
+
+        # Sin estadísticas SQLite prefiere recorrer el índice del GROUP BY antes
+        # que el rango de fechas de las consultas filtradas (MySQL las mantiene solo)
+        with self.engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+
+        print(f"Datos sintéticos generados en {reloj.perf_counter() - inicio:.1f}s: {conteos}")
+        return conteos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--registros', type=int, default=10000,
+                        help="Registros de tiempo a generar (10^3 - 10^7)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--dias', type=int, default=365)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--sin-resumen', action='store_true',
+                        help="No recalcular resumen_tiempo_diario al terminar")
+    args = parser.parse_args()
+
+    SyntheticDataGenerator(registros=args.registros, seed=args.seed, dias=args.dias,
+                           batch_size=args.batch_size).generate(not args.sin_resumen)
+
+
+if __name__ == "__main__":
+    main()
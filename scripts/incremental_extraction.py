@@ -0,0 +1,211 @@
+from models.entities import EvaluacionCalidad
+from scripts.data_standardization import DataStandardizer
+import pandas as pd
+from sqlalchemy import select, func
+from datetime import datetime, timedelta
+import json
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'cache', 'incremental')
+
+
+class IncrementalStore:
+    """Almacén persistente de datos estandarizados y marcas de agua por tabla"""
+
+    def __init__(self, store_dir=None):
+        """Inicializa el almacén en `store_dir` (cache/incremental por defecto)"""
+        self.store_dir = store_dir or DEFAULT_STORE_DIR
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.state_file = os.path.join(self.store_dir, 'marcas_agua.json')
+
+    def _frame_path(self, name):
+        return os.path.join(self.store_dir, f'{name}.pkl')
+
+    def load_frame(self, name):
+        """Carga el DataFrame estandarizado `name` (None si no existe)"""
+        path = self._frame_path(name)
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
+
+    def save_frame(self, name, df):
+        """Guarda el DataFrame `name` de forma atómica (conserva los dtypes)"""
+        path = self._frame_path(name)
+        tmp_path = path + '.tmp'
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    def load_state(self):
+        """Devuelve las marcas de agua guardadas por tabla"""
+        if not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_state(self, state):
+        """Guarda las marcas de agua por tabla"""
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(tmp_path, self.state_file)
+
+
+class IncrementalExtractor:
+    """Extracción incremental de registro_tiempo y entregables.
+
+    Guarda por tabla la marca de agua (máximo id y última fecha) y en cada
+    ejecución solo extrae las filas nuevas más una ventana de `lookback_days`
+    días hacia atrás, que se reemplaza completa en el almacén para recoger
+    ediciones y borrados recientes. Cada `full_reconcile_days` días (o con
+    `full=True`) se hace una extracción completa que reconstruye el almacén.
+
+    El almacén y sus marcas de agua corresponden siempre a las tablas sin
+    filtrar: si el estandarizador tiene un QueryFilter, la extracción va
+    directa a la base (el filtro ya limita la lectura al periodo) y el
+    almacén no se lee ni se modifica.
+    """
+
+    def __init__(self, standardizer=None, store=None, lookback_days=3, full_reconcile_days=7):
+        """Inicializa el extractor con su estandarizador y almacén"""
+        self.standardizer = standardizer if standardizer is not None else DataStandardizer()
+        self.store = store if store is not None else IncrementalStore()
+        self.lookback_days = lookback_days
+        self.full_reconcile_days = full_reconcile_days
+
+    def _needs_full(self, table_state, df_store, full):
+        """Indica si la tabla requiere extracción completa"""
+        if full or not table_state or df_store is None or df_store.empty:
+            return True
+        if self.full_reconcile_days is None:
+            return False
+        ultimo_full = datetime.fromisoformat(table_state['ultimo_full'])
+        return datetime.now() - ultimo_full >= timedelta(days=self.full_reconcile_days)
+
+    def _lookback_start(self, table_state):
+        """Fecha desde la que se vuelve a extraer la ventana reciente"""
+        ultima_fecha = table_state.get('ultima_fecha')
+        if ultima_fecha is None:
+            return None
+        return pd.Timestamp(ultima_fecha).date() - timedelta(days=self.lookback_days)
+
+    def _concat(self, frames):
+        """Une el almacén con lo nuevo sin perder las categóricas (si hay política de tipos)"""
+        policy = self.standardizer.dtype_policy
+        if policy is None:
+            return pd.concat(frames, ignore_index=True)
+        return policy.concat(frames)
+
+    def _filtrado(self, tabla):
+        """Indica si el estandarizador filtra, en cuyo caso no se usa el almacén"""
+        if not self.standardizer.filters:
+            return False
+        print(f"Extracción filtrada de {tabla} ({self.standardizer.filters}): sin almacén incremental")
+        return True
+
+    def _max_evaluation_id(self):
+        """Máximo id_evaluacion actual de evaluacion_calidad"""
+        with self.standardizer.engine.connect() as connection:
+            return connection.execute(select(func.max(EvaluacionCalidad.id_evaluacion))).scalar()
+
+    def get_time_records(self, full=False):
+        """Devuelve registro_tiempo estandarizado, extrayendo solo lo nuevo si es posible"""
+        if self._filtrado('registro_tiempo'):
+            return self.standardizer.get_standardized_time_records()
+
+        state = self.store.load_state()
+        table_state = state.get('registro_tiempo', {})
+        df = self.store.load_frame('registro_tiempo')
+
+        if self._needs_full(table_state, df, full):
+            print("Extracción completa de registro_tiempo")
+            df = self.standardizer.get_standardized_time_records()
+            table_state = {'ultimo_full': datetime.now().isoformat()}
+        else:
+            desde_fecha = self._lookback_start(table_state)
+            nuevos = self.standardizer.get_standardized_time_records(
+                desde_id=table_state['max_id'], desde_fecha=desde_fecha)
+            print(f"Extracción incremental de registro_tiempo: {len(nuevos)} registros")
+
+            # La ventana reciente se reemplaza completa (recoge ediciones y borrados)
+            descartar = pd.Series(False, index=df.index)
+            if desde_fecha is not None:
+                descartar |= pd.to_datetime(df['fecha']).dt.date >= desde_fecha
+            if not nuevos.empty:
+                descartar |= df['id_registro'].isin(nuevos['id_registro'])
+            df = self._concat([df[~descartar], nuevos]) if not nuevos.empty \
+                else df[~descartar].reset_index(drop=True)
+            df = df.sort_values('id_registro', ignore_index=True)
+
+        if not df.empty:
+            table_state['max_id'] = int(df['id_registro'].max())
+            table_state['ultima_fecha'] = str(df['fecha'].max())
+        else:
+            table_state['max_id'] = 0
+            table_state['ultima_fecha'] = None
+        table_state['ultima_ejecucion'] = datetime.now().isoformat()
+
+        self.store.save_frame('registro_tiempo', df)
+        state['registro_tiempo'] = table_state
+        self.store.save_state(state)
+        return df
+
+    def get_deliverables_data(self, full=False):
+        """Devuelve entregables estandarizados, extrayendo solo lo nuevo o reevaluado"""
+        if self._filtrado('entregables'):
+            return self.standardizer.standardize_deliverables(self.standardizer.get_deliverables_data())
+
+        state = self.store.load_state()
+        table_state = state.get('entregables', {})
+        df = self.store.load_frame('entregables')
+        max_id_evaluacion = self._max_evaluation_id() or 0
+
+        if self._needs_full(table_state, df, full):
+            print("Extracción completa de entregables")
+            df = self.standardizer.standardize_deliverables(self.standardizer.get_deliverables_data())
+            table_state = {'ultimo_full': datetime.now().isoformat()}
+        else:
+            desde_fecha = self._lookback_start(table_state)
+            nuevos = self.standardizer.standardize_deliverables(self.standardizer.get_deliverables_data(
+                desde_id=table_state['max_id'],
+                desde_id_evaluacion=table_state['max_id_evaluacion'],
+                desde_fecha=desde_fecha))
+            print(f"Extracción incremental de entregables: {len(nuevos)} filas")
+
+            # Cada entregable extraído reemplaza todas sus filas (una por evaluación)
+            descartar = pd.Series(False, index=df.index)
+            if desde_fecha is not None:
+                descartar |= pd.to_datetime(df['fecha_entrega']).dt.date >= desde_fecha
+            if not nuevos.empty:
+                descartar |= df['id_entregable'].isin(nuevos['id_entregable'])
+            df = self._concat([df[~descartar], nuevos]) if not nuevos.empty \
+                else df[~descartar].reset_index(drop=True)
+            df = df.sort_values('id_entregable', kind='stable', ignore_index=True)
+
+        if not df.empty:
+            table_state['max_id'] = int(df['id_entregable'].max())
+            table_state['ultima_fecha'] = str(pd.to_datetime(df['fecha_entrega']).max().date())
+        else:
+            table_state['max_id'] = 0
+            table_state['ultima_fecha'] = None
+        table_state['max_id_evaluacion'] = int(max_id_evaluacion)
+        table_state['ultima_ejecucion'] = datetime.now().isoformat()
+
+        self.store.save_frame('entregables', df)
+        state['entregables'] = table_state
+        self.store.save_state(state)
+        return df
+
+    def create_unified_dataset(self, full=False):
+        """Crea el dataset unificado usando el almacén incremental"""
+        df_empleados = self.standardizer.get_cross_database_data()
+        df_actividades = self.standardizer.get_activities_data()
+        df_tiempo_std = self.get_time_records(full=full)
+        df_entregables_std = self.get_deliverables_data(full=full)
+
+        return self.standardizer.build_unified_dataset(
+            df_empleados, df_actividades, df_tiempo_std, df_entregables_std)
@@ -0,0 +1,208 @@
+from scripts.sql_metrics import ProductivityMetrics
+from scripts.parallel_metrics import METRIC_QUERIES
+from sqlalchemy import text
+import pandas as pd
+import argparse
+import copy
+import json
+import re
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'config', 'explain_baseline.json')
+
+# Tablas de catálogo pequeñas: recorrerlas completas es lo esperado
+DIMENSION_TABLES = {'proyectos', 'actividades', 'tipos_entregables'}
+
+ESCANEO_COMPLETO = 'escaneo_completo'
+FILESORT = 'filesort'
+
+_PALABRAS_SQL = {'SELECT', 'WHERE', 'GROUP', 'ORDER', 'HAVING', 'JOIN', 'LEFT', 'RIGHT',
+                 'INNER', 'ON', 'UNION', 'LIMIT'}
+_TABLAS_CONSULTA = re.compile(r'\b(?:FROM|JOIN)\s+([\w.]+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+
+
+def _alias_de_tablas(query):
+    """Alias -> tabla de los FROM/JOIN de `query` (la tabla se mapea a sí misma)"""
+    alias = {}
+    for tabla, nombre in _TABLAS_CONSULTA.findall(query):
+        alias[tabla] = tabla
+        if nombre and nombre.upper() not in _PALABRAS_SQL:
+            alias[nombre] = tabla
+    return alias
+
+
+class PlanFinding:
+    """Problema en el plan de una métrica: escaneo completo o filesort"""
+
+    def __init__(self, metric, kind, table, detail):
+        self.metric = metric
+        self.kind = kind
+        self.table = table or ''
+        self.detail = detail
+
+    @property
+    def key(self):
+        """Identificador estable para compararlo con la línea base"""
+        return f"{self.metric}:{self.kind}:{self.table}"
+
+    def __repr__(self):
+        return f"PlanFinding({self.key}, {self.detail!r})"
+
+
+class IndexAdvisor:
+    """Revisa con EXPLAIN las consultas de ProductivityMetrics.
+
+    Cada método de METRIC_QUERIES se ejecuta sobre una copia de las métricas
+    cuyo `_execute` captura la consulta y guarda su plan en lugar de leer los
+    datos. Se marcan los escaneos completos de las tablas de hechos y las
+    ordenaciones sin índice (filesort). Comparando con una línea base guardada
+    se detectan los planes que empeoraron. Con `filters` (QueryFilter) se
+    revisan las consultas filtradas, con sus parámetros enlazados.
+    """
+
+    def __init__(self, engine=None, use_rollup=(True, False), queries=None, filters=None):
+        """Prepara el revisor; por defecto con y sin el resumen diario"""
+        self.metrics = ProductivityMetrics(engine, filters=filters)
+        self.engine = self.metrics.engine
+        self.modes = use_rollup if isinstance(use_rollup, (tuple, list)) else (use_rollup,)
+        self.queries = dict(queries or METRIC_QUERIES)
+
+    def explain(self, query, filters=None):
+        """Plan de `query` como DataFrame (EXPLAIN o EXPLAIN QUERY PLAN en SQLite)"""
+        with self.engine.connect() as connection:
+            prefijo = 'EXPLAIN QUERY PLAN' if connection.dialect.name == 'sqlite' else 'EXPLAIN'
+            consulta = f"{prefijo} {query}"
+            result = connection.execute(filters.bind(consulta) if filters else text(consulta))
+            return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    def capture_queries(self):
+        """{nombre de la métrica: consulta SQL} sin ejecutar las consultas.
+
+        Sin resumen diario el nombre lleva el sufijo ':registro_tiempo'; las
+        consultas que no cambian con el modo se incluyen una sola vez.
+        """
+        capturadas = {}
+        for use_rollup in self.modes:
+            metrics = copy.copy(self.metrics)
+            metrics.use_rollup = use_rollup
+            metrics.cache = None
+            metrics.raise_errors = True
+            consultas = []
+
+            def capturar(query, filters=None, consultas=consultas):
+                consultas.append(query)
+                return pd.DataFrame()
+
+            metrics._execute = capturar
+            for nombre, metodo in self.queries.items():
+                consultas.clear()
+                getattr(metrics, metodo)()
+                for query in consultas:
+                    if query in capturadas.values():
+                        continue
+                    clave = nombre if use_rollup or nombre not in capturadas else f"{nombre}:registro_tiempo"
+                    capturadas[clave] = query
+        return capturadas
+
+    @staticmethod
+    def findings_from_plan(metric, plan, query, dialect):
+        """Escaneos completos de tablas de hechos y filesorts de un plan"""
+        hallazgos = []
+        if dialect == 'sqlite':
+            alias = _alias_de_tablas(query)
+            # Subconsultas que SQLite materializa o recorre como corrutina
+            derivadas = {d.split()[1] for d in plan['detail']
+                         if d.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+            for detalle in plan['detail']:
+                partes = detalle.split()
+                if (partes[0] == 'SCAN' and 'USING' not in partes
+                        and not partes[1].startswith('(') and partes[1] not in derivadas):
+                    tabla = alias.get(partes[1], partes[1])
+                    if tabla not in DIMENSION_TABLES:
+                        hallazgos.append(PlanFinding(metric, ESCANEO_COMPLETO, tabla, detalle))
+                elif detalle.startswith('USE TEMP B-TREE FOR ORDER BY'):
+                    hallazgos.append(PlanFinding(metric, FILESORT, None, detalle))
+            return hallazgos
+
+        for fila in plan.to_dict('records'):
+            tabla = fila.get('table') or ''
+            extra = fila.get('Extra') or ''
+            derivada = tabla.startswith('<')
+            if fila.get('type') == 'ALL' and not derivada and tabla not in DIMENSION_TABLES:
+                hallazgos.append(PlanFinding(metric, ESCANEO_COMPLETO, tabla,
+                                             f"type=ALL rows={fila.get('rows')}"))
+            if 'Using filesort' in extra:
+                hallazgos.append(PlanFinding(metric, FILESORT, tabla, extra))
+        return hallazgos
+
+    def review(self):
+        """Devuelve ({métrica: plan}, [PlanFinding]) de todas las consultas"""
+        planes, hallazgos = {}, []
+        for nombre, query in self.capture_queries().items():
+            plan = self.explain(query, self.metrics.filters)
+            planes[nombre] = plan
+            hallazgos += self.findings_from_plan(nombre, plan, query, self.engine.dialect.name)
+        return planes, hallazgos
+
+    def load_baseline(self, path=None):
+        """Claves de hallazgos aceptados para el dialecto del motor"""
+        path = path or DEFAULT_BASELINE
+        if not os.path.exists(path):
+            return set()
+        with open(path, encoding='utf-8') as f:
+            return set(json.load(f).get(self.engine.dialect.name, []))
+
+    def save_baseline(self, findings, path=None):
+        """Acepta `findings` como línea base del dialecto del motor"""
+        path = path or DEFAULT_BASELINE
+        contenido = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                contenido = json.load(f)
+        contenido[self.engine.dialect.name] = sorted({h.key for h in findings})
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(contenido, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    def regressions(self, findings, baseline=None):
+        """Hallazgos que no están en la línea base"""
+        aceptados = self.load_baseline() if baseline is None else set(baseline)
+        return [h for h in findings if h.key not in aceptados]
+
+
+def run_index_advisor(engine=None, baseline_path=None, update_baseline=False, verbose=False):
+    """Revisa los planes de las métricas; devuelve los hallazgos fuera de la línea base"""
+    advisor = IndexAdvisor(engine)
+    planes, hallazgos = advisor.review()
+    if verbose:
+        for nombre, plan in planes.items():
+            print(f"\n{nombre}:\n{plan.to_string(index=False)}")
+
+    if update_baseline:
+        advisor.save_baseline(hallazgos, baseline_path)
+        print(f"Línea base actualizada con {len(hallazgos)} hallazgos")
+        return []
+
+    nuevos = advisor.regressions(hallazgos, advisor.load_baseline(baseline_path))
+    print(f"Consultas revisadas: {len(planes)}, hallazgos: {len(hallazgos)}, nuevos: {len(nuevos)}")
+    for hallazgo in nuevos:
+        print(f"- {hallazgo.metric}: {hallazgo.kind} {hallazgo.table} ({hallazgo.detail})")
+    return nuevos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN de las consultas de métricas")
+    parser.add_argument('--baseline', help="Archivo JSON con los hallazgos aceptados")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Aceptar los hallazgos actuales como línea base")
+    parser.add_argument('--verbose', action='store_true', help="Mostrar los planes completos")
+    args = parser.parse_args()
+    nuevos = run_index_advisor(baseline_path=args.baseline,
+                               update_baseline=args.update_baseline, verbose=args.verbose)
+    sys.exit(1 if nuevos else 0)
@@ -0,0 +1,362 @@
+"""Ingesta masiva de eventos en registro_tiempo, registro_aplicaciones y capturas_trabajo.
+
+Los eventos llegan por lotes (lista, iterador o archivo NDJSON), se validan por
+columnas con DataValidator según los tipos de entities.py, se descartan los
+repetidos por su clave natural (también los ya guardados) y se escriben con un
+INSERT de varias filas por lote.
+
+Uso:
+    python -m scripts.ingestion registro_tiempo eventos.ndjson --batch-size 10000
+"""
+from models.entities import get_engine, RegistroTiempo, RegistroAplicacion, CapturaTrabajo
+from config.db_config import INGEST_BATCH_SIZE
+from utils.data_validator import DataValidator
+from utils.time_tracker import TimeTracker
+from sqlalchemy import select, Date, DateTime, Enum, Integer, JSON, String, Time
+from datetime import date
+import pandas as pd
+import argparse
+import itertools
+import json
+import time as reloj
+import os
+import sys
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda valor: orjson.dumps(valor).decode('utf-8')
+except ImportError:
+    orjson = None
+    _loads = json.loads
+    _dumps = json.dumps
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Filas rechazadas que se conservan como muestra en IngestResult
+MAX_REJECTED_SAMPLE = 1000
+
+_SEPARADOR_CLAVE = '\x1f'
+
+
+class TableSpec:
+    """Reglas de ingesta de una tabla, deducidas de su modelo.
+
+    Las columnas NOT NULL sin valor por defecto son obligatorias; fechas,
+    horas, enteros, enumerados y longitudes de texto se validan según su tipo.
+    `key` es la clave natural con la que se descartan los repetidos y
+    `range_column` acota la búsqueda de los ya guardados.
+    """
+
+    def __init__(self, model, key, range_column=None):
+        self.table = model.__table__
+        self.key = list(key)
+        self.range_column = range_column
+        self.columns = [c for c in self.table.columns if not c.primary_key]
+        self.names = [c.name for c in self.columns]
+        # Las columnas de la clave natural también son obligatorias
+        self.required = [c.name for c in self.columns
+                         if (not c.nullable and c.default is None) or c.name in self.key]
+
+    def kind(self, name):
+        """Tipo de la columna para validarla y normalizarla"""
+        tipo = self.table.c[name].type
+        for clase, nombre in ((DateTime, 'datetime'), (Date, 'date'), (Time, 'time'),
+                              (Integer, 'integer'), (Enum, 'enum'), (JSON, 'json'), (String, 'string')):
+            if isinstance(tipo, clase):
+                return nombre
+        return 'text'
+
+
+INGEST_TABLES = {
+    'registro_tiempo': TableSpec(
+        RegistroTiempo, ['id_empleado', 'id_actividad', 'fecha', 'hora_inicio'], 'fecha'),
+    'registro_aplicaciones': TableSpec(
+        RegistroAplicacion, ['id_empleado', 'fecha', 'hora_inicio', 'nombre_aplicacion'], 'fecha'),
+    'capturas_trabajo': TableSpec(CapturaTrabajo, ['hash_archivo']),
+}
+
+
+class IngestResult:
+    """Conteos de una ingesta y muestra de las filas rechazadas (con su motivo)"""
+
+    def __init__(self, table):
+        self.table = table
+        self.received = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.failed = 0
+        self.batches = 0
+        self.seconds = 0.0
+        self.rejected = pd.DataFrame(columns=['motivo'])
+
+    @property
+    def rows_per_second(self):
+        return self.received / self.seconds if self.seconds else 0.0
+
+    def _rechazar(self, df):
+        if len(self.rejected) < MAX_REJECTED_SAMPLE and not df.empty:
+            muestra = df.head(MAX_REJECTED_SAMPLE - len(self.rejected))
+            self.rejected = muestra if self.rejected.empty else pd.concat(
+                [self.rejected, muestra], ignore_index=True)
+
+    def __repr__(self):
+        return (f"IngestResult({self.table}: {self.received} recibidos, {self.inserted} insertados, "
+                f"{self.duplicates} repetidos, {self.invalid} inválidos, {self.failed} con error, "
+                f"{self.seconds:.2f}s)")
+
+
+def read_events(source):
+    """Itera los eventos de una lista, iterador, DataFrame o archivo NDJSON.
+
+    Las líneas del NDJSON que no son JSON válido se entregan como None.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for linea in f:
+                linea = linea.strip()
+                if not linea:
+                    continue
+                try:
+                    yield _loads(linea)
+                except ValueError:
+                    yield None
+    elif isinstance(source, pd.DataFrame):
+        yield from source.to_dict('records')
+    else:
+        yield from source
+
+
+def _por_unicos(serie, convertir):
+    """Aplica `convertir` una vez por valor distinto de la columna (los nulos quedan en None)"""
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    valores = pd.Series([convertir(v) for v in unicos] + [None], dtype=object)
+    return pd.Series(valores.to_numpy()[codigos], index=serie.index, dtype=object)
+
+
+def _canonico(serie, longitud):
+    """True si todos los valores ya son texto de `longitud` caracteres (p. ej. 'HH:MM:SS')"""
+    return (pd.api.types.infer_dtype(serie, skipna=True) == 'string'
+            and bool((serie.dropna().str.len() == longitud).all()))
+
+
+def _horas_texto(serie):
+    """Horas como 'HH:MM:SS' a partir de time, timedelta o texto"""
+    if _canonico(serie, 8):
+        return serie
+    segundos = pd.Series(TimeTracker.to_seconds(serie), index=serie.index)
+    return _por_unicos(segundos.astype('Int64'),
+                       lambda s: f"{s // 3600 % 24:02d}:{s // 60 % 60:02d}:{s % 60:02d}")
+
+
+class BulkIngestor:
+    """Escribe eventos por lotes validados y sin repetidos.
+
+    Cada lote se valida por columnas (sin recorrer filas), se normaliza al
+    formato de la base de datos y se inserta con un único executemany en su
+    propia transacción, que el driver de MySQL convierte en un INSERT de varias
+    filas. Las claves que ya existen se buscan con una consulta por lote.
+
+    Ninguna clave natural tiene un índice único: los repetidos solo se
+    descartan con esa búsqueda, así que dos ingestores que escriban a la vez
+    la misma clave en la misma tabla pueden guardarla dos veces.
+    """
+
+    def __init__(self, engine=None, batch_size=None):
+        """Inicializa el ingestor (`batch_size` filas por lote, INGEST_BATCH_SIZE por defecto)"""
+        self.engine = engine if engine is not None else get_engine()
+        self.batch_size = batch_size or INGEST_BATCH_SIZE
+        self.validator = DataValidator()
+        sqlite = self.engine.dialect.name == 'sqlite'
+        # Formatos que SQLAlchemy espera leer en SQLite (en MySQL los convierte el servidor)
+        self._sufijo_hora = '.000000' if sqlite else ''
+
+    def _validar(self, df, spec):
+        """Motivo del rechazo de cada fila (None si es válida)"""
+        motivos = pd.Series(None, index=df.index, dtype=object)
+
+        def marcar(columna, validos, regla):
+            fallan = ~validos & motivos.isna().to_numpy()
+            motivos[fallan] = f"{columna}: {regla}"
+
+        for nombre in spec.names:
+            serie = df[nombre]
+            nulos = serie.isna().to_numpy()
+            if nombre in spec.required:
+                marcar(nombre, self.validator.validate_non_empty_column(serie), 'obligatorio')
+            if nulos.all():
+                continue
+            columna = spec.table.c[nombre]
+            tipo = spec.kind(nombre)
+            if tipo == 'date':
+                validos = self.validator.validate_date_column(serie)
+            elif tipo == 'datetime':
+                validos = self.validator.validate_date_column(serie, format='ISO8601')
+            elif tipo == 'time':
+                validos = self.validator.validate_time_column(serie)
+            elif tipo == 'integer':
+                numeros = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+                # Los identificadores (claves primarias y foráneas) empiezan en 1;
+                # el resto de enteros solo tiene que caber en INT
+                minimo = 1 if columna.primary_key or columna.foreign_keys else -2 ** 31
+                validos = self.validator.validate_range_column(numeros, minimo, 2 ** 31 - 1) & (numeros % 1 == 0)
+            elif tipo == 'enum':
+                validos = serie.isin(columna.type.enums).to_numpy()
+            elif tipo == 'string' and columna.type.length:
+                validos = (serie.astype(str).str.len() <= columna.type.length).to_numpy()
+            else:
+                continue
+            marcar(nombre, validos | nulos, 'formato' if tipo != 'string' else 'longitud')
+        return motivos
+
+    def _normalizar(self, df, spec):
+        """Convierte las columnas al formato canónico (fechas y horas como texto)"""
+        df = df.copy()
+        for nombre in spec.names:
+            tipo = spec.kind(nombre)
+            serie = df[nombre]
+            defecto = spec.table.c[nombre].default
+            if defecto is not None and defecto.is_scalar and serie.isna().any():
+                # El INSERT directo no aplica los valores por defecto del modelo
+                serie = df[nombre] = serie.astype(object).where(serie.notna(), defecto.arg)
+            if serie.isna().all():
+                continue
+            if tipo == 'date' and not _canonico(serie, 10):
+                df[nombre] = _por_unicos(serie, lambda v: pd.Timestamp(v).strftime('%Y-%m-%d'))
+            elif tipo == 'datetime' and not _canonico(serie, 19):
+                df[nombre] = _por_unicos(serie, lambda v: pd.Timestamp(v).strftime('%Y-%m-%d %H:%M:%S'))
+            elif tipo == 'time':
+                df[nombre] = _horas_texto(serie)
+            elif tipo == 'integer':
+                df[nombre] = pd.to_numeric(serie).astype('Int64').astype(object)
+            elif tipo == 'json':
+                df[nombre] = [_dumps(v) if isinstance(v, (dict, list)) else v for v in serie]
+        return df.astype(object).where(df.notna(), None)
+
+    @staticmethod
+    def _claves(df, columnas):
+        """Clave natural de cada fila como un único texto"""
+        partes = [df[c].astype(str) for c in columnas]
+        return partes[0].str.cat(partes[1:], sep=_SEPARADOR_CLAVE) if len(partes) > 1 else partes[0]
+
+    def _existentes(self, connection, df, spec):
+        """Claves del lote que ya están en la tabla (una consulta acotada por lote)"""
+        tabla = spec.table
+        primera = spec.key[0]
+        consulta = select(*[tabla.c[c] for c in spec.key]).where(
+            tabla.c[primera].in_(df[primera].unique().tolist()))
+        if spec.range_column:
+            fechas = df[spec.range_column]
+            consulta = consulta.where(tabla.c[spec.range_column].between(
+                date.fromisoformat(fechas.min()), date.fromisoformat(fechas.max())))
+        filas = connection.execute(consulta).fetchall()
+        if not filas:
+            return set()
+        guardadas = pd.DataFrame(filas, columns=spec.key).astype(object)
+        for nombre in spec.key:
+            if spec.kind(nombre) == 'time':
+                guardadas[nombre] = _horas_texto(guardadas[nombre])
+        return set(self._claves(guardadas, spec.key))
+
+    def _insert_sql(self, connection, spec, columnas):
+        """INSERT de varias filas (los repetidos ya se quitaron con _existentes)"""
+        marca = '?' if connection.dialect.paramstyle == 'qmark' else '%s'
+        return (f"INSERT INTO {spec.table.name} ({', '.join(columnas)}) "
+                f"VALUES ({', '.join([marca] * len(columnas))})")
+
+    def _filas(self, df, spec):
+        """Tuplas para executemany con las horas en el formato del motor"""
+        df = df.copy()
+        if self._sufijo_hora:
+            for nombre in spec.names:
+                if spec.kind(nombre) in ('time', 'datetime'):
+                    serie = df[nombre]
+                    df[nombre] = (serie.astype(str) + self._sufijo_hora).where(serie.notna(), None)
+        return list(df.itertuples(index=False, name=None))
+
+    def _lote(self, eventos, spec, resultado):
+        """Valida, depura e inserta un lote de eventos"""
+        validos = [e for e in eventos if isinstance(e, dict)]
+        if len(validos) < len(eventos):
+            resultado.invalid += len(eventos) - len(validos)
+            resultado._rechazar(pd.DataFrame(
+                {'motivo': ['JSON inválido'] * (len(eventos) - len(validos))}))
+        if not validos:
+            return
+        df = pd.DataFrame.from_records(validos).reindex(columns=spec.names)
+        motivos = self._validar(df, spec)
+        invalidos = motivos.notna().to_numpy()
+        if invalidos.any():
+            resultado.invalid += int(invalidos.sum())
+            resultado._rechazar(df[invalidos].assign(motivo=motivos[invalidos]))
+            df = df[~invalidos]
+        if df.empty:
+            return
+
+        df = self._normalizar(df, spec)
+        claves = self._claves(df, spec.key)
+        unicos = ~claves.duplicated().to_numpy()
+        try:
+            with self.engine.begin() as connection:
+                existentes = self._existentes(connection, df[unicos], spec)
+                nuevos = unicos & ~claves.isin(existentes).to_numpy()
+                if nuevos.any():
+                    connection.exec_driver_sql(self._insert_sql(connection, spec, spec.names),
+                                               self._filas(df[nuevos], spec))
+        except Exception as e:
+            # El lote se descarta completo (su transacción se revierte) y se sigue con el resto
+            print(f"Error al insertar el lote {resultado.batches} en {spec.table.name}: {e}")
+            resultado.failed += len(df)
+            return
+        resultado.duplicates += int(len(df) - nuevos.sum())
+        resultado.inserted += int(nuevos.sum())
+
+    def ingest(self, table, events):
+        """Ingiere `events` en `table` por lotes y devuelve un IngestResult"""
+        if table not in INGEST_TABLES:
+            raise ValueError(f"Tabla de ingesta desconocida: {table} "
+                             f"(disponibles: {', '.join(INGEST_TABLES)})")
+        spec = INGEST_TABLES[table]
+        resultado = IngestResult(table)
+        inicio = reloj.perf_counter()
+        eventos = read_events(events)
+        while True:
+            lote = list(itertools.islice(eventos, self.batch_size))
+            if not lote:
+                break
+            resultado.received += len(lote)
+            resultado.batches += 1
+            self._lote(lote, spec, resultado)
+        resultado.seconds = reloj.perf_counter() - inicio
+        return resultado
+
+    def ingest_time_records(self, events):
+        """Ingiere registros de tiempo (clave: empleado, actividad, fecha y hora de inicio)"""
+        return self.ingest('registro_tiempo', events)
+
+    def ingest_app_logs(self, events):
+        """Ingiere intervalos de uso de aplicaciones (clave: empleado, fecha, hora y aplicación)"""
+        return self.ingest('registro_aplicaciones', events)
+
+    def ingest_screenshots(self, events):
+        """Ingiere metadatos de capturas (clave: hash_archivo)"""
+        return self.ingest('capturas_trabajo', events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingesta masiva de eventos desde NDJSON")
+    parser.add_argument('tabla', choices=sorted(INGEST_TABLES))
+    parser.add_argument('archivo', help="Archivo NDJSON con un evento por línea")
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+
+    resultado = BulkIngestor(batch_size=args.batch_size).ingest(args.tabla, args.archivo)
+    print(f"{resultado} ({resultado.rows_per_second:.0f} filas/s)")
+    if not resultado.rejected.empty:
+        print(resultado.rejected['motivo'].value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from models.entities import (Proyecto, Actividad, Session)
+from models.entities import Proyecto, Actividad, get_session_factory
 import sys
 import os
 from sqlalchemy import func
@@ -9,7 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 def verify_data_exists():
     """Verifica si existen datos en las tablas principales"""
-    with Session() as session:
+    with get_session_factory()() as session:
         proyecto_count = session.query(
             func.count(Proyecto.id_proyecto)).scalar()
         actividad_count = session.query(
@@ -0,0 +1,143 @@
+"""Gráficos del documento de KPIs con caché por contenido.
+
+Cada gráfico se identifica por el hash de los datos que muestra: si ya existe
+una imagen con ese hash en la caché se reutiliza y solo se dibujan los
+gráficos cuyos datos cambiaron. Los pendientes se dibujan en procesos aparte
+con el backend no interactivo Agg; matplotlib solo se importa en esos
+procesos (o en este, si hay un único gráfico pendiente o un solo proceso).
+"""
+from config.db_config import KPI_CHART_WORKERS, KPI_CHART_TOP, KPI_CHART_CACHE_DIR
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Cambiar la versión cuando cambie el dibujo para invalidar la caché
+CHART_VERSION = 1
+
+# Tabla del documento -> (columna de etiquetas, columna de valores, título, eje)
+CHARTS = {
+    'horas_por_empleado': ('id_empleado', 'horas_trabajadas', 'Horas trabajadas por empleado', 'Horas'),
+    'horas_por_proyecto': ('nombre_proyecto', 'horas_trabajadas', 'Horas trabajadas por proyecto', 'Horas'),
+    'tasa_rechazo': ('id_empleado', 'tasa_rechazo', 'Tasa de rechazo por empleado', 'Tasa de rechazo (%)'),
+    'entregables_por_hora': ('id_empleado', 'entregables_por_hora', 'Entregables por hora trabajada',
+                             'Entregables por hora'),
+}
+
+
+def chart_data(result, top=None):
+    """Etiquetas y valores de cada gráfico: los `top` primeros de cada ranking, sin nulos"""
+    top = top or KPI_CHART_TOP
+    datos = {}
+    for clave, tabla in result.tables().items():
+        if clave not in CHARTS:
+            continue
+        etiquetas, valores, titulo, eje = CHARTS[clave]
+        filas = [(str(e), float(v)) for e, v in zip(tabla[etiquetas].tolist(), tabla[valores].tolist())
+                 if not math.isnan(v)][:top]
+        if filas:
+            datos[clave] = {'titulo': titulo, 'eje': eje,
+                            'etiquetas': [e for e, _ in filas], 'valores': [v for _, v in filas]}
+    return datos
+
+
+def chart_key(clave, datos):
+    """Hash del contenido de un gráfico"""
+    contenido = json.dumps([CHART_VERSION, clave, datos], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:20]
+
+
+def draw_chart(datos, ruta):
+    """Dibuja un gráfico de barras horizontales en `ruta` (PNG)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    n = len(datos['valores'])
+    figura = Figure(figsize=(8, max(2.5, 0.3 * n + 1.2)))
+    ejes = figura.add_subplot()
+    # El primero del ranking arriba
+    posiciones = range(n - 1, -1, -1)
+    ejes.barh(posiciones, datos['valores'], color='#4C72B0')
+    ejes.set_yticks(list(posiciones), datos['etiquetas'], fontsize=8)
+    ejes.set_xlabel(datos['eje'])
+    ejes.set_title(datos['titulo'])
+    figura.tight_layout()
+
+    # Se escribe en un temporal para que la caché nunca tenga imágenes a medias
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    figura.savefig(temporal, format='png', dpi=100)
+    os.replace(temporal, ruta)
+    return ruta
+
+
+class ChartRenderer:
+    """Genera los gráficos de un KpiResult reutilizando los que no cambiaron"""
+
+    def __init__(self, cache_dir=None, max_workers=None, top=None):
+        self.cache_dir = cache_dir or KPI_CHART_CACHE_DIR
+        self.max_workers = max(1, max_workers or KPI_CHART_WORKERS)
+        self.top = top or KPI_CHART_TOP
+        self.stats = {'dibujados': 0, 'en_cache': 0, 'errores': 0}
+
+    def _draw(self, pendientes):
+        """Dibuja {clave: (datos, ruta)}; devuelve las claves que fallaron"""
+        fallidos = []
+        if len(pendientes) == 1 or self.max_workers == 1:
+            for clave, (datos, ruta) in pendientes.items():
+                try:
+                    draw_chart(datos, ruta)
+                except Exception as e:
+                    print(f"Error al dibujar el gráfico {clave}: {e}")
+                    fallidos.append(clave)
+            return fallidos
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(pendientes))) as executor:
+            futuros = {clave: executor.submit(draw_chart, datos, ruta)
+                       for clave, (datos, ruta) in pendientes.items()}
+            for clave, futuro in futuros.items():
+                try:
+                    futuro.result()
+                except Exception as e:
+                    print(f"Error al dibujar el gráfico {clave}: {e}")
+                    fallidos.append(clave)
+        return fallidos
+
+    def render(self, result, output_dir):
+        """Copia los gráficos de `result` en output_dir/graficos.
+
+        Devuelve {clave de la tabla: ruta relativa a output_dir} para los
+        renderizadores del documento.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        nombres = {}
+        pendientes = {}
+        for clave, datos in chart_data(result, self.top).items():
+            nombres[clave] = f"{clave}-{chart_key(clave, datos)}.png"
+            ruta = os.path.join(self.cache_dir, nombres[clave])
+            if os.path.exists(ruta):
+                self.stats['en_cache'] += 1
+            else:
+                pendientes[clave] = (datos, ruta)
+
+        fallidos = self._draw(pendientes) if pendientes else []
+        self.stats['dibujados'] += len(pendientes) - len(fallidos)
+        self.stats['errores'] += len(fallidos)
+
+        destino = os.path.join(output_dir, 'graficos')
+        os.makedirs(destino, exist_ok=True)
+        graficos = {}
+        for clave, nombre in nombres.items():
+            if clave in fallidos:
+                continue
+            ruta = os.path.join(destino, nombre)
+            if not os.path.exists(ruta):
+                shutil.copyfile(os.path.join(self.cache_dir, nombre), ruta)
+            graficos[clave] = f"graficos/{nombre}"
+        return graficos
@@ -0,0 +1,314 @@
+"""Cálculo de los KPIs del documento de entregables en una sola pasada.
+
+compute_kpis agrega el dataset unificado con un único groupby por dimensión
+(empleado y proyecto) y devuelve un KpiResult con las tablas ya ordenadas de
+cada sección. Los renderizadores de RENDERERS (Markdown, HTML y JSON)
+escriben el documento a partir del mismo KpiResult, formateando columnas
+completas y no fila a fila.
+"""
+import html
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+# Columna y agregación de cada KPI por empleado, con las columnas que necesita
+EMPLOYEE_KPIS = {
+    'horas_trabajadas': ('sum', ['horas_trabajadas']),
+    'entregables_rechazados': ('sum', ['entregables_rechazados']),
+    'tasa_rechazo': ('mean', ['tasa_rechazo']),
+    'entregables_por_hora': ('mean', ['horas_trabajadas', 'total_entregables']),
+}
+
+RECOMENDACIONES = [
+    "Se recomienda establecer metas de horas productivas por empleado y proyecto.",
+    "Implementar revisiones periódicas de la calidad de entregables.",
+    "Definir acciones correctivas para mejorar la tasa de aprobación de entregables.",
+    "Crear un sistema de recompensas para los empleados con mayor eficiencia.",
+    "Establecer umbrales de alerta para tasas de rechazo superiores al 15%.",
+]
+
+# Tablas del documento: título, encabezados, separador Markdown y formato de cada columna
+TABLES = {
+    'horas_por_empleado': ("1.1 Total de Horas Trabajadas por Empleado",
+                           ["ID Empleado", "Horas Totales"],
+                           "|------------|---------------|", ["{}", "{:.2f}"]),
+    'horas_por_proyecto': ("1.3 Total de Horas Trabajadas por Proyecto",
+                           ["ID Proyecto", "Nombre Proyecto", "Horas Totales"],
+                           "|------------|----------------|---------------|", ["{}", "{}", "{:.2f}"]),
+    'rechazos_por_empleado': ("2.1 Entregables Rechazados por Empleado",
+                              ["ID Empleado", "Entregables Rechazados"],
+                              "|------------|------------------------|", ["{}", "{}"]),
+    'tasa_rechazo': ("2.2 Tasa de Rechazo por Empleado (%)",
+                     ["ID Empleado", "Tasa de Rechazo (%)"],
+                     "|------------|---------------------|", ["{}", "{:.2f}%"]),
+    'entregables_por_hora': ("3.1 Entregables por Hora Trabajada",
+                             ["ID Empleado", "Entregables por Hora"],
+                             "|------------|----------------------|", ["{}", "{:.2f}"]),
+}
+
+# Secciones del documento y sus bloques, en orden
+SECTIONS = [
+    ("1. Horas Trabajadas", ['horas_por_empleado', 'estadisticas_horas', 'horas_por_proyecto']),
+    ("2. Calidad de Entregables", ['rechazos_por_empleado', 'tasa_rechazo']),
+    ("3. Productividad", ['entregables_por_hora']),
+    ("4. Conclusiones y Recomendaciones", ['recomendaciones']),
+]
+
+TITULO_DOCUMENTO = "Documento de KPIs - Sistema de Monitoreo de Productividad"
+
+
+def entregables_por_hora(df):
+    """Entregables por hora de cada registro (0 si no hay horas trabajadas)"""
+    horas = df['horas_trabajadas'].to_numpy(dtype=float, na_value=np.nan)
+    total = df['total_entregables'].to_numpy(dtype=float, na_value=np.nan)
+    resultado = np.zeros(len(df))
+    with np.errstate(invalid='ignore'):
+        validas = horas > 0
+    np.divide(total, horas, out=resultado, where=validas)
+    return resultado
+
+
+class KpiResult:
+    """KPIs agregados por empleado y por proyecto.
+
+    `empleados` tiene una fila por id_empleado (en el orden del groupby) y
+    una columna por KPI disponible; `proyectos` las horas por (id_proyecto,
+    nombre_proyecto), o None si el dataset no trae proyectos.
+    """
+
+    def __init__(self, generated, empleados=None, proyectos=None):
+        self.generated = generated
+        self.empleados = empleados
+        self.proyectos = proyectos
+        self._tables = None
+
+    def has(self, kpi):
+        return self.empleados is not None and kpi in self.empleados.columns
+
+    def ranking(self, kpi):
+        """Tabla (id_empleado, kpi) ordenada de mayor a menor"""
+        return self.empleados[[kpi]].reset_index().sort_values(kpi, ascending=False)
+
+    def project_ranking(self):
+        """Tabla (id_proyecto, nombre_proyecto, horas_trabajadas) de mayor a menor"""
+        return self.proyectos.reset_index().sort_values('horas_trabajadas', ascending=False)
+
+    def hours_stats(self, horas=None):
+        """Promedio, máximo y mínimo de horas por empleado (sobre el ranking ya ordenado)"""
+        horas = (horas if horas is not None else self.ranking('horas_trabajadas'))['horas_trabajadas']
+        return {'promedio': horas.mean(), 'maximo': horas.max(), 'minimo': horas.min()}
+
+    def tables(self):
+        """Tablas ordenadas de las secciones disponibles, con las claves de TABLES"""
+        if self._tables is not None:
+            return self._tables
+        tablas = {}
+        if self.has('horas_trabajadas'):
+            tablas['horas_por_empleado'] = self.ranking('horas_trabajadas')
+            if self.proyectos is not None:
+                tablas['horas_por_proyecto'] = self.project_ranking()
+        if self.has('entregables_rechazados'):
+            rechazos = self.ranking('entregables_rechazados')
+            rechazos['entregables_rechazados'] = [int(v) for v in rechazos['entregables_rechazados']]
+            tablas['rechazos_por_empleado'] = rechazos
+        if self.has('tasa_rechazo'):
+            tablas['tasa_rechazo'] = self.ranking('tasa_rechazo')
+        if self.has('entregables_por_hora'):
+            tablas['entregables_por_hora'] = self.ranking('entregables_por_hora')
+        self._tables = tablas
+        return tablas
+
+    def blocks(self):
+        """Secciones del documento como [(título, [bloques])].
+
+        Un bloque es ('tabla', clave, DataFrame) o ('lista', título, elementos),
+        donde cada elemento es un texto o un par (etiqueta, valor ya formateado).
+        """
+        tablas = self.tables()
+        secciones = []
+        for titulo, claves in SECTIONS:
+            bloques = []
+            for clave in claves:
+                if clave in tablas:
+                    bloques.append(('tabla', clave, tablas[clave]))
+                elif clave == 'estadisticas_horas' and 'horas_por_empleado' in tablas:
+                    estadisticas = self.hours_stats(tablas['horas_por_empleado'])
+                    bloques.append(('lista', "1.2 Estadísticas de Horas Trabajadas", [
+                        ("Promedio de horas trabajadas por empleado", f"{estadisticas['promedio']:.2f}"),
+                        ("Máximo de horas trabajadas por un empleado", f"{estadisticas['maximo']:.2f}"),
+                        ("Mínimo de horas trabajadas por un empleado", f"{estadisticas['minimo']:.2f}"),
+                    ]))
+                elif clave == 'recomendaciones':
+                    bloques.append(('lista', None, RECOMENDACIONES))
+            secciones.append((titulo, bloques))
+        return secciones
+
+
+def compute_kpis(df, generated):
+    """Calcula todos los KPIs con un groupby por empleado y otro por proyecto"""
+    empleados = proyectos = None
+
+    if 'id_empleado' in df.columns:
+        kpis = [kpi for kpi, (_, columnas) in EMPLOYEE_KPIS.items()
+                if all(c in df.columns for c in columnas)]
+        if kpis:
+            # Solo las columnas necesarias, en lugar de copiar el dataset completo
+            datos = {'id_empleado': df['id_empleado']}
+            for kpi in kpis:
+                datos[kpi] = entregables_por_hora(df) if kpi == 'entregables_por_hora' else df[kpi]
+            datos = pd.DataFrame(datos, index=df.index)
+            empleados = datos.groupby('id_empleado', observed=True).agg(
+                {kpi: EMPLOYEE_KPIS[kpi][0] for kpi in kpis})
+
+        if 'horas_trabajadas' in df.columns and 'nombre_proyecto' in df.columns:
+            proyectos = df.groupby(['id_proyecto', 'nombre_proyecto'], observed=True)[
+                ['horas_trabajadas']].sum()
+
+    return KpiResult(generated, empleados, proyectos)
+
+
+def format_rows(tabla, formatos):
+    """Celdas formateadas de una tabla, columna a columna.
+
+    Los valores de cada fila son los mismos objetos que produciría iterrows().
+    """
+    valores = tabla.to_numpy()
+    columnas = [[formato.format(v) for v in valores[:, i]] for i, formato in enumerate(formatos)]
+    return zip(*columnas)
+
+
+def _json_value(valor):
+    """Valor de una celda en JSON (los nulos como null)"""
+    if isinstance(valor, (np.generic,)):
+        valor = valor.item()
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+class MarkdownRenderer:
+    """Documento en Markdown (idéntico al documento histórico si no hay gráficos)"""
+
+    extension = 'md'
+
+    def render(self, result, charts=None):
+        charts = charts or {}
+        lineas = [f"# {TITULO_DOCUMENTO}\n\n",
+                  f"Generado el: {result.generated.strftime('%Y-%m-%d %H:%M:%S')}\n\n"]
+        for titulo, bloques in result.blocks():
+            lineas.append(f"## {titulo}\n\n")
+            for tipo, clave, contenido in bloques:
+                if tipo == 'tabla':
+                    self._tabla(lineas, clave, contenido, charts.get(clave))
+                else:
+                    self._lista(lineas, clave, contenido)
+        return "".join(lineas)
+
+    @staticmethod
+    def _tabla(lineas, clave, tabla, grafico):
+        titulo, encabezados, separador, formatos = TABLES[clave]
+        lineas += [f"### {titulo}\n\n", f"| {' | '.join(encabezados)} |\n", f"{separador}\n"]
+        lineas.extend("| " + " | ".join(fila) + " |\n" for fila in format_rows(tabla, formatos))
+        lineas.append("\n")
+        if grafico:
+            lineas.append(f"![{titulo}]({grafico})\n\n")
+
+    @staticmethod
+    def _lista(lineas, titulo, elementos):
+        if titulo:
+            lineas.append(f"### {titulo}\n\n")
+        lineas.extend(f"- **{e[0]}:** {e[1]}\n" if isinstance(e, tuple) else f"- {e}\n"
+                      for e in elementos)
+        if titulo:
+            lineas.append("\n")
+
+
+class HtmlRenderer:
+    """Documento HTML autónomo, con los gráficos como imágenes enlazadas"""
+
+    extension = 'html'
+
+    def render(self, result, charts=None):
+        charts = charts or {}
+        titulo = html.escape(TITULO_DOCUMENTO)
+        partes = ['<!DOCTYPE html>\n<html lang="es">\n<head>\n<meta charset="utf-8">\n',
+                  f'<title>{titulo}</title>\n',
+                  '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:1em}'
+                  'th,td{border:1px solid #ccc;padding:4px 8px}td.num{text-align:right}img{max-width:100%}</style>\n',
+                  '</head>\n<body>\n',
+                  f'<h1>{titulo}</h1>\n',
+                  f"<p>Generado el: {result.generated.strftime('%Y-%m-%d %H:%M:%S')}</p>\n"]
+        for seccion, bloques in result.blocks():
+            partes.append(f'<h2>{html.escape(seccion)}</h2>\n')
+            for tipo, clave, contenido in bloques:
+                if tipo == 'tabla':
+                    self._tabla(partes, clave, contenido, charts.get(clave))
+                else:
+                    self._lista(partes, clave, contenido)
+        partes.append('</body>\n</html>\n')
+        return "".join(partes)
+
+    @staticmethod
+    def _tabla(partes, clave, tabla, grafico):
+        titulo, encabezados, _, formatos = TABLES[clave]
+        # La primera columna (y el nombre del proyecto) es texto; el resto, números
+        clases = ['' if formato == "{}" and i < len(formatos) - 1 else ' class="num"'
+                  for i, formato in enumerate(formatos)]
+        partes.append(f'<h3>{html.escape(titulo)}</h3>\n<table>\n<thead><tr>')
+        partes.extend(f'<th>{html.escape(e)}</th>' for e in encabezados)
+        partes.append('</tr></thead>\n<tbody>\n')
+        partes.extend('<tr>' + ''.join(f'<td{c}>{html.escape(v)}</td>' for c, v in zip(clases, fila)) + '</tr>\n'
+                      for fila in format_rows(tabla, formatos))
+        partes.append('</tbody>\n</table>\n')
+        if grafico:
+            partes.append(f'<img src="{html.escape(grafico)}" alt="{html.escape(titulo)}">\n')
+
+    @staticmethod
+    def _lista(partes, titulo, elementos):
+        if titulo:
+            partes.append(f'<h3>{html.escape(titulo)}</h3>\n')
+        partes.append('<ul>\n')
+        partes.extend(f'<li><strong>{html.escape(e[0])}:</strong> {html.escape(e[1])}</li>\n'
+                      if isinstance(e, tuple) else f'<li>{html.escape(e)}</li>\n' for e in elementos)
+        partes.append('</ul>\n')
+
+
+class JsonRenderer:
+    """KPIs en JSON con los valores sin formatear (los nulos como null)"""
+
+    extension = 'json'
+
+    def render(self, result, charts=None):
+        tablas = {clave: [dict(zip(tabla.columns, map(_json_value, fila)))
+                          for fila in tabla.to_numpy().tolist()]
+                  for clave, tabla in result.tables().items()}
+        documento = {'titulo': TITULO_DOCUMENTO,
+                     'generado': result.generated.isoformat(timespec='seconds'),
+                     'tablas': tablas,
+                     'recomendaciones': RECOMENDACIONES,
+                     'graficos': dict(charts or {})}
+        if 'horas_por_empleado' in tablas:
+            documento['estadisticas_horas'] = {
+                clave: _json_value(valor)
+                for clave, valor in result.hours_stats(result.tables()['horas_por_empleado']).items()}
+        return json.dumps(documento, ensure_ascii=False, indent=2) + "\n"
+
+
+# Formato -> renderizador; se pueden registrar otros con el mismo método render
+RENDERERS = {
+    'md': MarkdownRenderer(),
+    'html': HtmlRenderer(),
+    'json': JsonRenderer(),
+}
+
+
+def render_markdown(result, charts=None):
+    """Documento de KPIs en Markdown, como una sola cadena"""
+    return RENDERERS['md'].render(result, charts)
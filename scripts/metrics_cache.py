@@ -0,0 +1,173 @@
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import text
+import hashlib
+import pickle
+import threading
+import time as reloj
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'cache', 'metricas')
+
+# Tablas de las que dependen las métricas -> columna con la que se mide su avance.
+# Los nombres de empleados no se guardan en la caché: los añade EmployeeCache
+SOURCE_TABLES = {
+    'registro_tiempo': 'id_registro',
+    'entregables': 'id_entregable',
+    'evaluacion_calidad': 'id_evaluacion',
+    'actividades': 'id_actividad',
+    'proyectos': 'id_proyecto',
+    'resumen_tiempo_diario': 'fecha',
+    'panel_control': 'fecha_actualizacion',
+}
+
+
+def source_markers(connection, tables=None):
+    """Marcadores de cambio (filas, máximo y UPDATE_TIME en MySQL) de las tablas fuente.
+
+    Se leen en una sola consulta. COUNT/MAX detectan altas y bajas; las
+    ediciones in situ solo se detectan en MySQL a través de UPDATE_TIME.
+    """
+    tables = tables or SOURCE_TABLES
+    partes = []
+    for i, (tabla, columna) in enumerate(tables.items()):
+        partes.append(f"(SELECT COUNT(*) FROM {tabla}) AS filas_{i}")
+        partes.append(f"(SELECT MAX({columna}) FROM {tabla}) AS max_{i}")
+    fila = connection.execute(text(f"SELECT {', '.join(partes)}")).fetchone()
+    markers = {tabla: (fila[2 * i], str(fila[2 * i + 1]))
+               for i, tabla in enumerate(tables)}
+
+    if connection.dialect.name == 'mysql':
+        result = connection.execute(text(
+            "SELECT CONCAT(TABLE_SCHEMA, '.', TABLE_NAME), UPDATE_TIME "
+            "FROM information_schema.TABLES WHERE TABLE_SCHEMA IN ('gm_monitor_system', 'gmadministracion')"))
+        actualizaciones = {nombre: str(fecha) for nombre, fecha in result}
+        for tabla in tables:
+            nombre = tabla if '.' in tabla else f'gm_monitor_system.{tabla}'
+            markers[tabla] += (actualizaciones.get(nombre),)
+    return markers
+
+
+class MetricsCache:
+    """Caché de resultados de consultas de métricas en memoria (LRU) y en disco.
+
+    Cada entrada guarda los marcadores de cambio de las tablas fuente con los
+    que se calculó; solo se devuelve si los marcadores actuales coinciden.
+    Los marcadores se consultan como mucho una vez cada `marker_ttl` segundos.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=64, marker_ttl=1.0, disk=True):
+        """Inicializa la caché (cache/metricas por defecto; `disk=False` solo memoria)"""
+        self.cache_dir = (cache_dir or DEFAULT_CACHE_DIR) if disk else None
+        self.max_entries = max_entries
+        self.marker_ttl = marker_ttl
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._markers = {}
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(engine, query, params=None):
+        url = engine.url.render_as_string(hide_password=True)
+        contenido = repr((url, ' '.join(query.split()), sorted((params or {}).items())))
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    def markers(self, engine):
+        """Marcadores actuales de `engine`, reutilizados durante `marker_ttl` segundos"""
+        url = engine.url.render_as_string(hide_password=True)
+        with self._lock:
+            guardados = self._markers.get(url)
+            if guardados and reloj.monotonic() - guardados[0] < self.marker_ttl:
+                return guardados[1]
+        with engine.connect() as connection:
+            markers = source_markers(connection)
+        with self._lock:
+            self._markers[url] = (reloj.monotonic(), markers)
+        return markers
+
+    def _ruta(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _leer(self, key, markers):
+        """Busca la entrada en memoria y después en disco"""
+        with self._lock:
+            entrada = self._memoria.get(key)
+            if entrada is not None and entrada['markers'] == markers:
+                self._memoria.move_to_end(key)
+                self.hits_memoria += 1
+                return entrada['df'].copy()
+
+        if self.cache_dir and os.path.exists(self._ruta(key)):
+            try:
+                with open(self._ruta(key), 'rb') as f:
+                    entrada = pickle.load(f)
+            except Exception:
+                entrada = None
+            if entrada is not None and entrada['markers'] == markers:
+                with self._lock:
+                    self.hits_disco += 1
+                    self._guardar_en_memoria(key, entrada)
+                return entrada['df'].copy()
+        return None
+
+    def _guardar_en_memoria(self, key, entrada):
+        self._memoria[key] = entrada
+        self._memoria.move_to_end(key)
+        while len(self._memoria) > self.max_entries:
+            self._memoria.popitem(last=False)
+
+    def _escribir(self, key, entrada):
+        with self._lock:
+            self._guardar_en_memoria(key, entrada)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporal = f"{self._ruta(key)}.{threading.get_ident()}.tmp"
+            with open(temporal, 'wb') as f:
+                pickle.dump(entrada, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self._ruta(key))
+
+    def get_or_compute(self, engine, query, compute, params=None):
+        """Devuelve el resultado guardado de `query` o lo calcula con `compute()`"""
+        try:
+            markers = self.markers(engine)
+        except Exception as e:
+            print(f"No se pudieron leer los marcadores de cambio, se omite la caché: {e}")
+            with self._lock:
+                self.misses += 1
+            return compute()
+        key = self._key(engine, query, params)
+        df = self._leer(key, markers)
+        if df is not None:
+            return df
+
+        with self._lock:
+            self.misses += 1
+        df = compute()
+        self._escribir(key, {'markers': markers, 'df': df, 'creado': datetime.now()})
+        return df.copy()
+
+    def clear(self):
+        """Vacía ambos niveles de la caché"""
+        with self._lock:
+            self._memoria.clear()
+            self._markers.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for nombre in os.listdir(self.cache_dir):
+                if nombre.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, nombre))
+
+    def stats(self):
+        """Aciertos (memoria/disco), fallos y tasa de acierto"""
+        with self._lock:
+            hits = self.hits_memoria + self.hits_disco
+            total = hits + self.misses
+            return {'hits_memoria': self.hits_memoria, 'hits_disco': self.hits_disco,
+                    'misses': self.misses, 'entradas_memoria': len(self._memoria),
+                    'tasa_acierto': round(hits / total, 4) if total else 0.0}
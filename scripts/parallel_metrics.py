@@ -0,0 +1,126 @@
+from config.db_config import METRICS_MAX_WORKERS, METRICS_QUERY_TIMEOUT
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from models.pooling import create_pooled_engine
+import pandas as pd
+import copy
+import time as reloj
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Nombre del CSV exportado -> método de ProductivityMetrics
+METRIC_QUERIES = {
+    'porcentaje_aprobados': 'get_approved_deliverables_percentage',
+    'tiempo_por_tarea': 'get_average_time_per_task',
+    'calidad_entregables': 'get_deliverable_quality_metrics',
+    'tiempo_proyecto': 'get_project_time_investment',
+    'productividad_empleado': 'get_employee_productivity',
+    'rechazo_proyecto': 'get_project_rejection_rate',
+    'datos_dashboard': 'get_dashboard_data'
+}
+
+
+class MetricResult:
+    """Resultado de una métrica: DataFrame, duración y error (si lo hubo)"""
+
+    def __init__(self, name, df, seconds, error=None):
+        self.name = name
+        self.df = df
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def rows(self):
+        return len(self.df)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        estado = 'ok' if self.ok else f'error={self.error!r}'
+        return f"MetricResult({self.name}, {self.rows} filas, {self.seconds:.3f}s, {estado})"
+
+
+class ParallelMetricsRunner:
+    """Ejecuta las consultas de ProductivityMetrics en paralelo.
+
+    Cada consulta corre en un hilo de un pool acotado y con su propia conexión.
+    Un fallo o un tiempo agotado solo afecta a su métrica. El límite de tiempo
+    se aplica desde que empieza cada consulta; en MySQL se envía además como
+    MAX_EXECUTION_TIME para que el servidor la cancele.
+    """
+
+    def __init__(self, metrics, max_workers=None, timeout=None, queries=None):
+        """Prepara el ejecutor para `metrics` (ProductivityMetrics o subclase)"""
+        self.metrics = metrics
+        self.queries = dict(queries or METRIC_QUERIES)
+        workers = max_workers or getattr(metrics, 'max_workers', None) or METRICS_MAX_WORKERS
+        self.max_workers = max(1, min(workers, len(self.queries)))
+        self.timeout = METRICS_QUERY_TIMEOUT if timeout is None else timeout
+
+    def _worker_metrics(self):
+        """Copia de las métricas que propaga errores y usa un pool del tamaño del ejecutor"""
+        metrics = copy.copy(self.metrics)
+        metrics.raise_errors = True
+        metrics.query_timeout = self.timeout or None
+        engine = getattr(metrics, 'engine', None)
+        dedicado = None
+        # SQLite no gana nada con más conexiones (y perdería los eventos del motor)
+        if engine is not None and engine.dialect.name != 'sqlite' and self.max_workers > 1:
+            dedicado = create_pooled_engine(engine.url, pool_size=self.max_workers, max_overflow=0)
+            metrics.engine = dedicado
+        return metrics, dedicado
+
+    def run(self):
+        """Ejecuta todas las métricas y devuelve {nombre: MetricResult} en el orden original"""
+        metrics, dedicado = self._worker_metrics()
+        inicios = {}
+
+        def ejecutar(name, method):
+            inicios[name] = reloj.perf_counter()
+            df = getattr(metrics, method)()
+            return df, reloj.perf_counter() - inicios[name]
+
+        resultados = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='metricas')
+        try:
+            futures = {executor.submit(ejecutar, name, method): name
+                       for name, method in self.queries.items()}
+            pendientes = set(futures)
+            while pendientes:
+                espera = None
+                if self.timeout:
+                    ahora = reloj.perf_counter()
+                    limites = [inicios[futures[f]] + self.timeout - ahora
+                               for f in pendientes if futures[f] in inicios]
+                    espera = max(0.0, min(limites)) if limites else 0.05
+                hechos, pendientes = wait(pendientes, timeout=espera, return_when=FIRST_COMPLETED)
+
+                for future in hechos:
+                    name = futures[future]
+                    try:
+                        df, segundos = future.result()
+                        resultados[name] = MetricResult(name, df, segundos)
+                    except Exception as e:
+                        segundos = reloj.perf_counter() - inicios.get(name, reloj.perf_counter())
+                        resultados[name] = MetricResult(name, pd.DataFrame(), segundos, error=e)
+
+                if self.timeout:
+                    ahora = reloj.perf_counter()
+                    for future in list(pendientes):
+                        name = futures[future]
+                        if name in inicios and ahora - inicios[name] >= self.timeout:
+                            pendientes.discard(future)
+                            resultados[name] = MetricResult(
+                                name, pd.DataFrame(), ahora - inicios[name],
+                                error=TimeoutError(f"'{name}' superó {self.timeout}s"))
+        finally:
+            # Los hilos de consultas agotadas no se pueden interrumpir: no se esperan
+            executor.shutdown(wait=False, cancel_futures=True)
+            if dedicado is not None:
+                dedicado.dispose()
+
+        return {name: resultados[name] for name in self.queries}
@@ -0,0 +1,81 @@
+from scripts.data_standardization import DataStandardizer
+import os
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+class PipelineContext:
+    """Contexto de una ejecución del pipeline.
+
+    Extrae cada tabla fuente una sola vez por ejecución y comparte los
+    DataFrames estandarizados entre el documento de KPIs, la exportación
+    del dataset unificado y las métricas de productividad.
+    """
+
+    def __init__(self, standardizer=None, incremental=None, full=False):
+        """Inicializa el contexto con un estandarizador (nuevo si no se indica).
+
+        Si se indica un IncrementalExtractor, registro_tiempo y entregables se
+        leen de su almacén extrayendo solo las filas nuevas (o todo con `full`).
+        """
+        self.standardizer = standardizer if standardizer is not None else DataStandardizer()
+        self.incremental = incremental
+        self.full = full
+        self._frames = {}
+
+    def _cached(self, name, loader):
+        """Devuelve el DataFrame `name`, cargándolo solo la primera vez"""
+        if name not in self._frames:
+            self._frames[name] = loader()
+        return self._frames[name]
+
+    @property
+    def empleados(self):
+        """Empleados de gmadministracion.empleados"""
+        return self._cached('empleados', self.standardizer.get_cross_database_data)
+
+    @property
+    def actividades(self):
+        """Actividades con los datos de su proyecto"""
+        return self._cached('actividades', self.standardizer.get_activities_data)
+
+    @property
+    def tiempo(self):
+        """Registros de tiempo estandarizados (con horas_trabajadas)"""
+        if self.incremental is not None:
+            return self._cached('tiempo', lambda: self.incremental.get_time_records(full=self.full))
+        return self._cached('tiempo', self.standardizer.get_standardized_time_records)
+
+    @property
+    def entregables(self):
+        """Entregables con su evaluación, estandarizados"""
+        if self.incremental is not None:
+            return self._cached('entregables', lambda: self.incremental.get_deliverables_data(full=self.full))
+        return self._cached('entregables', lambda: self.standardizer.standardize_deliverables(
+            self.standardizer.get_deliverables_data()))
+
+    @property
+    def aplicaciones(self):
+        """Aplicaciones usadas en cada registro de tiempo (id_registro, app)"""
+        return self._cached('aplicaciones', lambda: self.standardizer.standardize_app_usage(self.tiempo))
+
+    @property
+    def unified(self):
+        """Dataset unificado construido a partir de los DataFrames en memoria"""
+        return self._cached('unified', lambda: self.standardizer.build_unified_dataset(
+            self.empleados, self.actividades, self.tiempo, self.entregables))
+
+    def run(self):
+        """Equivalente a DataStandardizer.run() sobre los datos del contexto"""
+        print("Ejecutando proceso de estandarización de datos...")
+        df_unified = self.unified
+
+        if df_unified is not None and not df_unified.empty:
+            print(
+                f"Dataset unificado creado exitosamente con {len(df_unified)} registros")
+            return df_unified
+        else:
+            print("No se pudo crear el dataset unificado")
+            return None
@@ -0,0 +1,141 @@
+import pandas as pd
+from datetime import datetime
+import os
+import shutil
+import sys
+
+# Añadir directorio raíz al path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'entregables', 'dataset_unificado')
+
+# Se particiona por mes de `fecha` (YYYYMM) y por proyecto; dentro de cada archivo las
+# filas van ordenadas por fecha, así que un filtro por días se resuelve con las
+# estadísticas de los grupos de filas sin crear un archivo diminuto por día
+PARTITION_COLUMNS = ['mes', 'id_proyecto']
+MAX_PARTITIONS = 100000
+
+
+def _arrow():
+    """Importa pyarrow solo cuando se usa el almacén columnar"""
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "El almacén columnar requiere pyarrow (pip install -r requirements.txt)") from e
+    return pyarrow
+
+
+class UnifiedSnapshotStore:
+    """Instantáneas del dataset unificado en Parquet particionado por fecha e id_proyecto.
+
+    Cada instantánea es un directorio YYYYMMDD con particiones estilo Hive
+    (mes=YYYYMM/id_proyecto=...). Al leer, los filtros sobre fecha y proyecto
+    descartan directorios completos y el resto se aplica sobre las
+    estadísticas de cada grupo de filas (predicate pushdown).
+    """
+
+    def __init__(self, base_dir=None):
+        """Inicializa el almacén en `base_dir` (entregables/dataset_unificado por defecto)"""
+        self.base_dir = base_dir or DEFAULT_SNAPSHOT_DIR
+
+    def _partitioning(self):
+        pa = _arrow()
+        return pa.dataset.partitioning(
+            pa.schema([('mes', pa.int32()), ('id_proyecto', pa.int32())]), flavor='hive')
+
+    def list_snapshots(self):
+        """Lista las instantáneas disponibles, de la más antigua a la más reciente"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(d for d in os.listdir(self.base_dir)
+                      if os.path.isdir(os.path.join(self.base_dir, d)) and d.isdigit())
+
+    def latest(self):
+        """Nombre de la instantánea más reciente (None si no hay)"""
+        snapshots = self.list_snapshots()
+        return snapshots[-1] if snapshots else None
+
+    @staticmethod
+    def _to_arrow_frame(df):
+        """Prepara el dataset para Arrow conservando los tipos"""
+        fechas = pd.to_datetime(df['fecha'])
+        df = df.assign(mes=(fechas.dt.year * 100 + fechas.dt.month).astype('int32'),
+                       _orden=fechas).sort_values('_orden', kind='stable')
+        df['fecha'] = df.pop('_orden').dt.date
+        df['id_proyecto'] = pd.to_numeric(df['id_proyecto']).astype('Int32')
+        return df
+
+    def _apps_path(self, snapshot):
+        """Archivo con la tabla de aplicaciones de una instantánea (junto a su directorio)"""
+        return os.path.join(self.base_dir, f'{snapshot}_aplicaciones.parquet')
+
+    def save(self, df, snapshot=None, apps=None):
+        """Guarda `df` como la instantánea `snapshot` (YYYYMMDD de hoy por defecto).
+
+        `apps` es la tabla larga (id_registro, app) de standardize_app_usage.
+        """
+        pa = _arrow()
+        snapshot = snapshot or datetime.now().strftime('%Y%m%d')
+        path = os.path.join(self.base_dir, snapshot)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        if os.path.exists(self._apps_path(snapshot)):
+            os.remove(self._apps_path(snapshot))
+        os.makedirs(path)
+
+        table = pa.Table.from_pandas(self._to_arrow_frame(df), preserve_index=False)
+        pa.dataset.write_dataset(
+            table, path, format='parquet', partitioning=self._partitioning(),
+            existing_data_behavior='overwrite_or_ignore', max_partitions=MAX_PARTITIONS)
+        if apps is not None:
+            pa.parquet.write_table(pa.Table.from_pandas(apps, preserve_index=False),
+                                   self._apps_path(snapshot))
+        return path
+
+    def load_app_usage(self, snapshot=None):
+        """Tabla (id_registro, app) guardada con la instantánea (vacía si no hay)"""
+        pa = _arrow()
+        snapshot = snapshot or self.latest()
+        if snapshot is None or not os.path.exists(self._apps_path(snapshot)):
+            return pd.DataFrame()
+        return pa.parquet.read_table(self._apps_path(snapshot)).to_pandas()
+
+    def load(self, columns=None, fecha_desde=None, fecha_hasta=None, proyectos=None, snapshot=None):
+        """Lee una instantánea leyendo solo las particiones y columnas pedidas.
+
+        `fecha_desde`/`fecha_hasta` (inclusive) y `proyectos` (lista de
+        id_proyecto) se traducen a filtros de partición.
+        """
+        pa = _arrow()
+        snapshot = snapshot or self.latest()
+        if snapshot is None:
+            return pd.DataFrame()
+
+        dataset = pa.dataset.dataset(
+            os.path.join(self.base_dir, snapshot), format='parquet',
+            partitioning=self._partitioning())
+
+        filtro = None
+        campo = pa.dataset.field
+        condiciones = []
+        if fecha_desde is not None:
+            desde = pd.Timestamp(fecha_desde)
+            condiciones.append(campo('mes') >= desde.year * 100 + desde.month)
+            condiciones.append(campo('fecha') >= pa.scalar(desde.date()))
+        if fecha_hasta is not None:
+            hasta = pd.Timestamp(fecha_hasta)
+            condiciones.append(campo('mes') <= hasta.year * 100 + hasta.month)
+            condiciones.append(campo('fecha') <= pa.scalar(hasta.date()))
+        if proyectos is not None:
+            condiciones.append(campo('id_proyecto').isin([int(p) for p in proyectos]))
+        for condicion in condiciones:
+            filtro = condicion if filtro is None else filtro & condicion
+
+        if columns is None:
+            columns = [c for c in dataset.schema.names if c != 'mes']
+        table = dataset.to_table(columns=list(columns), filter=filtro)
+        return table.to_pandas()
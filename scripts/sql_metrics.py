@@ -1,9 +1,16 @@
-from models.entities import engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from config.db_config import SQLALCHEMY_DATABASE_URI
+from models.entities import get_engine
+from models.query_filter import QueryFilter
+from scripts.daily_rollup import refresh_daily_rollup
+from scripts.parallel_metrics import ParallelMetricsRunner
+from scripts.metrics_cache import MetricsCache
+from scripts.employee_cache import EmployeeCache
+from models.pooling import pool_status
 import pandas as pd
 from sqlalchemy import text
+from config.db_config import METRICS_MAX_WORKERS
+from datetime import datetime
+import time as reloj
+import argparse
 import os
 import sys
 
@@ -11,305 +18,593 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
-class ProductivityMetrics:
-    """Clase para calcular métricas de productividad usando SQL"""
-
-    def __init__(self):
-        """Inicializa la conexión a la base de datos"""
-        self.engine = engine
-
-    def get_approved_deliverables_percentage(self):
-        """Calcula el porcentaje de entregables aprobados por empleado"""
-        query = """
+# Segundos de un registro de tiempo: equivale a TIMESTAMPDIFF(SECOND, CONCAT(rt.fecha, ' ',
+# rt.hora_inicio), CONCAT(rt.fecha, ' ', rt.hora_fin)) sin construir cadenas por fila
+SEGUNDOS_REGISTRO = "(TIME_TO_SEC(rt.hora_fin) - TIME_TO_SEC(rt.hora_inicio))"
+
+# resumen_tiempo_diario agregado por empleado y actividad ({where}: filtro del periodo)
+RESUMEN_POR_ACTIVIDAD = """
+            SELECT
+                id_empleado,
+                id_actividad,
+                SUM(segundos_trabajados) AS segundos,
+                SUM(total_registros) AS registros
+            FROM
+                resumen_tiempo_diario
+            {where}
+            GROUP BY
+                id_empleado, id_actividad
+"""
+
+# Parte del panel de control que sale de las horas, por (empleado, proyecto).
+# {fuente}/{segundos} permiten leer del resumen diario o de registro_tiempo;
+# {where} recibe las condiciones del filtro.
+_PANEL_TIEMPO = """
+                SELECT
+                    t.id_empleado,
+                    a.id_proyecto,
+                    COUNT(DISTINCT t.id_actividad) AS actividades,
+                    COUNT(DISTINCT CASE WHEN a.estado = 'Completada' THEN t.id_actividad END) AS completadas,
+                    SUM({segundos}) AS segundos,
+                    0 AS entregables,
+                    0 AS aprobados,
+                    0 AS rechazados,
+                    0 AS suma_calificacion,
+                    0 AS evaluaciones
+                FROM
+                    {fuente} t
+                JOIN
+                    actividades a ON t.id_actividad = a.id_actividad
+                {where}
+                GROUP BY
+                    t.id_empleado, a.id_proyecto
+"""
+
+
+def _dashboard_sql(use_rollup=True, with_names=True, filters=None):
+    """Consulta del panel de control.
+
+    Cada tabla de hechos (tiempo, entregables, evaluaciones) se agrega por
+    separado a (empleado, proyecto) y después se combinan, de modo que las
+    horas no se multiplican por el número de entregables o evaluaciones.
+    Sin `with_names` no se une gmadministracion.empleados y falta
+    nombre_empleado (se añade con EmployeeCache). Con `filters` (QueryFilter)
+    cada tabla de hechos se filtra antes de agregarse; las evaluaciones siguen
+    a su entregable.
+    """
+    filtro = filters or QueryFilter()
+    where_tiempo = filtro.where(fecha='t.fecha', empleado='t.id_empleado', proyecto='a.id_proyecto')
+    where_entregables = filtro.where(fecha='e.fecha_entrega', empleado='e.id_empleado',
+                                     proyecto='a.id_proyecto')
+    if use_rollup:
+        tiempo = _PANEL_TIEMPO.format(fuente='resumen_tiempo_diario',
+                                      segundos='t.segundos_trabajados', where=where_tiempo)
+    else:
+        tiempo = _PANEL_TIEMPO.format(
+            fuente='registro_tiempo',
+            segundos='(TIME_TO_SEC(t.hora_fin) - TIME_TO_SEC(t.hora_inicio))', where=where_tiempo)
+
+    nombre = "CONCAT(emp.nombres, ' ', emp.apellidos) AS nombre_empleado," if with_names else ''
+    empleados = """LEFT JOIN
+            gmadministracion.empleados emp ON f.id_empleado = emp.idempleado""" if with_names else ''
+
+    return f"""
         SELECT
-            e.id_empleado,
-            CONCAT(emp.nombres, ' ', emp.apellidos) AS nombre_empleado,
-            COUNT(e.id_entregable) AS total_entregables,
-            SUM(CASE WHEN e.estado = 'Aprobado' THEN 1 ELSE 0 END) AS entregables_aprobados,
-            ROUND((SUM(CASE WHEN e.estado = 'Aprobado' THEN 1 ELSE 0 END) / COUNT(e.id_entregable)) * 100, 2) AS porcentaje_aprobados
+            f.id_empleado,
+            {nombre}
+            p.id_proyecto,
+            p.nombre_proyecto,
+            f.total_actividades,
+            f.actividades_completadas,
+            COALESCE(ROUND(f.actividades_completadas * 100.0 / NULLIF(f.total_actividades, 0), 2), 0) AS pct_completado,
+            f.segundos / 3600.0 AS total_horas,
+            f.total_entregables,
+            f.entregables_aprobados,
+            f.entregables_rechazados,
+            COALESCE(ROUND(f.suma_calificacion * 1.0 / NULLIF(f.evaluaciones, 0), 2), 0) AS calificacion_promedio
         FROM
-            entregables e
-        LEFT JOIN
-            gmadministracion.empleados emp ON e.id_empleado = emp.idempleado
-        GROUP BY
-            e.id_empleado, nombre_empleado
-        ORDER BY
-            porcentaje_aprobados DESC
+            (SELECT
+                id_empleado,
+                id_proyecto,
+                SUM(actividades) AS total_actividades,
+                SUM(completadas) AS actividades_completadas,
+                SUM(segundos) AS segundos,
+                SUM(entregables) AS total_entregables,
+                SUM(aprobados) AS entregables_aprobados,
+                SUM(rechazados) AS entregables_rechazados,
+                SUM(suma_calificacion) AS suma_calificacion,
+                SUM(evaluaciones) AS evaluaciones
+            FROM ({tiempo}
+                UNION ALL
+                SELECT
+                    e.id_empleado,
+                    a.id_proyecto,
+                    0, 0, 0,
+                    COUNT(*),
+                    SUM(CASE WHEN e.estado = 'Aprobado' THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN e.estado = 'Rechazado' THEN 1 ELSE 0 END),
+                    0, 0
+                FROM
+                    entregables e
+                JOIN
+                    actividades a ON e.id_actividad = a.id_actividad
+                {where_entregables}
+                GROUP BY
+                    e.id_empleado, a.id_proyecto
+                UNION ALL
+                SELECT
+                    e.id_empleado,
+                    a.id_proyecto,
+                    0, 0, 0, 0, 0, 0,
+                    SUM(ec.calificacion_general),
+                    COUNT(ec.calificacion_general)
+                FROM
+                    evaluacion_calidad ec
+                JOIN
+                    entregables e ON ec.id_entregable = e.id_entregable
+                JOIN
+                    actividades a ON e.id_actividad = a.id_actividad
+                {where_entregables}
+                GROUP BY
+                    e.id_empleado, a.id_proyecto
+            ) hechos
+            GROUP BY
+                id_empleado, id_proyecto) f
+        JOIN
+            proyectos p ON f.id_proyecto = p.id_proyecto
+        {empleados}
         """
 
-        try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
+
+DASHBOARD_SQL = _dashboard_sql(use_rollup=True)
+
+DASHBOARD_COLUMNS = ['id_empleado', 'nombre_empleado', 'id_proyecto', 'nombre_proyecto',
+                     'total_actividades', 'actividades_completadas', 'pct_completado',
+                     'total_horas', 'total_entregables', 'entregables_aprobados',
+                     'entregables_rechazados', 'calificacion_promedio']
+
+
+class ProductivityMetrics:
+    """Clase para calcular métricas de productividad usando SQL"""
+
+    # Hilos para export_metrics_to_csv, propagar errores en lugar de devolver un
+    # DataFrame vacío, límite de tiempo por consulta en segundos (MySQL) y caché
+    max_workers = METRICS_MAX_WORKERS
+    raise_errors = False
+    query_timeout = None
+    cache = None
+
+    def __init__(self, engine=None, use_rollup=True, cache=None, employees=None, filters=None):
+        """Inicializa la conexión a la base de datos.
+
+        Con `use_rollup` las métricas de horas se leen de resumen_tiempo_diario
+        (ver scripts/daily_rollup.py) en lugar de recorrer registro_tiempo.
+        Con `cache` (MetricsCache) los resultados se reutilizan mientras las
+        tablas fuente no cambien. Los nombres de los empleados salen de
+        `employees` (EmployeeCache) en lugar de unir gmadministracion.empleados.
+        `filters` (QueryFilter) limita todas las métricas a un periodo,
+        proyectos, clientes o empleados; cada método acepta otro filtro.
+        """
+        self.engine = engine if engine is not None else get_engine()
+        self.use_rollup = use_rollup
+        self.cache = cache
+        self.employees = employees if employees is not None else EmployeeCache(self.engine)
+        self.filters = filters
+
+    def _filter(self, filters=None):
+        """Filtro de una consulta: el recibido, el de la instancia o uno vacío"""
+        filtro = filters if filters is not None else self.filters
+        return filtro if filtro is not None else QueryFilter()
+
+    def _execute(self, query, filters=None):
+        """Ejecuta `query` con los parámetros de `filters` y devuelve el resultado como DataFrame.
+
+        Con `query_timeout` (MySQL) el límite se fija en la sesión solo durante
+        esta consulta: la conexión vuelve al pool con el valor por defecto.
+        """
+        with self.engine.connect() as connection:
+            limitar = self.query_timeout and connection.dialect.name == 'mysql'
+            if limitar:
+                connection.execute(text(
+                    f"SET SESSION MAX_EXECUTION_TIME = {int(self.query_timeout * 1000)}"))
+            try:
+                result = connection.execute(filters.bind(query) if filters else text(query))
                 df = pd.DataFrame(result.fetchall())
                 if not df.empty:
                     df.columns = result.keys()
                 return df
+            finally:
+                if limitar:
+                    try:
+                        connection.execute(text("SET SESSION MAX_EXECUTION_TIME = DEFAULT"))
+                    except Exception:
+                        # Sin poder restablecerla, la conexión no vuelve al pool
+                        connection.invalidate()
+
+    def _run_query(self, query, error_message, names=False, filters=None):
+        """Ejecuta una consulta de métricas y devuelve un DataFrame (vacío si falla).
+
+        Con `names` se inserta nombre_empleado tras id_empleado desde la
+        dimensión de empleados. Los valores de `filters` se envían como
+        parámetros y forman parte de la clave de la caché.
+        """
+        filtro = filters if filters else None
+        try:
+            if self.cache is not None:
+                df = self.cache.get_or_compute(self.engine, query, lambda: self._execute(query, filtro),
+                                               params=filtro.params() if filtro else None)
+            else:
+                df = self._execute(query, filtro)
+            return self.employees.add_names(df) if names else df
         except Exception as e:
-            print(f"Error al obtener porcentaje de entregables aprobados: {e}")
+            if self.raise_errors:
+                raise
+            print(f"{error_message}: {e}")
             return pd.DataFrame()
 
-    def get_average_time_per_task(self):
-        """Calcula el tiempo promedio por tarea en horas"""
-        query = """
+    def get_approved_deliverables_percentage(self, filters=None):
+        """Calcula el porcentaje de entregables aprobados por empleado"""
+        filtro = self._filter(filters)
+        query = f"""
         SELECT
-            a.id_actividad,
-            a.nombre_actividad,
-            p.nombre_proyecto,
-            AVG(TIMESTAMPDIFF(SECOND, CONCAT(fecha, ' ', rt.hora_inicio), 
-                CONCAT(fecha, ' ', rt.hora_fin)) / 3600) AS tiempo_promedio_horas,
-            COUNT(DISTINCT rt.id_empleado) AS num_empleados_involucrados
+            e.id_empleado,
+            COUNT(e.id_entregable) AS total_entregables,
+            SUM(CASE WHEN e.estado = 'Aprobado' THEN 1 ELSE 0 END) AS entregables_aprobados,
+            ROUND(SUM(CASE WHEN e.estado = 'Aprobado' THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(e.id_entregable), 0), 2) AS porcentaje_aprobados
         FROM
-            registro_tiempo rt
-        JOIN
-            actividades a ON rt.id_actividad = a.id_actividad
-        JOIN
-            proyectos p ON a.id_proyecto = p.id_proyecto
+            entregables e
+        {filtro.where(fecha='e.fecha_entrega', empleado='e.id_empleado', actividad='e.id_actividad')}
         GROUP BY
-            a.id_actividad, a.nombre_actividad, p.nombre_proyecto
+            e.id_empleado
         ORDER BY
-            tiempo_promedio_horas DESC
+            porcentaje_aprobados DESC
         """
+        return self._run_query(query, "Error al obtener porcentaje de entregables aprobados", names=True,
+                               filters=filtro)
 
-        try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
-                df = pd.DataFrame(result.fetchall())
-                if not df.empty:
-                    df.columns = result.keys()
-                return df
-        except Exception as e:
-            print(f"Error al obtener tiempo promedio por tarea: {e}")
-            return pd.DataFrame()
-
-    def get_deliverable_quality_metrics(self):
+    def get_average_time_per_task(self, filters=None):
+        """Calcula el tiempo promedio por tarea en horas"""
+        filtro = self._filter(filters)
+        if self.use_rollup:
+            query = f"""
+            SELECT
+                a.id_actividad,
+                a.nombre_actividad,
+                p.nombre_proyecto,
+                SUM(r.segundos_trabajados) / 3600.0 / SUM(r.total_registros) AS tiempo_promedio_horas,
+                COUNT(DISTINCT r.id_empleado) AS num_empleados_involucrados
+            FROM
+                resumen_tiempo_diario r
+            JOIN
+                actividades a ON r.id_actividad = a.id_actividad
+            JOIN
+                proyectos p ON a.id_proyecto = p.id_proyecto
+            {filtro.where(fecha='r.fecha', empleado='r.id_empleado', proyecto='a.id_proyecto')}
+            GROUP BY
+                a.id_actividad, a.nombre_actividad, p.nombre_proyecto
+            ORDER BY
+                tiempo_promedio_horas DESC
+            """
+        else:
+            query = f"""
+            SELECT
+                a.id_actividad,
+                a.nombre_actividad,
+                p.nombre_proyecto,
+                AVG({SEGUNDOS_REGISTRO} / 3600.0) AS tiempo_promedio_horas,
+                COUNT(DISTINCT rt.id_empleado) AS num_empleados_involucrados
+            FROM
+                registro_tiempo rt
+            JOIN
+                actividades a ON rt.id_actividad = a.id_actividad
+            JOIN
+                proyectos p ON a.id_proyecto = p.id_proyecto
+            {filtro.where(fecha='rt.fecha', empleado='rt.id_empleado', proyecto='a.id_proyecto')}
+            GROUP BY
+                a.id_actividad, a.nombre_actividad, p.nombre_proyecto
+            ORDER BY
+                tiempo_promedio_horas DESC
+            """
+        return self._run_query(query, "Error al obtener tiempo promedio por tarea", filters=filtro)
+
+    def get_deliverable_quality_metrics(self, filters=None):
         """Obtiene métricas de calidad de entregables"""
-        query = """
+        filtro = self._filter(filters)
+        query = f"""
         SELECT
             e.id_empleado,
-            CONCAT(emp.nombres, ' ', emp.apellidos) AS nombre_empleado,
             COUNT(e.id_entregable) AS total_entregables,
             ROUND(AVG(ec.calificacion_general), 2) AS calificacion_promedio,
-            SUM(CASE WHEN ec.cumple_formato = TRUE THEN 1 ELSE 0 END) / COUNT(e.id_entregable) * 100 AS pct_cumple_formato,
-            SUM(CASE WHEN ec.cumple_contenido = TRUE THEN 1 ELSE 0 END) / COUNT(e.id_entregable) * 100 AS pct_cumple_contenido,
-            SUM(CASE WHEN ec.cumple_normativa = TRUE THEN 1 ELSE 0 END) / COUNT(e.id_entregable) * 100 AS pct_cumple_normativa
+            SUM(CASE WHEN ec.cumple_formato = TRUE THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(e.id_entregable), 0) AS pct_cumple_formato,
+            SUM(CASE WHEN ec.cumple_contenido = TRUE THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(e.id_entregable), 0) AS pct_cumple_contenido,
+            SUM(CASE WHEN ec.cumple_normativa = TRUE THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(e.id_entregable), 0) AS pct_cumple_normativa
         FROM
             entregables e
         LEFT JOIN
             evaluacion_calidad ec ON e.id_entregable = ec.id_entregable
-        LEFT JOIN
-            gmadministracion.empleados emp ON e.id_empleado = emp.idempleado
+        {filtro.where(fecha='e.fecha_entrega', empleado='e.id_empleado', actividad='e.id_actividad')}
         GROUP BY
-            e.id_empleado, nombre_empleado
+            e.id_empleado
         ORDER BY
             calificacion_promedio DESC
         """
+        return self._run_query(query, "Error al obtener métricas de calidad", names=True, filters=filtro)
 
-        try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
-                df = pd.DataFrame(result.fetchall())
-                if not df.empty:
-                    df.columns = result.keys()
-                return df
-        except Exception as e:
-            print(f"Error al obtener métricas de calidad: {e}")
-            return pd.DataFrame()
-
-    def get_project_time_investment(self):
+    def get_project_time_investment(self, filters=None):
         """Calcula el tiempo total invertido por proyecto"""
-        query = """
-        SELECT
-            p.id_proyecto,
-            p.nombre_proyecto,
-            COUNT(DISTINCT a.id_actividad) AS total_actividades,
-            SUM(TIMESTAMPDIFF(SECOND, CONCAT(fecha, ' ', rt.hora_inicio), 
-                CONCAT(fecha, ' ', rt.hora_fin)) / 3600) AS total_horas_trabajadas,
-            COUNT(DISTINCT rt.id_empleado) AS num_empleados,
-            ROUND(SUM(TIMESTAMPDIFF(SECOND, CONCAT(fecha, ' ', rt.hora_inicio), 
-                CONCAT(fecha, ' ', rt.hora_fin)) / 3600) / COUNT(DISTINCT a.id_actividad), 2) AS promedio_horas_por_actividad
-        FROM
-            registro_tiempo rt
-        JOIN
-            actividades a ON rt.id_actividad = a.id_actividad
-        JOIN
-            proyectos p ON a.id_proyecto = p.id_proyecto
-        GROUP BY
-            p.id_proyecto, p.nombre_proyecto
-        ORDER BY
-            total_horas_trabajadas DESC
+        filtro = self._filter(filters)
+        if self.use_rollup:
+            query = f"""
+            SELECT
+                p.id_proyecto,
+                p.nombre_proyecto,
+                COUNT(DISTINCT a.id_actividad) AS total_actividades,
+                SUM(r.segundos_trabajados) / 3600.0 AS total_horas_trabajadas,
+                COUNT(DISTINCT r.id_empleado) AS num_empleados,
+                ROUND(SUM(r.segundos_trabajados) / 3600.0 / COUNT(DISTINCT a.id_actividad), 2) AS promedio_horas_por_actividad
+            FROM
+                resumen_tiempo_diario r
+            JOIN
+                actividades a ON r.id_actividad = a.id_actividad
+            JOIN
+                proyectos p ON a.id_proyecto = p.id_proyecto
+            {filtro.where(fecha='r.fecha', empleado='r.id_empleado', proyecto='a.id_proyecto')}
+            GROUP BY
+                p.id_proyecto, p.nombre_proyecto
+            ORDER BY
+                total_horas_trabajadas DESC
+            """
+        else:
+            query = f"""
+            SELECT
+                p.id_proyecto,
+                p.nombre_proyecto,
+                COUNT(DISTINCT a.id_actividad) AS total_actividades,
+                SUM({SEGUNDOS_REGISTRO}) / 3600.0 AS total_horas_trabajadas,
+                COUNT(DISTINCT rt.id_empleado) AS num_empleados,
+                ROUND(SUM({SEGUNDOS_REGISTRO}) / 3600.0 / COUNT(DISTINCT a.id_actividad), 2) AS promedio_horas_por_actividad
+            FROM
+                registro_tiempo rt
+            JOIN
+                actividades a ON rt.id_actividad = a.id_actividad
+            JOIN
+                proyectos p ON a.id_proyecto = p.id_proyecto
+            {filtro.where(fecha='rt.fecha', empleado='rt.id_empleado', proyecto='a.id_proyecto')}
+            GROUP BY
+                p.id_proyecto, p.nombre_proyecto
+            ORDER BY
+                total_horas_trabajadas DESC
+            """
+        return self._run_query(query, "Error al obtener inversión de tiempo por proyecto", filters=filtro)
+
+    def get_employee_productivity(self, filters=None):
+        """Calcula la productividad por empleado (entregables por hora).
+
+        Con filtro se cruzan las horas y los entregables del mismo periodo.
         """
-
-        try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
-                df = pd.DataFrame(result.fetchall())
-                if not df.empty:
-                    df.columns = result.keys()
-                return df
-        except Exception as e:
-            print(f"Error al obtener inversión de tiempo por proyecto: {e}")
-            return pd.DataFrame()
-
-    def get_employee_productivity(self):
-        """Calcula la productividad por empleado (entregables por hora)"""
-        query = """
-        SELECT
-            rt.id_empleado,
-            CONCAT(emp.nombres, ' ', emp.apellidos) AS nombre_empleado,
-            SUM(TIMESTAMPDIFF(SECOND, CONCAT(rt.fecha, ' ', rt.hora_inicio), 
-                CONCAT(rt.fecha, ' ', rt.hora_fin)) / 3600) AS total_horas,
-            COUNT(DISTINCT e.id_entregable) AS total_entregables,
-            ROUND(COUNT(DISTINCT e.id_entregable) / SUM(TIMESTAMPDIFF(SECOND, 
-                CONCAT(rt.fecha, ' ', rt.hora_inicio), CONCAT(rt.fecha, ' ', rt.hora_fin)) / 3600), 2) AS entregables_por_hora
-        FROM
-            registro_tiempo rt
-        LEFT JOIN
-            gmadministracion.empleados emp ON rt.id_empleado = emp.idempleado
-        LEFT JOIN
-            entregables e ON rt.id_empleado = e.id_empleado AND rt.id_actividad = e.id_actividad
-        GROUP BY
-            rt.id_empleado, nombre_empleado
-        HAVING
-            total_horas > 0
-        ORDER BY
-            entregables_por_hora DESC
-        """
-
-        try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
-                df = pd.DataFrame(result.fetchall())
-                if not df.empty:
-                    df.columns = result.keys()
-                return df
-        except Exception as e:
-            print(f"Error al obtener productividad por empleado: {e}")
-            return pd.DataFrame()
-
-    def get_project_rejection_rate(self):
+        filtro = self._filter(filters)
+        columnas_tiempo = dict(empleado='id_empleado', actividad='id_actividad')
+        if self.use_rollup:
+            resumen = RESUMEN_POR_ACTIVIDAD.format(where=filtro.where(fecha='fecha', **columnas_tiempo))
+            # Las horas de cada (empleado, actividad) cuentan una vez por entregable,
+            # igual que el LEFT JOIN fila a fila de la consulta sobre registro_tiempo
+            query = f"""
+            SELECT
+                t.id_empleado,
+                SUM(t.segundos * COALESCE(ed.entregables, 1)) / 3600.0 AS total_horas,
+                SUM(COALESCE(ed.entregables, 0)) AS total_entregables,
+                ROUND(SUM(COALESCE(ed.entregables, 0)) /
+                    (SUM(t.segundos * COALESCE(ed.entregables, 1)) / 3600.0), 2) AS entregables_por_hora
+            FROM
+                ({resumen}) t
+            LEFT JOIN
+                (SELECT id_empleado, id_actividad, COUNT(*) AS entregables
+                FROM entregables
+                {filtro.where(fecha='fecha_entrega', **columnas_tiempo)}
+                GROUP BY id_empleado, id_actividad) ed
+                ON t.id_empleado = ed.id_empleado AND t.id_actividad = ed.id_actividad
+            GROUP BY
+                t.id_empleado
+            HAVING
+                total_horas > 0
+            ORDER BY
+                entregables_por_hora DESC
+            """
+        else:
+            query = f"""
+            SELECT
+                rt.id_empleado,
+                SUM({SEGUNDOS_REGISTRO}) / 3600.0 AS total_horas,
+                COUNT(DISTINCT e.id_entregable) AS total_entregables,
+                ROUND(COUNT(DISTINCT e.id_entregable) / (SUM({SEGUNDOS_REGISTRO}) / 3600.0), 2) AS entregables_por_hora
+            FROM
+                registro_tiempo rt
+            LEFT JOIN
+                entregables e ON rt.id_empleado = e.id_empleado AND rt.id_actividad = e.id_actividad
+                {filtro.where('AND', fecha='e.fecha_entrega')}
+            {filtro.where(fecha='rt.fecha', empleado='rt.id_empleado', actividad='rt.id_actividad')}
+            GROUP BY
+                rt.id_empleado
+            HAVING
+                total_horas > 0
+            ORDER BY
+                entregables_por_hora DESC
+            """
+        return self._run_query(query, "Error al obtener productividad por empleado", names=True,
+                               filters=filtro)
+
+    def get_project_rejection_rate(self, filters=None):
         """Calcula la tasa de rechazo de entregables por proyecto"""
-        query = """
+        filtro = self._filter(filters)
+        query = f"""
         SELECT
             p.id_proyecto,
             p.nombre_proyecto,
             COUNT(DISTINCT e.id_entregable) AS total_entregables,
             SUM(CASE WHEN e.estado = 'Rechazado' THEN 1 ELSE 0 END) AS entregables_rechazados,
-            ROUND((SUM(CASE WHEN e.estado = 'Rechazado' THEN 1 ELSE 0 END) / 
-                COUNT(DISTINCT e.id_entregable)) * 100, 2) AS tasa_rechazo
+            ROUND(SUM(CASE WHEN e.estado = 'Rechazado' THEN 1 ELSE 0 END) * 100.0 /
+                NULLIF(COUNT(DISTINCT e.id_entregable), 0), 2) AS tasa_rechazo
         FROM
             entregables e
         JOIN
             actividades a ON e.id_actividad = a.id_actividad
         JOIN
             proyectos p ON a.id_proyecto = p.id_proyecto
+        {filtro.where(fecha='e.fecha_entrega', empleado='e.id_empleado', proyecto='a.id_proyecto')}
         GROUP BY
             p.id_proyecto, p.nombre_proyecto
         ORDER BY
             tasa_rechazo DESC
         """
+        return self._run_query(query, "Error al obtener tasa de rechazo por proyecto", filters=filtro)
 
-        try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
-                df = pd.DataFrame(result.fetchall())
-                if not df.empty:
-                    df.columns = result.keys()
-                return df
-        except Exception as e:
-            print(f"Error al obtener tasa de rechazo por proyecto: {e}")
-            return pd.DataFrame()
+    def get_dashboard_data(self, materialized=False, filters=None):
+        """Obtiene datos para el panel de control principal.
 
-    def get_dashboard_data(self):
-        """Obtiene datos para el panel de control principal"""
-        query = """
+        Con `materialized=True` se lee la tabla panel_control tal como quedó en
+        su última actualización (ver refresh_dashboard_table). panel_control
+        acumula todo el historial: con un periodo se usa la consulta en vivo.
+        """
+        filtro = self._filter(filters)
+        if materialized and not filtro.has_period:
+            query = (f"SELECT {', '.join(DASHBOARD_COLUMNS)} FROM panel_control "
+                     f"{filtro.where(empleado='id_empleado', proyecto='id_proyecto')}")
+            return self._run_query(query, "Error al obtener datos para el panel principal", filters=filtro)
+        query = _dashboard_sql(self.use_rollup, with_names=False, filters=filtro)
+        return self._run_query(query, "Error al obtener datos para el panel principal", names=True,
+                               filters=filtro)
+
+    def _period_metrics_sql(self, filtro):
+        """Consulta de get_period_metrics con las condiciones de `filtro`"""
+        columnas = dict(empleado='id_empleado', actividad='id_actividad')
+        if self.use_rollup:
+            tiempo = RESUMEN_POR_ACTIVIDAD.format(where=filtro.where(fecha='fecha', **columnas))
+        else:
+            tiempo = f"""
+            SELECT
+                rt.id_empleado,
+                rt.id_actividad,
+                SUM({SEGUNDOS_REGISTRO}) AS segundos,
+                COUNT(*) AS registros
+            FROM
+                registro_tiempo rt
+            {filtro.where(fecha='rt.fecha', empleado='rt.id_empleado', actividad='rt.id_actividad')}
+            GROUP BY
+                rt.id_empleado, rt.id_actividad
+            """
+        query = f"""
         SELECT
-            e.id_empleado,
-            CONCAT(emp.nombres, ' ', emp.apellidos) AS nombre_empleado,
-            p.id_proyecto,
-            p.nombre_proyecto,
-            COUNT(DISTINCT a.id_actividad) AS total_actividades,
-            SUM(CASE WHEN a.estado = 'Completada' THEN 1 ELSE 0 END) AS actividades_completadas,
-            ROUND((SUM(CASE WHEN a.estado = 'Completada' THEN 1 ELSE 0 END) / 
-                COUNT(DISTINCT a.id_actividad)) * 100, 2) AS pct_completado,
-            SUM(TIMESTAMPDIFF(SECOND, CONCAT(rt.fecha, ' ', rt.hora_inicio), 
-                CONCAT(rt.fecha, ' ', rt.hora_fin)) / 3600) AS total_horas,
-            COUNT(DISTINCT e.id_entregable) AS total_entregables,
-            SUM(CASE WHEN e.estado = 'Aprobado' THEN 1 ELSE 0 END) AS entregables_aprobados,
-            SUM(CASE WHEN e.estado = 'Rechazado' THEN 1 ELSE 0 END) AS entregables_rechazados,
-            ROUND(AVG(COALESCE(ec.calificacion_general, 0)), 2) AS calificacion_promedio
+            t.id_empleado,
+            a.id_proyecto,
+            t.id_actividad,
+            ROUND(t.segundos / 3600.0, 2) AS horas_trabajadas,
+            CASE WHEN a.estado = 'Completada' THEN 1 ELSE 0 END AS tareas_completadas,
+            COALESCE(ed.aprobados, 0) AS entregables_aprobados,
+            COALESCE(ed.rechazados, 0) AS entregables_rechazados,
+            ROUND(COALESCE(ed.entregables, 0) / (t.segundos / 3600.0), 2) AS indice_productividad
         FROM
-            registro_tiempo rt
+            ({tiempo}) t
         JOIN
-            actividades a ON rt.id_actividad = a.id_actividad
-        JOIN
-            proyectos p ON a.id_proyecto = p.id_proyecto
+            actividades a ON t.id_actividad = a.id_actividad
         LEFT JOIN
-            gmadministracion.empleados emp ON rt.id_empleado = emp.idempleado
-        LEFT JOIN
-            entregables e ON rt.id_empleado = e.id_empleado AND rt.id_actividad = e.id_actividad
-        LEFT JOIN
-            evaluacion_calidad ec ON e.id_entregable = ec.id_entregable
-        GROUP BY
-            e.id_empleado, nombre_empleado, p.id_proyecto, p.nombre_proyecto
+            (SELECT
+                id_empleado,
+                id_actividad,
+                COUNT(*) AS entregables,
+                SUM(CASE WHEN estado = 'Aprobado' THEN 1 ELSE 0 END) AS aprobados,
+                SUM(CASE WHEN estado = 'Rechazado' THEN 1 ELSE 0 END) AS rechazados
+            FROM entregables
+            {filtro.where(fecha='fecha_entrega', **columnas)}
+            GROUP BY id_empleado, id_actividad) ed
+            ON t.id_empleado = ed.id_empleado AND t.id_actividad = ed.id_actividad
+        WHERE
+            t.segundos > 0
+        ORDER BY
+            t.id_empleado, t.id_actividad
+        """
+        return query
+
+    def get_period_metrics(self, filters=None):
+        """Métricas por (empleado, proyecto, actividad) con las columnas de metricas_productividad.
+
+        Horas, tarea completada, entregables aprobados y rechazados e índice de
+        productividad (entregables por hora) de las filas del filtro.
+        """
+        filtro = self._filter(filters)
+        return self._run_query(self._period_metrics_sql(filtro), "Error al obtener métricas del periodo",
+                               filters=filtro)
+
+    def save_period_metrics(self, filters=None):
+        """Guarda en metricas_productividad las métricas del periodo del filtro.
+
+        El filtro debe tener fecha de inicio y de fin, que se guardan en
+        periodo_inicio y periodo_fin. Las filas del mismo periodo (y de los
+        mismos empleados y proyectos, si el filtro los limita) se reemplazan.
         """
+        filtro = self._filter(filters)
+        if filtro.fecha_desde is None or filtro.fecha_hasta is None:
+            print("Error al guardar métricas del periodo: el filtro necesita fecha de inicio y de fin")
+            return False
 
+        columnas = ('id_empleado, id_proyecto, id_actividad, horas_trabajadas, tareas_completadas, '
+                    'entregables_aprobados, entregables_rechazados, indice_productividad')
+        periodo = {'inicio': filtro.fecha_desde, 'fin': filtro.fecha_hasta}
         try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
-                df = pd.DataFrame(result.fetchall())
-                if not df.empty:
-                    df.columns = result.keys()
-                return df
+            with self.engine.begin() as connection:
+                connection.execute(filtro.bind(
+                    "DELETE FROM metricas_productividad "
+                    "WHERE periodo_inicio = :inicio AND periodo_fin = :fin "
+                    f"{filtro.where('AND', empleado='id_empleado', proyecto='id_proyecto')}"), periodo)
+                result = connection.execute(filtro.bind(
+                    f"INSERT INTO metricas_productividad ({columnas}, fecha_calculo, periodo_inicio, periodo_fin) "
+                    f"SELECT {columnas}, :hoy, :inicio, :fin FROM ({self._period_metrics_sql(filtro)}) periodo"),
+                    {**periodo, 'hoy': datetime.now().date()})
+            print(f"Métricas del periodo {filtro.fecha_desde} - {filtro.fecha_hasta} "
+                  f"guardadas: {result.rowcount} filas")
+            return True
         except Exception as e:
-            print(f"Error al obtener datos para el panel principal: {e}")
-            return pd.DataFrame()
+            print(f"Error al guardar métricas del periodo: {e}")
+            return False
 
     def create_dashboard_view(self):
         """Crea o actualiza la vista para el panel de control principal"""
-        query = """
-        CREATE OR REPLACE VIEW vista_panel_control AS
-        SELECT
-            e.id_empleado,
-            CONCAT(emp.nombres, ' ', emp.apellidos) AS nombre_empleado,
-            p.id_proyecto,
-            p.nombre_proyecto,
-            COUNT(DISTINCT a.id_actividad) AS total_actividades,
-            SUM(CASE WHEN a.estado = 'Completada' THEN 1 ELSE 0 END) AS actividades_completadas,
-            ROUND((SUM(CASE WHEN a.estado = 'Completada' THEN 1 ELSE 0 END) / 
-                COUNT(DISTINCT a.id_actividad)) * 100, 2) AS pct_completado,
-            SUM(TIMESTAMPDIFF(SECOND, CONCAT(rt.fecha, ' ', rt.hora_inicio), 
-                CONCAT(rt.fecha, ' ', rt.hora_fin)) / 3600) AS total_horas,
-            COUNT(DISTINCT e.id_entregable) AS total_entregables,
-            SUM(CASE WHEN e.estado = 'Aprobado' THEN 1 ELSE 0 END) AS entregables_aprobados,
-            SUM(CASE WHEN e.estado = 'Rechazado' THEN 1 ELSE 0 END) AS entregables_rechazados,
-            ROUND(AVG(COALESCE(ec.calificacion_general, 0)), 2) AS calificacion_promedio
-        FROM
-            registro_tiempo rt
-        JOIN
-            actividades a ON rt.id_actividad = a.id_actividad
-        JOIN
-            proyectos p ON a.id_proyecto = p.id_proyecto
-        LEFT JOIN
-            gmadministracion.empleados emp ON rt.id_empleado = emp.idempleado
-        LEFT JOIN
-            entregables e ON rt.id_empleado = e.id_empleado AND rt.id_actividad = e.id_actividad
-        LEFT JOIN
-            evaluacion_calidad ec ON e.id_entregable = ec.id_entregable
-        GROUP BY
-            e.id_empleado, nombre_empleado, p.id_proyecto, p.nombre_proyecto
-        """
-
         try:
-            with self.engine.connect() as connection:
-                connection.execute(text(query))
+            with self.engine.begin() as connection:
+                vista = _dashboard_sql(self.use_rollup)
+                if connection.dialect.name == 'sqlite':
+                    connection.execute(text("DROP VIEW IF EXISTS vista_panel_control"))
+                    connection.execute(text(f"CREATE VIEW vista_panel_control AS {vista}"))
+                else:
+                    connection.execute(text(
+                        f"CREATE OR REPLACE VIEW vista_panel_control AS {vista}"))
                 print("Vista 'vista_panel_control' creada exitosamente")
                 return True
         except Exception as e:
             print(f"Error al crear vista para el panel: {e}")
             return False
 
-    def export_metrics_to_csv(self, output_dir=None):
-        """Exporta todas las métricas a archivos CSV"""
+    def refresh_dashboard_table(self):
+        """Recalcula la tabla materializada panel_control a partir del resumen diario"""
+        columnas = ', '.join(DASHBOARD_COLUMNS)
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(text("DELETE FROM panel_control"))
+                result = connection.execute(text(
+                    f"INSERT INTO panel_control ({columnas}, fecha_actualizacion) "
+                    f"SELECT {columnas}, :ahora FROM ({_dashboard_sql(self.use_rollup)}) panel"),
+                    {'ahora': datetime.now()})
+            print(f"Tabla 'panel_control' actualizada: {result.rowcount} filas")
+            return True
+        except Exception as e:
+            print(f"Error al actualizar la tabla del panel: {e}")
+            return False
+
+    def export_metrics_to_csv(self, output_dir=None, max_workers=None, timeout=None):
+        """Exporta todas las métricas a archivos CSV.
+
+        Las consultas se ejecutan en paralelo (ver ParallelMetricsRunner); una
+        métrica que falla o agota su tiempo se informa y no impide exportar el resto.
+        """
         if output_dir is None:
             output_dir = os.path.join(os.path.dirname(
                 os.path.dirname(__file__)), 'entregables', 'metricas')
@@ -317,33 +612,68 @@ class ProductivityMetrics:
         os.makedirs(output_dir, exist_ok=True)
 
         # Recopilar todas las métricas
-        metrics = {
-            'porcentaje_aprobados': self.get_approved_deliverables_percentage(),
-            'tiempo_por_tarea': self.get_average_time_per_task(),
-            'calidad_entregables': self.get_deliverable_quality_metrics(),
-            'tiempo_proyecto': self.get_project_time_investment(),
-            'productividad_empleado': self.get_employee_productivity(),
-            'rechazo_proyecto': self.get_project_rejection_rate(),
-            'datos_dashboard': self.get_dashboard_data()
-        }
+        inicio = reloj.perf_counter()
+        resultados = ParallelMetricsRunner(self, max_workers, timeout).run()
+        print(f"Métricas calculadas en {reloj.perf_counter() - inicio:.2f}s")
 
         # Exportar cada métrica a un archivo CSV
-        for name, df in metrics.items():
-            if not df.empty:
+        metrics = {}
+        for name, resultado in resultados.items():
+            metrics[name] = resultado.df
+            if not resultado.ok:
+                print(f"Error en la métrica '{name}' ({resultado.seconds:.2f}s): {resultado.error}")
+                continue
+            print(f"- {name}: {resultado.rows} filas en {resultado.seconds:.2f}s")
+            if not resultado.df.empty:
                 file_path = os.path.join(output_dir, f'{name}.csv')
-                df.to_csv(file_path, index=False)
+                resultado.df.to_csv(file_path, index=False)
                 print(f"Métricas de '{name}' exportadas a {file_path}")
 
         return metrics
 
 
-def run_metrics_report():
-    """Función principal para ejecutar el reporte de métricas de productividad"""
+def refresh_rollup_or_fallback(metrics):
+    """Actualiza el resumen diario; si no se puede, las métricas leen registro_tiempo.
+
+    Devuelve False si se desactivó el resumen diario (por ejemplo, porque la
+    tabla aún no existe: se crea con `python -m models.migrations`).
+    """
+    try:
+        refresh_daily_rollup(metrics.engine)
+        return True
+    except Exception as e:
+        print(f"No se pudo actualizar el resumen diario, las métricas de horas "
+              f"se calculan sobre registro_tiempo: {e}")
+        metrics.use_rollup = False
+        return False
+
+
+def run_metrics_report(context=None, use_cache=True, filters=None):
+    """Función principal para ejecutar el reporte de métricas de productividad.
+
+    Si se recibe un PipelineContext las métricas se calculan sobre sus
+    DataFrames en memoria en lugar de volver a consultar MySQL, y no se
+    escribe en la base (ni resumen diario ni vista del panel); el contexto ya
+    trae sus propios filtros, así que `filters` no se admite con él. Sin
+    contexto, `use_cache` reutiliza los resultados guardados si las tablas no
+    cambiaron y `filters` (QueryFilter) limita las métricas a un periodo,
+    proyectos, clientes o empleados.
+    """
+    if context is not None and filters:
+        raise ValueError("filters no se aplica a un PipelineContext: filtre el DataStandardizer del contexto")
+
     print("Generando métricas de productividad...")
-    metrics = ProductivityMetrics()
+    if context is not None:
+        from scripts.frame_metrics import DataFrameMetrics
+        metrics = DataFrameMetrics(context)
+    else:
+        metrics = ProductivityMetrics(cache=MetricsCache() if use_cache else None, filters=filters)
+
+        # Incorporar al resumen diario los registros de tiempo nuevos (la vista lo usa)
+        refresh_rollup_or_fallback(metrics)
 
-    # Crear la vista para el panel de control
-    metrics.create_dashboard_view()
+        # Crear la vista para el panel de control
+        metrics.create_dashboard_view()
 
     # Exportar métricas a CSV
     export_dir = os.path.join(os.path.dirname(
@@ -356,9 +686,47 @@ def run_metrics_report():
         if not df.empty:
             print(f"- {name}: {len(df)} registros")
 
+    if metrics.cache is not None:
+        print(f"Caché de métricas: {metrics.cache.stats()}")
+    print(f"Pool de conexiones: {pool_status(metrics.engine)}")
+
     print(f"\nMétricas exportadas al directorio: {export_dir}")
     return result_metrics
 
 
+def refresh_materialized_dashboard(engine=None):
+    """Actualiza el resumen diario y la tabla panel_control (pensado para cron).
+
+    Las tablas se crean con `python -m models.migrations`.
+    """
+    metrics = ProductivityMetrics(engine)
+    refresh_rollup_or_fallback(metrics)
+    return metrics.refresh_dashboard_table()
+
+
 if __name__ == "__main__":
-    run_metrics_report()
+    parser = argparse.ArgumentParser(description="Métricas de productividad")
+    parser.add_argument('--refresh-panel', action='store_true',
+                        help="Solo actualizar la tabla materializada panel_control")
+    parser.add_argument('--desde', help="Primer día del periodo (YYYY-MM-DD)")
+    parser.add_argument('--hasta', help="Último día del periodo (YYYY-MM-DD)")
+    parser.add_argument('--semana', help="Semana (lunes a domingo) que contiene la fecha YYYY-MM-DD")
+    parser.add_argument('--proyecto', type=int, action='append', help="Id de proyecto (repetible)")
+    parser.add_argument('--cliente', action='append', help="Cliente (repetible)")
+    parser.add_argument('--empleado', action='append', help="Id de empleado (repetible)")
+    parser.add_argument('--guardar-periodo', action='store_true',
+                        help="Guardar las métricas del periodo en metricas_productividad")
+    args = parser.parse_args()
+
+    criterios = dict(proyectos=args.proyecto, clientes=args.cliente, empleados=args.empleado)
+    if args.semana:
+        filtro = QueryFilter.week(args.semana, **criterios)
+    else:
+        filtro = QueryFilter(args.desde, args.hasta, **criterios)
+
+    if args.refresh_panel:
+        refresh_materialized_dashboard()
+    elif args.guardar_periodo:
+        ProductivityMetrics().save_period_metrics(filtro)
+    else:
+        run_metrics_report(filters=filtro or None)
@@ -0,0 +1,103 @@
+import os
+import sys
+from datetime import date, datetime, time
+
+import pytest
+from sqlalchemy import text
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.local_backend import create_local_engine
+from models.entities import (Base, Proyecto, Actividad, RegistroTiempo, TipoEntregable,
+                             Entregable, EvaluacionCalidad)
+
+
+def crear_engine_sqlite(directorio):
+    """Crea una base SQLite con el esquema de entities.py y gmadministracion adjunta"""
+    engine = create_local_engine(directorio)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def cargar_datos_base(engine):
+    """Inserta un conjunto pequeño de datos con turnos nocturnos y entregables evaluados"""
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO gmadministracion.empleados VALUES "
+            "('EM01', 'ANA', 'TORRES'), ('EM02', 'LUIS', 'PEREZ'), ('EM03', 'EVA', 'RUIZ')"))
+        connection.execute(Proyecto.__table__.insert(), [
+            {'id_proyecto': 1, 'nombre_proyecto': 'Proyecto 1', 'cliente': 'Cliente 1',
+             'fecha_inicio': date(2025, 1, 1), 'fecha_fin_estimada': date(2025, 6, 30),
+             'estado': 'En Progreso'},
+            {'id_proyecto': 2, 'nombre_proyecto': 'Proyecto 2', 'cliente': 'Cliente 2',
+             'fecha_inicio': date(2025, 2, 1), 'fecha_fin_estimada': date(2025, 8, 31),
+             'estado': 'Planificacion'},
+        ])
+        connection.execute(Actividad.__table__.insert(), [
+            {'id_actividad': i, 'id_proyecto': 1 if i <= 2 else 2,
+             'nombre_actividad': f'Actividad {i}', 'descripcion': f'Descripcion {i}',
+             'prioridad': 'Alta', 'fecha_asignacion': date(2025, 3, 1),
+             'fecha_limite': date(2025, 5, 1),
+             'estado': 'Completada' if i % 2 else 'En Progreso'}
+            for i in range(1, 4)
+        ])
+        connection.execute(TipoEntregable.__table__.insert(), [
+            {'id_tipo_entregable': 1, 'nombre': 'Informe'},
+        ])
+        connection.execute(RegistroTiempo.__table__.insert(), [
+            registro_tiempo(1, 'EM01', 1, date(2025, 4, 1), time(9), time(13)),
+            registro_tiempo(2, 'EM01', 1, date(2025, 4, 2), time(14), time(18, 30)),
+            registro_tiempo(3, 'EM02', 2, date(2025, 4, 2), time(22), time(2)),
+            registro_tiempo(4, 'EM03', 3, date(2025, 4, 3), time(8), time(12, 15)),
+            registro_tiempo(5, 'EM02', 2, date(2025, 4, 5), time(10), time(11)),
+        ])
+        connection.execute(Entregable.__table__.insert(), [
+            entregable(1, 1, 'EM01', datetime(2025, 4, 2, 18), 'Aprobado'),
+            entregable(2, 1, 'EM01', datetime(2025, 4, 3, 12), 'Rechazado'),
+            entregable(3, 2, 'EM02', datetime(2025, 4, 4, 9), 'Pendiente Revision'),
+        ])
+        connection.execute(EvaluacionCalidad.__table__.insert(), [
+            evaluacion(1, 1, True, True, True, 9),
+            evaluacion(2, 2, True, False, False, 4),
+        ])
+
+
+def registro_tiempo(id_registro, id_empleado, id_actividad, fecha, inicio, fin):
+    """Fila de registro_tiempo con aplicaciones usadas"""
+    return {'id_registro': id_registro, 'id_empleado': id_empleado,
+            'id_actividad': id_actividad, 'fecha': fecha, 'hora_inicio': inicio,
+            'hora_fin': fin, 'descripcion_actividad': f'Trabajo en actividad {id_actividad}',
+            'ubicacion': 'Remoto', 'aplicaciones_usadas': '{"apps": ["Excel", "Word"]}'}
+
+
+def entregable(id_entregable, id_actividad, id_empleado, fecha_entrega, estado):
+    """Fila de entregables"""
+    return {'id_entregable': id_entregable, 'id_actividad': id_actividad,
+            'id_empleado': id_empleado, 'id_tipo_entregable': 1,
+            'nombre_archivo': f'entregable_{id_entregable}.pdf',
+            'ruta_archivo': f'/entregables/entregable_{id_entregable}.pdf',
+            'fecha_entrega': fecha_entrega, 'version': 1, 'estado': estado}
+
+
+def evaluacion(id_evaluacion, id_entregable, formato, contenido, normativa, calificacion):
+    """Fila de evaluacion_calidad"""
+    return {'id_evaluacion': id_evaluacion, 'id_entregable': id_entregable,
+            'id_evaluador': 'EM09', 'fecha_evaluacion': datetime(2025, 4, 6),
+            'cumple_formato': formato, 'cumple_contenido': contenido,
+            'cumple_normativa': normativa, 'calificacion_general': calificacion}
+
+
+@pytest.fixture(autouse=True)
+def cache_empleados_temporal(tmp_path, monkeypatch):
+    """La caché de empleados de cada test se guarda en tmp_path, no en el repositorio"""
+    monkeypatch.setattr('scripts.employee_cache.EMPLOYEE_CACHE_DIR', str(tmp_path / 'empleados'))
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """Motor SQLite con el esquema completo y datos de ejemplo"""
+    engine = crear_engine_sqlite(str(tmp_path))
+    cargar_datos_base(engine)
+    yield engine
+    engine.dispose()
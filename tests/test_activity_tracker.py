@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time as reloj
+from datetime import datetime, time
+
+from sqlalchemy import select
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.entities import RegistroAplicacion, CapturaTrabajo
+from scripts.activity_tracker import ActivityTracker, FileEventSource, SimulatedEventSource
+from scripts.ingestion import BulkIngestor
+
+
+def evento(minuto, segundo=0, tipo='foco', aplicacion=None, **extra):
+    return {'id_empleado': 'EM01', 'tipo': tipo, 'aplicacion': aplicacion,
+            'momento': datetime(2025, 5, 1, 9, minuto, segundo).isoformat(), **extra}
+
+
+def test_focos_consecutivos_forman_intervalos(sqlite_engine, tmp_path):
+    """Las muestras de la misma aplicación se unen y el intervalo se cierra al cambiar o quedar inactivo"""
+    eventos = [
+        evento(0, tipo='inicio', id_actividad=2, ruta_imagen='/capturas/1.png', hash_archivo='h1'),
+        evento(0, 5, aplicacion='Excel'), evento(1, aplicacion='Excel'), evento(2, aplicacion='Excel'),
+        evento(3, aplicacion='Word'), evento(4, aplicacion='Word'),
+        # Diez minutos sin eventos: Word termina en la última muestra (09:04)
+        evento(14, aplicacion='Word'), evento(15, aplicacion='Excel'),
+        evento(16, tipo='fin', ruta_imagen='/capturas/2.png', hash_archivo='h2'),
+    ]
+    archivo = tmp_path / 'eventos.ndjson'
+    archivo.write_text('\n'.join(json.dumps(e) for e in eventos) + '\n{roto\n', encoding='utf-8')
+
+    tracker = ActivityTracker(sqlite_engine, flush_size=2, idle_gap=300,
+                              spill_dir=str(tmp_path / 'spill'))
+    fuente = FileEventSource(str(archivo))
+    stats = asyncio.run(tracker.run(fuente))
+    assert fuente.invalid == 1
+    assert (stats['eventos'], stats['intervalos'], stats['capturas']) == (9, 4, 2)
+
+    with sqlite_engine.connect() as connection:
+        filas = connection.execute(select(
+            RegistroAplicacion.nombre_aplicacion, RegistroAplicacion.hora_inicio,
+            RegistroAplicacion.hora_fin, RegistroAplicacion.id_actividad)
+            .order_by(RegistroAplicacion.hora_inicio)).all()
+        capturas = connection.execute(select(CapturaTrabajo.tipo, CapturaTrabajo.id_actividad)
+                                      .order_by(CapturaTrabajo.fecha_hora)).all()
+    assert [tuple(f) for f in filas] == [
+        ('Excel', time(9, 0, 5), time(9, 3), 2), ('Word', time(9, 3), time(9, 4), 2),
+        ('Word', time(9, 14), time(9, 15), 2), ('Excel', time(9, 15), time(9, 16), 2)]
+    assert [tuple(c) for c in capturas] == [('Inicio', 2), ('Final', 2)]
+
+
+class IngestorIntermitente(BulkIngestor):
+    """BulkIngestor que falla mientras `caido` es True, como una base de datos caída"""
+
+    caido = True
+
+    def ingest(self, table, events):
+        if self.caido:
+            raise ConnectionError("base de datos no disponible")
+        return super().ingest(table, events)
+
+
+def test_lotes_en_disco_si_la_base_no_esta_disponible(sqlite_engine, tmp_path):
+    """Los lotes que no se pueden escribir se guardan en disco y se reenvían sin duplicar"""
+    ingestor = IngestorIntermitente(sqlite_engine)
+    tracker = ActivityTracker(ingestor=ingestor, flush_size=50, queue_size=10,
+                              spill_dir=str(tmp_path / 'spill'))
+    stats = asyncio.run(tracker.run(SimulatedEventSource(events=2000, employees=5)))
+    assert stats['filas_escritas'] == 0 and stats['lotes_en_disco'] >= 2
+    assert stats['esperas_cola'] > 0
+    assert len(tracker.spilled_files()) == stats['lotes_en_disco']
+
+    # Al volver la base de datos se reenvían los lotes (también los repetidos) y se borran
+    ingestor.caido = False
+    tracker = ActivityTracker(ingestor=ingestor, spill_dir=str(tmp_path / 'spill'))
+    stats_reenvio = asyncio.run(tracker.run(SimulatedEventSource(events=2000, employees=5)))
+    assert tracker.spilled_files() == []
+    assert stats_reenvio['lotes_reenviados'] == stats['lotes_en_disco']
+
+    with sqlite_engine.connect() as connection:
+        total = len(connection.execute(select(RegistroAplicacion.id_registro_app)).all())
+    assert total == stats['intervalos'] == stats_reenvio['intervalos']
+
+
+class RelojFalso:
+    """Reloj monótono que solo avanza cuando el test lo indica"""
+
+    def __init__(self):
+        self.segundos = 0.0
+
+    def __call__(self):
+        return self.segundos
+
+
+def intervalos(engine):
+    with engine.connect() as connection:
+        return [tuple(f) for f in connection.execute(select(
+            RegistroAplicacion.nombre_aplicacion, RegistroAplicacion.hora_inicio,
+            RegistroAplicacion.hora_fin)).all()]
+
+
+def test_temporizador_cierra_intervalos_inactivos(sqlite_engine, tmp_path):
+    """Sin eventos nuevos, el intervalo se cierra y se escribe al pasar idle_gap, no al cerrar el agente"""
+    reloj_falso = RelojFalso()
+    tracker = ActivityTracker(sqlite_engine, flush_interval=0.02, idle_gap=300,
+                              spill_dir=str(tmp_path / 'spill'), clock=reloj_falso)
+
+    async def escenario():
+        await tracker.start()
+        await tracker.submit(evento(0, aplicacion='Excel'))
+        await tracker.submit(evento(1, aplicacion='Excel'))
+        await asyncio.sleep(0.05)
+        reloj_falso.segundos += 120
+        await asyncio.sleep(0.1)
+        abierto = intervalos(sqlite_engine)
+        reloj_falso.segundos += 300
+        await asyncio.sleep(0.2)
+        inactivo = intervalos(sqlite_engine)
+        await tracker.close()
+        return abierto, inactivo
+
+    abierto, inactivo = asyncio.run(escenario())
+    assert abierto == []
+    assert inactivo == [('Excel', time(9, 0), time(9, 1))]
+    assert intervalos(sqlite_engine) == inactivo
+
+
+class IngestorLento(BulkIngestor):
+    """BulkIngestor que tarda en escribir y registra si dos escrituras se solapan"""
+
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.activas = 0
+        self.solapadas = 0
+        self._cerrojo = threading.Lock()
+
+    def ingest(self, table, events):
+        with self._cerrojo:
+            self.activas += 1
+            self.solapadas += self.activas > 1
+        try:
+            reloj.sleep(0.2)
+            return super().ingest(table, events)
+        finally:
+            with self._cerrojo:
+                self.activas -= 1
+
+
+def test_cerrar_durante_una_escritura(sqlite_engine, tmp_path):
+    """close() espera a la escritura del temporizador en curso antes de la escritura final"""
+    ingestor = IngestorLento(sqlite_engine)
+    tracker = ActivityTracker(ingestor=ingestor, flush_interval=0.02,
+                              spill_dir=str(tmp_path / 'spill'))
+
+    async def escenario():
+        await tracker.start()
+        for minuto, aplicacion in [(0, 'Excel'), (1, 'Word'), (2, 'Word')]:
+            await tracker.submit(evento(minuto, aplicacion=aplicacion))
+        await asyncio.sleep(0.1)
+        await tracker.close()
+
+    asyncio.run(escenario())
+    assert ingestor.solapadas == 0
+    assert sorted(intervalos(sqlite_engine)) == [
+        ('Excel', time(9, 0), time(9, 1)), ('Word', time(9, 1), time(9, 2))]
+    assert tracker.spilled_files() == []
@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.app_usage import AppUsage
+
+
+def test_parseo_a_tabla_larga():
+    """Cada aplicación de cada registro es una fila con código categórico"""
+    valores = pd.Series([
+        json.dumps(json.dumps({'apps': ['Excel', 'Word']})),   # doble codificación de MySQL
+        '{"apps": ["Teams"]}',
+        None,
+        '{"apps": []}',
+        'no es json',
+        {'apps': ['Word']},                                     # ya decodificado
+        '{"apps": ["Excel", "Word"]}',
+    ], dtype=object)
+    apps = AppUsage.parse(valores, np.arange(1, 8))
+
+    assert isinstance(apps['app'].dtype, pd.CategoricalDtype)
+    assert list(apps['app'].cat.categories) == ['Excel', 'Teams', 'Word']
+    assert apps['id_registro'].tolist() == [1, 1, 2, 6, 7, 7]
+    assert apps['app'].astype(str).tolist() == ['Excel', 'Word', 'Teams', 'Word', 'Excel', 'Word']
+
+
+def test_horas_por_aplicacion():
+    """Las horas de un registro se atribuyen a cada aplicación usada"""
+    tiempo = pd.DataFrame({
+        'id_registro': [1, 2, 3],
+        'id_empleado': ['EM01', 'EM01', 'EM02'],
+        'horas_trabajadas': [2.0, 1.5, 4.0],
+        'aplicaciones_usadas': ['{"apps": ["Excel", "Word"]}', '{"apps": ["Excel"]}', None],
+    })
+    apps = AppUsage.parse(tiempo['aplicaciones_usadas'], tiempo['id_registro'])
+
+    resultado = AppUsage.hours_by_app(apps, tiempo, by=['id_empleado'])
+    assert resultado['app'].astype(str).tolist() == ['Excel', 'Word']
+    assert resultado['horas_trabajadas'].tolist() == [3.5, 2.0]
+    assert resultado['total_registros'].tolist() == [2, 1]
@@ -0,0 +1,77 @@
+import os
+import sys
+from datetime import date, time
+
+import pandas as pd
+from sqlalchemy import text
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import registro_tiempo, entregable
+from models.entities import RegistroTiempo, Entregable
+from scripts.daily_rollup import refresh_daily_rollup
+from models.migrations import migrate_tables
+from scripts.sql_metrics import ProductivityMetrics, refresh_rollup_or_fallback
+
+METRICAS_CON_HORAS = ['get_average_time_per_task', 'get_project_time_investment',
+                      'get_employee_productivity', 'get_dashboard_data']
+
+
+def comparar_con_escaneo(engine):
+    """Cada métrica leída del resumen coincide con la calculada sobre registro_tiempo"""
+    resumen = ProductivityMetrics(engine, use_rollup=True)
+    escaneo = ProductivityMetrics(engine, use_rollup=False)
+    for metrica in METRICAS_CON_HORAS:
+        esperado = getattr(escaneo, metrica)()
+        obtenido = getattr(resumen, metrica)()
+        assert not esperado.empty, metrica
+        columnas = list(esperado.columns)
+        pd.testing.assert_frame_equal(
+            obtenido.sort_values(columnas, ignore_index=True, na_position='first'),
+            esperado.sort_values(columnas, ignore_index=True, na_position='first'),
+            check_dtype=False, obj=metrica)
+
+
+def test_resumen_igual_a_escaneo(sqlite_engine):
+    """El resumen diario reproduce exactamente las métricas del escaneo completo"""
+    assert refresh_daily_rollup(sqlite_engine) == 5
+    comparar_con_escaneo(sqlite_engine)
+
+
+def test_actualizacion_incremental(sqlite_engine):
+    """Solo se agregan los registros nuevos y el resultado sigue coincidiendo"""
+    refresh_daily_rollup(sqlite_engine)
+    with sqlite_engine.begin() as connection:
+        connection.execute(RegistroTiempo.__table__.insert(), [
+            registro_tiempo(6, 'EM01', 1, date(2025, 4, 2), time(8), time(9, 45)),
+            registro_tiempo(7, 'EM03', 2, date(2025, 4, 6), time(15), time(17)),
+        ])
+        connection.execute(Entregable.__table__.insert(), [
+            entregable(4, 3, 'EM03', date(2025, 4, 6), 'Aprobado'),
+        ])
+
+    assert refresh_daily_rollup(sqlite_engine) == 2
+    assert refresh_daily_rollup(sqlite_engine) == 0
+    comparar_con_escaneo(sqlite_engine)
+
+    # Una edición de un día ya resumido se recoge recalculando desde esa fecha
+    with sqlite_engine.begin() as connection:
+        connection.execute(RegistroTiempo.__table__.update().where(
+            RegistroTiempo.id_registro == 1).values(hora_fin=time(15)))
+    refresh_daily_rollup(sqlite_engine, recompute_from=date(2025, 4, 1))
+    comparar_con_escaneo(sqlite_engine)
+
+
+def test_sin_tabla_de_resumen_se_migra_o_se_escanea(sqlite_engine):
+    """Sin resumen_tiempo_diario las métricas leen registro_tiempo y la migración crea la tabla"""
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DROP TABLE resumen_tiempo_diario"))
+    metricas = ProductivityMetrics(sqlite_engine)
+    assert refresh_rollup_or_fallback(metricas) is False and metricas.use_rollup is False
+    assert not metricas.get_project_time_investment().empty
+
+    assert migrate_tables(sqlite_engine) == ['resumen_tiempo_diario']
+    metricas = ProductivityMetrics(sqlite_engine)
+    assert refresh_rollup_or_fallback(metricas) is True
+    comparar_con_escaneo(sqlite_engine)
@@ -0,0 +1,64 @@
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import entregable, evaluacion
+from models.entities import Entregable, EvaluacionCalidad
+from scripts.daily_rollup import refresh_daily_rollup
+from scripts.data_standardization import DataStandardizer
+from scripts.frame_metrics import DataFrameMetrics
+from scripts.pipeline import PipelineContext
+from scripts.sql_metrics import ProductivityMetrics, DASHBOARD_COLUMNS
+
+# Con el JOIN fila a fila EM01 sumaba 34 horas (8.5 x 4 filas entregable x
+# evaluación) y contaba 3 aprobaciones; EM03, sin entregables, quedaba con id NULL
+PANEL_ESPERADO = pd.DataFrame([
+    ['EM01', 'ANA TORRES', 1, 'Proyecto 1', 1, 1, 100.0, 8.5, 3, 2, 1, 6.67],
+    # El turno nocturno de EM02 (22:00-02:00) cuenta -20 h, como TIMESTAMPDIFF
+    ['EM02', 'LUIS PEREZ', 1, 'Proyecto 1', 1, 0, 0.0, -19.0, 1, 0, 0, 0.0],
+    ['EM03', 'EVA RUIZ', 2, 'Proyecto 2', 1, 1, 100.0, 4.25, 0, 0, 0, 0.0],
+], columns=DASHBOARD_COLUMNS)
+
+
+@pytest.fixture
+def engine_con_fan_out(sqlite_engine):
+    """Varias filas de entregable y evaluación por (empleado, actividad)"""
+    with sqlite_engine.begin() as connection:
+        connection.execute(Entregable.__table__.insert(), [
+            entregable(4, 1, 'EM01', datetime(2025, 4, 4, 10), 'Aprobado'),
+        ])
+        connection.execute(EvaluacionCalidad.__table__.insert(), [
+            evaluacion(3, 1, True, True, False, 7),
+        ])
+    refresh_daily_rollup(sqlite_engine)
+    return sqlite_engine
+
+
+def comparar_panel(obtenido):
+    obtenido = obtenido.sort_values('id_empleado', ignore_index=True)
+    pd.testing.assert_frame_equal(obtenido, PANEL_ESPERADO)
+
+
+@pytest.mark.parametrize('use_rollup', [True, False])
+def test_panel_sin_fan_out(engine_con_fan_out, use_rollup):
+    """Las horas y los entregables no se multiplican por las filas relacionadas"""
+    comparar_panel(ProductivityMetrics(engine_con_fan_out, use_rollup).get_dashboard_data())
+
+
+def test_panel_materializado(engine_con_fan_out):
+    """La tabla panel_control devuelve lo mismo que la consulta"""
+    metrics = ProductivityMetrics(engine_con_fan_out)
+    assert metrics.refresh_dashboard_table()
+    comparar_panel(metrics.get_dashboard_data(materialized=True))
+
+
+def test_panel_en_memoria(engine_con_fan_out):
+    """DataFrameMetrics calcula el mismo panel sin consultar la base"""
+    context = PipelineContext(DataStandardizer(engine_con_fan_out))
+    comparar_panel(DataFrameMetrics(context).get_dashboard_data())
@@ -0,0 +1,79 @@
+import contextlib
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.data_standardization import DataStandardizer, MemoryLimitExceeded
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+from utils.join_planner import JoinPlanner
+
+
+def test_extraccion_por_bloques_igual_a_completa(sqlite_engine):
+    """Leer por bloques produce los mismos registros estandarizados"""
+    completo = DataStandardizer(sqlite_engine).get_standardized_time_records()
+    por_bloques = DataStandardizer(sqlite_engine, chunk_size=2).get_standardized_time_records()
+    pd.testing.assert_frame_equal(por_bloques, completo)
+
+    pd.testing.assert_frame_equal(
+        DataStandardizer(sqlite_engine, chunk_size=2).get_deliverables_data(),
+        DataStandardizer(sqlite_engine).get_deliverables_data())
+
+
+def test_agregacion_por_bloques(sqlite_engine):
+    """La agregación bloque a bloque coincide con un groupby sobre todo el conjunto"""
+    standardizer = DataStandardizer(sqlite_engine)
+    esperado = standardizer.get_standardized_time_records().groupby(
+        ['id_empleado', 'id_actividad', 'fecha'], observed=True).agg(
+            horas_trabajadas=('horas_trabajadas', 'sum'),
+            total_registros=('id_registro', 'count')).reset_index()
+
+    agregado = standardizer.aggregate_time_records(chunk_size=2)
+    pd.testing.assert_frame_equal(agregado, esperado)
+
+
+def test_limite_de_memoria(sqlite_engine):
+    """Superar max_memory_mb interrumpe la extracción"""
+    standardizer = DataStandardizer(sqlite_engine, chunk_size=2, max_memory_mb=0.001)
+    with pytest.raises(MemoryLimitExceeded):
+        standardizer.get_standardized_time_records()
+
+
+def test_join_planner_equivale_a_merge():
+    """Las uniones indexadas dan lo mismo que merge left, también sin coincidencia o con claves repetidas"""
+    hechos = pd.DataFrame({'id_empleado': pd.Categorical(['EM02', 'EM09', 'EM01']),
+                           'id_actividad': [2, 1, 7]})
+    actividades = pd.DataFrame({'id_actividad': [1, 2], 'id_proyecto': [10, 20]})
+    empleados = pd.DataFrame({'idempleado': ['EM01', 'EM02'], 'nombres': ['ANA', 'LUIS']})
+    repetidos = pd.DataFrame({'id_actividad': [2, 2], 'etiqueta': ['a', 'b']})
+
+    obtenido = (JoinPlanner(hechos).join(actividades, 'id_actividad')
+                .join(empleados, 'id_empleado', 'idempleado').join(repetidos, 'id_actividad').result())
+    esperado = hechos.merge(actividades, on='id_actividad', how='left').merge(
+        empleados, left_on='id_empleado', right_on='idempleado', how='left').merge(
+        repetidos, on='id_actividad', how='left')
+    # merge pasa a object la clave categórica; JoinPlanner la conserva
+    pd.testing.assert_frame_equal(obtenido.astype({'id_empleado': object}), esperado)
+    assert JoinPlanner.rejection_rate(pd.Series([4, 0, None]), pd.Series([1, 0, None])).tolist() == [25.0, 0, 0]
+
+
+@pytest.mark.parametrize('con_datos_sinteticos', [False, True])
+def test_entregables_agregados_en_sql(sqlite_engine, con_datos_sinteticos):
+    """El modo pushdown devuelve los mismos agregados y el mismo dataset que pandas"""
+    if con_datos_sinteticos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(sqlite_engine, registros=2000, seed=7).generate()
+    standardizer = DataStandardizer(sqlite_engine)
+    esperado = JoinPlanner.aggregate_deliverables(
+        standardizer.standardize_deliverables(standardizer.get_deliverables_data()))
+    obtenido = standardizer.get_deliverables_aggregate()
+    pd.testing.assert_frame_equal(obtenido, esperado)
+
+    pd.testing.assert_frame_equal(
+        DataStandardizer(sqlite_engine, pushdown_deliverables=True).create_unified_dataset(),
+        standardizer.create_unified_dataset())
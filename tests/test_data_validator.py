@@ -0,0 +1,87 @@
+import os
+import sys
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import registro_tiempo, entregable, evaluacion
+from models.entities import RegistroTiempo, Entregable, EvaluacionCalidad
+from scripts.data_standardization import DataStandardizer
+from utils.data_validator import DataValidator
+
+
+def test_validadores_por_columna_coinciden_con_los_escalares():
+    """Las máscaras por columna dan lo mismo que los métodos fila a fila y el informe las resume"""
+    validator = DataValidator()
+    fechas = ['2025-04-01', '2025-02-30', '01/04/2025', None, '2025-04-01']
+    horas = ['09:00:00', '25:00:00', '9:00', '18:30:15', None]
+    correos = ['ana@gm.com', 'ana@gm', 'luis.perez@gm.com.pe', '', 'ana@gm.com']
+    numeros = ['1.5', 'x', 3, None, '10']
+
+    assert validator.validate_date_column(fechas).tolist() == [True, False, False, False, True]
+    assert validator.validate_date_column([date(2025, 4, 1), datetime(2025, 4, 1, 9)]).all()
+    assert validator.validate_time_column(horas).tolist() == \
+        [v is not None and validator.validate_time_format(v) for v in horas]
+    # Horas compactas en segundos desde medianoche (-1 es una hora nula)
+    assert validator.validate_time_column(np.array([0, 86399, 86400, -1])).tolist() == [True, True, False, False]
+    assert validator.validate_email_column(correos).tolist() == [validator.validate_email(c) for c in correos]
+    assert validator.validate_numeric_column(numeros).tolist() == [True, False, True, False, True]
+    assert validator.validate_range_column(numeros, 1, 5).tolist() == [True, False, True, False, False]
+    assert validator.validate_non_empty_column(pd.Series(['a', ' ', None, 'b'], dtype='category')).tolist() == \
+        [True, False, False, True]
+
+    df = pd.DataFrame({'fecha': fechas, 'hora': horas, 'correo': correos, 'nota': numeros})
+    report = validator.validate_frame(df, {
+        'fecha': ['non_empty', 'date'], 'hora': ['time'], 'correo': ['email'],
+        'nota': ['numeric', ('range', 1, 5)], 'estado': [('choice', ['Activo'])]})
+    assert report.valid.tolist() == [False] * 5
+    errores = report.to_frame().set_index(['columna', 'regla'])['filas_invalidas'].to_dict()
+    assert errores == {('fecha', 'non_empty'): 1, ('fecha', 'date'): 2, ('hora', 'time'): 2,
+                       ('correo', 'email'): 2, ('nota', 'numeric'): 1, ('nota', 'range'): 2,
+                       ('estado', 'ausente'): 5}
+    assert report.examples[('fecha', 'date')] == ['2025-02-30', '01/04/2025']
+
+    # Los nulos solo incumplen 'non_empty' y los informes de varios bloques se acumulan
+    limpio = validator.validate_frame(df.iloc[[0]], {'hora': ['time'], 'nota': ['numeric']})
+    assert limpio.ok and limpio.invalid == 0
+    report.merge(limpio)
+    assert (report.total, report.invalid) == (6, 5)
+
+
+def test_validacion_de_los_bloques_extraidos(sqlite_engine):
+    """Cada bloque de registros de tiempo y entregables se valida y su informe se suma al de la extracción"""
+    with sqlite_engine.begin() as connection:
+        connection.execute(RegistroTiempo.__table__.insert(), [
+            registro_tiempo(6, '', 3, date(2025, 4, 6), time(9), time(17))])
+        connection.execute(Entregable.__table__.insert(), [
+            {**entregable(4, 3, 'EM03', datetime(2025, 4, 6, 17), 'Aprobado'), 'version': 0}])
+        connection.execute(EvaluacionCalidad.__table__.insert(), [evaluacion(3, 3, True, True, True, 15)])
+
+    standardizer = DataStandardizer(sqlite_engine, chunk_size=2)
+    registros = pd.concat(list(standardizer.iter_time_records()))
+    entregables = standardizer.get_deliverables_data()
+    # La validación informa, pero no descarta filas
+    assert (len(registros), len(entregables)) == (6, 4)
+
+    tiempo = standardizer.validation['registro_tiempo']
+    assert (tiempo.total, tiempo.invalid) == (6, 1)
+    assert tiempo.errors == {('id_empleado', 'non_empty'): 1}
+    assert standardizer.validation['entregables'].errors == {
+        ('version', 'range'): 1, ('calificacion_general', 'range'): 1}
+
+    # Cada extracción sustituye el informe anterior en lugar de sumarse a él
+    for _ in range(3):
+        standardizer.get_time_records()
+        standardizer.get_deliverables_data()
+    tiempo = standardizer.validation['registro_tiempo']
+    assert (tiempo.total, len(tiempo.valid), tiempo.invalid) == (6, 6, 1)
+    assert standardizer.validation['entregables'].errors == {
+        ('version', 'range'): 1, ('calificacion_general', 'range'): 1}
+
+    sin_validar = DataStandardizer(sqlite_engine, validate=False)
+    sin_validar.get_time_records()
+    assert sin_validar.validation == {}
@@ -0,0 +1,61 @@
+import os
+import sys
+from datetime import time
+
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.data_standardization import DataStandardizer
+from utils.dtype_policy import DtypePolicy
+
+
+def test_tipos_compactos_y_concat_de_bloques():
+    """Aplica el esquema y une bloques con categorías distintas sin perder las categóricas"""
+    policy = DtypePolicy()
+    bloque_1 = policy.apply(pd.DataFrame({
+        'id_registro': [1, 2], 'id_empleado': ['EM02', 'EM01'], 'version': [1, None],
+        'cumple_formato': [True, None], 'hora_inicio': [time(9), None]}))
+    bloque_2 = policy.apply(pd.DataFrame({
+        'id_registro': [3], 'id_empleado': ['EM03'], 'version': [2],
+        'cumple_formato': [False], 'hora_inicio': [time(0, 0, 30)]}))
+
+    assert bloque_1['id_registro'].dtype == 'int32'
+    assert bloque_1['version'].dtype == 'Int16'
+    assert bloque_1['cumple_formato'].dtype == 'boolean'
+    assert bloque_1['hora_inicio'].tolist() == [32400, -1]
+
+    df = policy.concat([bloque_1, bloque_2])
+    assert df['id_empleado'].cat.categories.tolist() == ['EM01', 'EM02', 'EM03']
+    assert df['id_empleado'].tolist() == ['EM02', 'EM01', 'EM03']
+    assert df['version'].dtype == 'Int16'
+    assert df.columns.tolist() == bloque_1.columns.tolist()
+
+
+def test_dataset_unificado_compacto(sqlite_engine):
+    """Con la política de tipos el dataset ocupa menos y conserva los valores"""
+    completo = DataStandardizer(sqlite_engine, compact_dtypes=False).create_unified_dataset()
+    compacto = DataStandardizer(sqlite_engine).create_unified_dataset()
+
+    reporte = DtypePolicy.memory_report(completo, compacto)
+    assert reporte.loc['TOTAL', 'bytes_fila_despues'] < reporte.loc['TOTAL', 'bytes_fila_antes']
+    assert isinstance(compacto['estado'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_series_equal(compacto['horas_trabajadas'], completo['horas_trabajadas'])
+    assert compacto['id_empleado'].astype(object).tolist() == completo['id_empleado'].tolist()
+
+
+def test_csv_con_horas_legibles(sqlite_engine, tmp_path):
+    """El CSV del dataset compacto tiene las mismas horas HH:MM:SS que el de tipos completos"""
+    completo = DataStandardizer(sqlite_engine, compact_dtypes=False).create_unified_dataset()
+    compacto = DataStandardizer(sqlite_engine).create_unified_dataset()
+    assert pd.api.types.is_integer_dtype(compacto['hora_inicio'])
+
+    exportado = DtypePolicy().restore_times(compacto)
+    assert pd.api.types.is_integer_dtype(compacto['hora_inicio'])
+    exportado.to_csv(tmp_path / 'compacto.csv', index=False)
+    completo.to_csv(tmp_path / 'completo.csv', index=False)
+    columnas = ['id_registro', 'hora_inicio', 'hora_fin']
+    leido = pd.read_csv(tmp_path / 'compacto.csv')[columnas]
+    pd.testing.assert_frame_equal(leido, pd.read_csv(tmp_path / 'completo.csv')[columnas])
+    assert leido['hora_inicio'].iloc[0] == '09:00:00'
@@ -0,0 +1,44 @@
+import os
+import sys
+
+from sqlalchemy import text
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.employee_cache import EmployeeCache
+from scripts.sql_metrics import ProductivityMetrics
+
+
+def test_dimension_persistente_y_verificada(sqlite_engine, tmp_path, capsys):
+    """Se lee una vez, se reutiliza desde disco y se recarga solo si la tabla cambia"""
+    cache = EmployeeCache(sqlite_engine, cache_dir=str(tmp_path), ttl=3600)
+    assert cache.frame().columns.tolist() == ['idempleado', 'nombres', 'apellidos']
+    assert cache.name('EM02') == 'LUIS PEREZ'
+    assert cache.name('EM99') is None
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(text(
+            "UPDATE gmadministracion.empleados SET apellidos = 'PEREZ GIL' WHERE idempleado = 'EM02'"))
+    # Dentro del TTL no se consulta la tabla
+    assert cache.name('EM02') == 'LUIS PEREZ'
+    assert capsys.readouterr().out.count('Dimensión de empleados actualizada') == 1
+
+    # Otra instancia parte del archivo en disco y detecta el cambio por la suma de verificación
+    nueva = EmployeeCache(sqlite_engine, cache_dir=str(tmp_path), ttl=0)
+    assert nueva.name('EM02') == 'LUIS PEREZ GIL'
+    assert nueva.name('EM01') == 'ANA TORRES'
+    assert capsys.readouterr().out.count('Dimensión de empleados actualizada') == 1
+    nueva.names()
+    assert 'Dimensión de empleados actualizada' not in capsys.readouterr().out
+
+
+def test_metricas_con_nombres_sin_join(sqlite_engine, tmp_path):
+    """Las métricas por empleado llevan nombre_empleado tras id_empleado"""
+    metrics = ProductivityMetrics(sqlite_engine, use_rollup=False,
+                                  employees=EmployeeCache(sqlite_engine, cache_dir=str(tmp_path)))
+    metrics.raise_errors = True
+    df = metrics.get_approved_deliverables_percentage()
+    assert df.columns.tolist()[:2] == ['id_empleado', 'nombre_empleado']
+    assert dict(zip(df['id_empleado'], df['nombre_empleado'])) == {
+        'EM01': 'ANA TORRES', 'EM02': 'LUIS PEREZ'}
@@ -0,0 +1,79 @@
+import contextlib
+import inspect as inspeccion
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+from sqlalchemy import inspect, text
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.query_filter import QueryFilter
+from scripts.data_standardization import DataStandardizer
+from scripts.frame_metrics import DataFrameMetrics
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+from scripts.parallel_metrics import METRIC_QUERIES
+from scripts.pipeline import PipelineContext
+from scripts.sql_metrics import ProductivityMetrics, run_metrics_report
+
+
+@pytest.fixture(params=['base', 'sintetico'])
+def engine_metricas(request, sqlite_engine):
+    """Datos base de conftest y, además, un volumen sintético con empates al redondear"""
+    if request.param == 'sintetico':
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(sqlite_engine, registros=2000, seed=7).generate()
+    return sqlite_engine
+
+
+@pytest.mark.parametrize('metodo', list(METRIC_QUERIES.values()))
+def test_paridad_con_sql(engine_metricas, metodo):
+    """Cada métrica en memoria coincide en valores y tipos con la consulta SQL"""
+    esperado = getattr(ProductivityMetrics(engine_metricas, use_rollup=False), metodo)()
+    context = PipelineContext(DataStandardizer(engine_metricas))
+    obtenido = getattr(DataFrameMetrics(context), metodo)()
+    assert not esperado.empty
+    columnas = list(esperado.columns)
+    pd.testing.assert_frame_equal(obtenido.sort_values(columnas, ignore_index=True),
+                                  esperado.sort_values(columnas, ignore_index=True), obj=metodo)
+
+
+def test_reporte_con_contexto_no_escribe_en_la_base(sqlite_engine, tmp_path, monkeypatch):
+    """Con un contexto no se actualiza el resumen ni se crea la vista, y los filtros se rechazan"""
+    exportar = ProductivityMetrics.export_metrics_to_csv
+    monkeypatch.setattr(DataFrameMetrics, 'export_metrics_to_csv',
+                        lambda self, output_dir=None, **kwargs: exportar(self, str(tmp_path), **kwargs))
+    context = PipelineContext(DataStandardizer(sqlite_engine))
+
+    with pytest.raises(ValueError):
+        run_metrics_report(context, filters=QueryFilter('2025-04-01', '2025-04-30'))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultados = run_metrics_report(context)
+    assert not resultados['datos_dashboard'].empty
+    assert 'vista_panel_control' not in inspect(sqlite_engine).get_view_names()
+    with sqlite_engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM resumen_tiempo_diario")).scalar() == 0
+
+
+def test_misma_interfaz_que_productivity_metrics(sqlite_engine):
+    """Los métodos heredados aceptan los mismos argumentos; lo que no aplica al contexto se rechaza"""
+    for nombre, metodo in inspeccion.getmembers(ProductivityMetrics, inspeccion.isfunction):
+        if not nombre.startswith('_'):
+            assert (inspeccion.signature(getattr(DataFrameMetrics, nombre))
+                    == inspeccion.signature(metodo)), nombre
+
+    metricas = DataFrameMetrics(PipelineContext(DataStandardizer(sqlite_engine)))
+    assert metricas.filters is None and metricas.employees is not None
+    assert not metricas.get_project_time_investment(filters=QueryFilter()).empty
+    with pytest.raises(ValueError):
+        metricas.get_project_time_investment(filters=QueryFilter(empleados='EM01'))
+    with pytest.raises(ValueError):
+        metricas.get_dashboard_data(materialized=True)
+    for metodo in ('get_period_metrics', 'save_period_metrics', 'create_dashboard_view',
+                   'refresh_dashboard_table'):
+        with pytest.raises(NotImplementedError):
+            getattr(metricas, metodo)()
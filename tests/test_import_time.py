@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+# Añadir directorio raíz al path para importaciones
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(RAIZ)
+
+# Presupuesto de `import main` en milisegundos (acumulado según -X importtime)
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '250'))
+PESADOS = ['pandas', 'numpy', 'sqlalchemy', 'matplotlib', 'seaborn', 'pyarrow', 'mysql']
+
+
+def importar(codigo):
+    """Ejecuta `codigo` en un intérprete nuevo con -X importtime.
+
+    Devuelve los módulos importados y el tiempo acumulado (µs) de cada uno.
+    """
+    resultado = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo],
+                               cwd=RAIZ, capture_output=True, text=True, check=True)
+    tiempos = {}
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, modulo = linea[len('import time:'):].split('|')
+        tiempos[modulo.strip()] = int(acumulado)
+    return tiempos
+
+
+def test_importar_main_es_ligero():
+    """Importar main no carga pandas, SQLAlchemy ni librerías de gráficos y cabe en el presupuesto"""
+    tiempos = importar('import main')
+    cargados = [m for m in tiempos if m.split('.')[0] in PESADOS]
+    assert not cargados, f"main importa módulos pesados: {sorted(cargados)[:10]}"
+    assert tiempos['main'] / 1000 < IMPORT_TIME_BUDGET_MS
+
+    tiempos = importar('import scripts.generate_deliverables')
+    assert not [m for m in tiempos if m.split('.')[0] in ('pandas', 'matplotlib', 'seaborn')]
+
+
+def test_modelos_sin_motor_al_importar():
+    """Importar los modelos no crea el motor ni carga el driver de MySQL"""
+    tiempos = importar(
+        "import sys, models.entities as m; assert m._engine is None and m._session_factory is None; "
+        "assert 'pymysql' not in sys.modules")
+    assert 'models.entities' in tiempos
@@ -0,0 +1,107 @@
+import os
+import sys
+from datetime import date, datetime, time
+
+import pandas as pd
+from sqlalchemy import text
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import registro_tiempo, entregable, evaluacion
+from models.entities import RegistroTiempo, Entregable, EvaluacionCalidad
+from models.query_filter import QueryFilter
+from scripts.data_standardization import DataStandardizer
+from scripts.incremental_extraction import IncrementalExtractor, IncrementalStore
+
+
+class StandardizerContador(DataStandardizer):
+    """DataStandardizer que cuenta las filas de registro_tiempo extraídas"""
+
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.filas_tiempo = []
+
+    def get_time_records(self, desde_id=None, desde_fecha=None, filters=None):
+        df = super().get_time_records(desde_id=desde_id, desde_fecha=desde_fecha, filters=filters)
+        self.filas_tiempo.append(len(df))
+        return df
+
+
+def modificar_datos(engine):
+    """Altas, una edición y un borrado recientes, y una evaluación tardía"""
+    with engine.begin() as connection:
+        connection.execute(RegistroTiempo.__table__.insert(), [
+            registro_tiempo(6, 'EM03', 3, date(2025, 4, 6), time(9), time(17)),
+        ])
+        connection.execute(text(
+            "UPDATE registro_tiempo SET hora_fin = '12:30:00.000000' WHERE id_registro = 5"))
+        connection.execute(text("DELETE FROM registro_tiempo WHERE id_registro = 4"))
+        connection.execute(Entregable.__table__.insert(), [
+            entregable(4, 3, 'EM03', datetime(2025, 4, 6, 17), 'Aprobado'),
+        ])
+        connection.execute(EvaluacionCalidad.__table__.insert(), [
+            evaluacion(3, 3, True, True, False, 7),
+            evaluacion(4, 4, True, True, True, 10),
+        ])
+
+
+def test_incremental_igual_a_completa(sqlite_engine, tmp_path):
+    """Una ejecución incremental produce el mismo dataset unificado que una completa"""
+    standardizer = StandardizerContador(sqlite_engine)
+    extractor = IncrementalExtractor(
+        standardizer, IncrementalStore(str(tmp_path / 'incremental')),
+        lookback_days=3, full_reconcile_days=None)
+    extractor.create_unified_dataset()
+
+    modificar_datos(sqlite_engine)
+    df_incremental = extractor.create_unified_dataset()
+
+    df_completo = IncrementalExtractor(
+        DataStandardizer(sqlite_engine), IncrementalStore(str(tmp_path / 'completo'))
+    ).create_unified_dataset(full=True)
+
+    pd.testing.assert_frame_equal(df_incremental, df_completo)
+    # Primera ejecución completa (5 filas); la incremental solo trae el registro
+    # nuevo y la ventana de 3 días previa a la última fecha (desde 2025-04-02)
+    assert standardizer.filas_tiempo == [5, 4]
+
+
+def test_reconciliacion_completa_periodica(sqlite_engine, tmp_path):
+    """Pasado el plazo de reconciliación se vuelve a extraer la tabla completa"""
+    standardizer = StandardizerContador(sqlite_engine)
+    store = IncrementalStore(str(tmp_path / 'incremental'))
+    extractor = IncrementalExtractor(standardizer, store, full_reconcile_days=7)
+    extractor.get_time_records()
+
+    state = store.load_state()
+    state['registro_tiempo']['ultimo_full'] = datetime(2020, 1, 1).isoformat()
+    store.save_state(state)
+    extractor.get_time_records()
+    extractor.get_time_records()
+
+    assert standardizer.filas_tiempo == [5, 5, 4]
+
+
+def test_extraccion_filtrada_no_usa_el_almacen(sqlite_engine, tmp_path):
+    """Una extracción filtrada no deja en el almacén filas que luego falten sin filtro"""
+    store = IncrementalStore(str(tmp_path / 'incremental'))
+    filtrado = IncrementalExtractor(
+        DataStandardizer(sqlite_engine, filters=QueryFilter(empleados='EM01')), store,
+        full_reconcile_days=None)
+    df_filtrado = filtrado.create_unified_dataset()
+    assert set(df_filtrado['id_empleado']) == {'EM01'}
+    assert store.load_state() == {}
+
+    standardizer = StandardizerContador(sqlite_engine)
+    extractor = IncrementalExtractor(standardizer, store, full_reconcile_days=None)
+    df_incremental = extractor.create_unified_dataset()
+    # Las filas de EM01 del almacén tampoco se mezclan en las siguientes extracciones filtradas
+    assert filtrado.get_time_records()['id_empleado'].eq('EM01').all()
+    df_incremental = extractor.create_unified_dataset()
+
+    df_completo = IncrementalExtractor(
+        DataStandardizer(sqlite_engine), IncrementalStore(str(tmp_path / 'completo'))
+    ).create_unified_dataset(full=True)
+    pd.testing.assert_frame_equal(df_incremental, df_completo)
+    assert standardizer.filas_tiempo == [5, 4]
@@ -0,0 +1,109 @@
+import os
+import sys
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, inspect, text
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.local_backend import create_local_engine
+from models.migrations import duplicate_check_sql, migrate_indexes, migrate_schema
+from scripts.metrics_cache import MetricsCache
+from scripts.sql_metrics import refresh_materialized_dashboard
+from scripts.index_advisor import IndexAdvisor, ESCANEO_COMPLETO, FILESORT
+
+
+def test_migracion_crea_indices_faltantes(sqlite_engine):
+    """La migración crea solo los índices que faltan y es idempotente"""
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_entregables_empleado_actividad_estado"))
+        connection.execute(text("DROP INDEX ix_evaluacion_calidad_entregable"))
+
+    assert migrate_indexes(sqlite_engine) == ['ix_entregables_empleado_actividad_estado',
+                                              'ix_evaluacion_calidad_entregable']
+    assert migrate_indexes(sqlite_engine) == []
+    indices = {i['name']: i['column_names'] for i in inspect(sqlite_engine).get_indexes('entregables')}
+    assert indices['ix_entregables_empleado_actividad_estado'] == ['id_empleado', 'id_actividad', 'estado']
+
+
+def test_migracion_sigue_si_un_indice_falla(sqlite_engine, capsys):
+    """Un índice que no se puede crear se informa y no impide crear los demás"""
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_entregables_fecha_entrega"))
+        connection.execute(text("DROP INDEX ix_evaluacion_calidad_entregable"))
+        # El nombre ya lo usa otro índice: CREATE INDEX falla
+        connection.execute(text("CREATE INDEX ix_entregables_fecha_entrega ON proyectos (cliente)"))
+
+    assert migrate_indexes(sqlite_engine) == ['ix_evaluacion_calidad_entregable']
+    salida = capsys.readouterr().out
+    assert 'Error al crear el índice ix_entregables_fecha_entrega' in salida
+    assert 'Índices no creados (1): ix_entregables_fecha_entrega' in salida
+
+
+def test_migracion_con_capturas_repetidas(sqlite_engine):
+    """Los índices de las claves de ingesta no son únicos: se crean aunque ya haya repetidos"""
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_capturas_trabajo_hash"))
+        connection.execute(text(
+            "INSERT INTO capturas_trabajo (id_empleado, tipo, ruta_imagen, fecha_hora, hash_archivo) "
+            "VALUES ('EM01', 'Inicio', '/a.png', '2025-05-01 09:00:00', 'h1'), "
+            "('EM01', 'Inicio', '/b.png', '2025-05-01 09:05:00', 'h1')"))
+    assert migrate_indexes(sqlite_engine) == ['ix_capturas_trabajo_hash']
+
+
+def test_consulta_de_repetidos_para_indices_unicos(sqlite_engine):
+    """La consulta del dry-run encuentra los valores que impedirían crear un índice único"""
+    tabla = Table('eventos_prueba', MetaData(), Column('id', Integer, primary_key=True),
+                  Column('clave', String(20), nullable=False), Column('origen', String(20)))
+    indice = Index('uq_eventos_prueba', tabla.c.clave, tabla.c.origen, unique=True)
+    tabla.create(sqlite_engine)
+    indice.drop(sqlite_engine)
+    with sqlite_engine.begin() as connection:
+        connection.execute(tabla.insert(), [
+            {'clave': 'a', 'origen': 'x'}, {'clave': 'a', 'origen': 'x'},
+            {'clave': 'b', 'origen': None}, {'clave': 'b', 'origen': None}, {'clave': 'c', 'origen': 'x'}])
+        repetidos = connection.execute(text(duplicate_check_sql(indice, sqlite_engine.dialect))).all()
+    assert [tuple(f) for f in repetidos] == [('a', 'x', 2)]
+
+
+def test_migracion_sobre_esquema_vacio(tmp_path):
+    """Sobre una base vacía la migración crea todas las tablas y el panel materializado funciona"""
+    engine = create_local_engine(str(tmp_path))
+    tablas, indices = migrate_schema(engine)
+    assert {'resumen_tiempo_diario', 'control_resumenes', 'panel_control'} <= set(tablas)
+    assert indices == []
+    assert migrate_schema(engine) == ([], [])
+
+    assert refresh_materialized_dashboard(engine) is True
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM panel_control")).scalar() == 0
+    assert MetricsCache(disk=False).markers(engine)['panel_control'][0] == 0
+    engine.dispose()
+
+
+def test_explain_sin_escaneos_y_regresiones(sqlite_engine, tmp_path):
+    """Con los índices no hay escaneos completos; al quitar uno aparece como regresión"""
+    advisor = IndexAdvisor(sqlite_engine)
+    consultas = advisor.capture_queries()
+    assert 'productividad_empleado:registro_tiempo' in consultas
+    assert 'porcentaje_aprobados:registro_tiempo' not in consultas
+
+    planes, hallazgos = advisor.review()
+    assert set(planes) == set(consultas)
+    assert not [h for h in hallazgos if h.kind == ESCANEO_COMPLETO]
+    assert all(h.kind == FILESORT for h in hallazgos)
+
+    linea_base = str(tmp_path / 'explain_baseline.json')
+    advisor.save_baseline(hallazgos, linea_base)
+    assert advisor.regressions(hallazgos, advisor.load_baseline(linea_base)) == []
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_registro_tiempo_empleado_actividad_fecha"))
+        connection.execute(text("DROP INDEX ix_registro_tiempo_actividad_empleado"))
+    # sqlite3 reutiliza los EXPLAIN ya preparados aunque cambie el esquema
+    sqlite_engine.dispose()
+    _, hallazgos = advisor.review()
+    nuevos = advisor.regressions(hallazgos, advisor.load_baseline(linea_base))
+    assert {h.metric for h in nuevos} == {'tiempo_por_tarea:registro_tiempo', 'tiempo_proyecto:registro_tiempo',
+                                          'productividad_empleado:registro_tiempo', 'datos_dashboard:registro_tiempo'}
+    assert all(h.kind == ESCANEO_COMPLETO and h.table == 'registro_tiempo' for h in nuevos)
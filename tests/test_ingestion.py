@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+from datetime import date, time
+
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, func, select
+from sqlalchemy.orm import Session
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.entities import RegistroTiempo, RegistroAplicacion, CapturaTrabajo
+from scripts.ingestion import BulkIngestor, INGEST_TABLES, TableSpec
+
+
+def test_ingesta_de_registros_de_tiempo(sqlite_engine):
+    """Se validan los eventos, se descartan los repetidos y se guardan con los tipos del modelo"""
+    eventos = [
+        {'id_empleado': 'EM01', 'id_actividad': 2, 'fecha': '2025-05-01',
+         'hora_inicio': '08:00:00', 'hora_fin': '12:30:00', 'aplicaciones_usadas': {'apps': ['Excel']}},
+        {'id_empleado': 'EM02', 'id_actividad': '3', 'fecha': date(2025, 5, 1),
+         'hora_inicio': time(22, 0), 'hora_fin': '02:00:00', 'ubicacion': 'Remoto'},
+        # Repetido dentro del lote y repetido de un registro ya guardado (conftest)
+        {'id_empleado': 'EM01', 'id_actividad': 2, 'fecha': '2025-05-01',
+         'hora_inicio': '08:00:00', 'hora_fin': '13:00:00'},
+        {'id_empleado': 'EM01', 'id_actividad': 1, 'fecha': '2025-04-01',
+         'hora_inicio': '09:00:00', 'hora_fin': '13:00:00'},
+        # Inválidos
+        {'id_empleado': '', 'id_actividad': 1, 'fecha': '2025-05-02', 'hora_inicio': '08:00:00', 'hora_fin': '09:00:00'},
+        {'id_empleado': 'EM03', 'id_actividad': 1, 'fecha': '2025-02-30', 'hora_inicio': '08:00:00', 'hora_fin': '09:00:00'},
+        {'id_empleado': 'EM03', 'id_actividad': 1.5, 'fecha': '2025-05-02', 'hora_inicio': '08:00:00', 'hora_fin': '09:00:00'},
+        {'id_empleado': 'EM03', 'id_actividad': 1, 'fecha': '2025-05-02', 'hora_inicio': '25:00:00', 'hora_fin': '09:00:00'},
+        {'id_empleado': 'EMPLEADO', 'id_actividad': 1, 'fecha': '2025-05-02', 'hora_inicio': '08:00:00', 'hora_fin': '09:00:00'},
+    ]
+    resultado = BulkIngestor(sqlite_engine, batch_size=4).ingest_time_records(eventos)
+    assert (resultado.received, resultado.inserted, resultado.duplicates, resultado.invalid) == (9, 2, 2, 5)
+    assert resultado.batches == 3
+    assert sorted(resultado.rejected['motivo']) == [
+        'fecha: formato', 'hora_inicio: formato', 'id_actividad: formato',
+        'id_empleado: longitud', 'id_empleado: obligatorio']
+
+    with Session(sqlite_engine) as session:
+        nuevos = session.scalars(select(RegistroTiempo).where(RegistroTiempo.id_registro > 5)
+                                 .order_by(RegistroTiempo.id_registro)).all()
+        assert [(r.id_empleado, r.id_actividad, r.fecha, r.hora_inicio, r.hora_fin) for r in nuevos] == [
+            ('EM01', 2, date(2025, 5, 1), time(8), time(12, 30)),
+            ('EM02', 3, date(2025, 5, 1), time(22), time(2))]
+        assert nuevos[0].aplicaciones_usadas == {'apps': ['Excel']}
+
+    again = BulkIngestor(sqlite_engine).ingest_time_records(eventos[:2])
+    assert (again.inserted, again.duplicates) == (0, 2)
+
+
+def test_ingesta_ndjson_de_capturas_y_aplicaciones(sqlite_engine, tmp_path):
+    """Las capturas se depuran por hash_archivo y los intervalos por su clave natural"""
+    archivo = tmp_path / 'capturas.ndjson'
+    capturas = [{'id_empleado': 'EM01', 'tipo': tipo, 'ruta_imagen': f'/capturas/{i}.png',
+                 'fecha_hora': f'2025-05-01T0{i}:00:00', 'hash_archivo': f'hash{i % 3}'}
+                for i, tipo in enumerate(['Inicio', 'Final', 'Inicio', 'Final'])]
+    lineas = [json.dumps(c) for c in capturas] + ['{no es json', '',
+                                                  json.dumps({**capturas[0], 'tipo': 'Otro', 'hash_archivo': 'x'})]
+    archivo.write_text('\n'.join(lineas), encoding='utf-8')
+
+    ingestor = BulkIngestor(sqlite_engine, batch_size=2)
+    resultado = ingestor.ingest_screenshots(str(archivo))
+    assert (resultado.received, resultado.inserted, resultado.duplicates, resultado.invalid) == (6, 3, 1, 2)
+    assert sorted(resultado.rejected['motivo']) == ['JSON inválido', 'tipo: formato']
+
+    intervalos = ({'id_empleado': 'EM02', 'fecha': '2025-05-01', 'hora_inicio': f'09:0{i % 2}:00',
+                   'hora_fin': '09:30:00', 'nombre_aplicacion': 'Excel'} for i in range(5))
+    resultado = ingestor.ingest_app_logs(intervalos)
+    assert (resultado.inserted, resultado.duplicates) == (2, 3)
+
+    with sqlite_engine.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(CapturaTrabajo)).scalar() == 3
+        estados = connection.execute(select(RegistroAplicacion.estado)).scalars().all()
+    assert estados == ['Activo', 'Activo']
+
+
+def test_rango_de_enteros_solo_en_claves(sqlite_engine, monkeypatch):
+    """Los identificadores empiezan en 1; los demás enteros solo tienen que caber en INT"""
+    metadata = MetaData()
+    Table('actividades', metadata, Column('id_actividad', Integer, primary_key=True))
+    tabla = Table('ajustes_prueba', metadata, Column('id_ajuste', Integer, primary_key=True),
+                  Column('id_actividad', Integer, ForeignKey('actividades.id_actividad')),
+                  Column('clave', String(10), nullable=False), Column('minutos', Integer))
+    tabla.create(sqlite_engine)
+    monkeypatch.setitem(INGEST_TABLES, 'ajustes_prueba',
+                        TableSpec(type('Ajuste', (), {'__table__': tabla}), ['clave']))
+
+    eventos = [{'clave': 'a', 'id_actividad': 1, 'minutos': 0},
+               {'clave': 'b', 'id_actividad': 2, 'minutos': -15},
+               {'clave': 'c', 'id_actividad': 0, 'minutos': 5},
+               {'clave': 'd', 'id_actividad': 1, 'minutos': 2 ** 31}]
+    resultado = BulkIngestor(sqlite_engine).ingest('ajustes_prueba', eventos)
+    assert (resultado.inserted, resultado.invalid) == (2, 2)
+    assert sorted(resultado.rejected['motivo']) == ['id_actividad: formato', 'minutos: formato']
+    with sqlite_engine.connect() as connection:
+        assert connection.execute(select(tabla.c.clave, tabla.c.minutos)
+                                  .order_by(tabla.c.clave)).all() == [('a', 0), ('b', -15)]
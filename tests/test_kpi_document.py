@@ -0,0 +1,140 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scripts.generate_deliverables as generate_deliverables
+
+ESPERADO = os.path.join(os.path.dirname(__file__), 'datos', 'kpi_document_esperado.md')
+
+
+class FechaFija(datetime):
+    """datetime con un now() fijo para que el documento sea reproducible"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 5, 1, 8, 30, 0)
+
+
+def datos_kpi(n=2000, empleados=120, seed=7):
+    """Dataset unificado sintético con empates, nulos y registros sin horas"""
+    rng = np.random.default_rng(seed)
+    proyecto = rng.integers(1, 9, n)
+    total = rng.integers(0, 6, n)
+    rechazados = np.minimum(rng.integers(0, 3, n), total)
+    tasa = np.where(total > 0, rechazados / np.maximum(total, 1) * 100, np.nan)
+    df = pd.DataFrame({
+        'id_empleado': [f'EM{e:03d}' for e in rng.integers(1, empleados + 1, n)],
+        # Cuartos de hora: muchos empleados empatan en el total
+        'horas_trabajadas': np.where(rng.random(n) < 0.05, 0.0, rng.integers(0, 40, n) / 4),
+        'id_proyecto': proyecto,
+        'nombre_proyecto': [f'Proyecto {p}' for p in proyecto],
+        'entregables_rechazados': rechazados.astype(float),
+        'tasa_rechazo': tasa,
+        'total_entregables': total.astype(float),
+    })
+    # Un empleado sin entregables: su tasa de rechazo media es nula
+    df.loc[n - 1, ['id_empleado', 'total_entregables', 'entregables_rechazados', 'tasa_rechazo']] = \
+        ['EM999', 0.0, 0.0, np.nan]
+    return df
+
+
+def test_documento_identico_al_esperado(tmp_path, monkeypatch):
+    """El documento es idéntico byte a byte al de referencia, con tipos compactos o sin ellos"""
+    from utils.dtype_policy import DtypePolicy
+
+    monkeypatch.setattr(generate_deliverables, 'datetime', FechaFija)
+    with open(ESPERADO, 'rb') as f:
+        esperado = f.read()
+    for nombre, df in [('objetos', datos_kpi()), ('compacto', DtypePolicy().apply(datos_kpi()))]:
+        ruta = generate_deliverables.generate_kpi_document(df, output_dir=str(tmp_path / nombre))
+        assert os.path.basename(ruta) == 'kpi_document_20250501.md'
+        with open(ruta, 'rb') as f:
+            assert f.read() == esperado, nombre
+
+
+def test_secciones_segun_columnas_disponibles():
+    """Solo se calculan los KPIs cuyas columnas existen y coinciden con un groupby por sección"""
+    from scripts.kpi_engine import compute_kpis, render_markdown
+
+    df = datos_kpi(n=300, empleados=20).drop(columns=['tasa_rechazo', 'nombre_proyecto'])
+    resultado = compute_kpis(df, FechaFija.now())
+    assert list(resultado.empleados.columns) == [
+        'horas_trabajadas', 'entregables_rechazados', 'entregables_por_hora']
+    assert resultado.proyectos is None
+
+    por_empleado = df.groupby('id_empleado')
+    pd.testing.assert_series_equal(resultado.empleados['horas_trabajadas'],
+                                   por_empleado['horas_trabajadas'].sum())
+    esperado = (df['total_entregables'] / df['horas_trabajadas']).where(df['horas_trabajadas'] > 0, 0)
+    pd.testing.assert_series_equal(resultado.empleados['entregables_por_hora'],
+                                   esperado.groupby(df['id_empleado']).mean(), check_names=False)
+
+    documento = render_markdown(resultado)
+    assert '### 1.2 Estadísticas' in documento and '### 3.1 Entregables por Hora' in documento
+    assert '### 1.3' not in documento and '### 2.2' not in documento
+
+
+def test_formatos_html_y_json_desde_el_mismo_resultado(tmp_path, monkeypatch):
+    """Cada formato sale del mismo KpiResult; el Markdown no cambia sin gráficos"""
+    import json
+    import pytest
+
+    monkeypatch.setattr(generate_deliverables, 'datetime', FechaFija)
+    ruta = generate_deliverables.generate_kpi_document(
+        datos_kpi(), output_dir=str(tmp_path), formats=('md', 'html', 'json'))
+    with open(ruta, 'rb') as f, open(ESPERADO, 'rb') as esperado:
+        assert f.read() == esperado.read()
+
+    with open(tmp_path / 'kpi_document_20250501.json', encoding='utf-8') as f:
+        documento = json.load(f)
+    assert documento['generado'] == '2025-05-01T08:30:00'
+    assert list(documento['tablas']) == ['horas_por_empleado', 'horas_por_proyecto', 'rechazos_por_empleado',
+                                         'tasa_rechazo', 'entregables_por_hora']
+    assert documento['tablas']['horas_por_empleado'][0] == {'id_empleado': 'EM106', 'horas_trabajadas': 144.75}
+    assert documento['tablas']['tasa_rechazo'][-1] == {'id_empleado': 'EM999', 'tasa_rechazo': None}
+    assert documento['graficos'] == {}
+
+    html = (tmp_path / 'kpi_document_20250501.html').read_text(encoding='utf-8')
+    assert html.count('<table>') == 5 and html.count('<img') == 0
+    assert '<tr><td>EM106</td><td class="num">144.75</td></tr>' in html
+
+    with pytest.raises(ValueError):
+        generate_deliverables.generate_kpi_document(datos_kpi(n=10), output_dir=str(tmp_path), formats=('pdf',))
+
+
+def test_graficos_en_cache_por_contenido(tmp_path):
+    """Solo se vuelven a dibujar los gráficos cuyos datos cambiaron"""
+    from scripts.kpi_charts import ChartRenderer
+    from scripts.kpi_engine import compute_kpis, RENDERERS
+
+    cache = str(tmp_path / 'cache')
+    df = datos_kpi(n=300, empleados=20)
+    primero = ChartRenderer(cache_dir=cache, max_workers=2)
+    graficos = primero.render(compute_kpis(df, FechaFija.now()), str(tmp_path / 'dia1'))
+    assert sorted(graficos) == ['entregables_por_hora', 'horas_por_empleado', 'horas_por_proyecto',
+                                'tasa_rechazo']
+    assert primero.stats == {'dibujados': 4, 'en_cache': 0, 'errores': 0}
+    for ruta in graficos.values():
+        with open(tmp_path / 'dia1' / ruta, 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+
+    # Con los mismos datos se reutiliza todo; si solo cambia la tasa de rechazo, solo ese gráfico
+    segundo = ChartRenderer(cache_dir=cache, max_workers=2)
+    assert segundo.render(compute_kpis(df, FechaFija.now()), str(tmp_path / 'dia2')) == graficos
+    assert segundo.stats == {'dibujados': 0, 'en_cache': 4, 'errores': 0}
+    df['tasa_rechazo'] = df['tasa_rechazo'] / 2
+    resultado = compute_kpis(df, FechaFija.now())
+    tercero = ChartRenderer(cache_dir=cache, max_workers=2)
+    nuevos = tercero.render(resultado, str(tmp_path / 'dia3'))
+    assert tercero.stats == {'dibujados': 1, 'en_cache': 3, 'errores': 0}
+    assert nuevos['tasa_rechazo'] != graficos['tasa_rechazo']
+
+    documento = RENDERERS['md'].render(resultado, nuevos)
+    assert f"![2.2 Tasa de Rechazo por Empleado (%)]({nuevos['tasa_rechazo']})" in documento
+    assert RENDERERS['html'].render(resultado, nuevos).count('<img') == 4
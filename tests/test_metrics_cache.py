@@ -0,0 +1,48 @@
+import os
+import sys
+from datetime import date, time
+
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import registro_tiempo
+from models.entities import RegistroTiempo
+from scripts.daily_rollup import refresh_daily_rollup
+from scripts.metrics_cache import MetricsCache
+from scripts.sql_metrics import ProductivityMetrics
+
+
+def test_cache_en_memoria_y_disco(sqlite_engine, tmp_path):
+    """Sin cambios en las tablas el resultado sale de la caché (memoria y luego disco)"""
+    refresh_daily_rollup(sqlite_engine)
+    cache = MetricsCache(str(tmp_path), marker_ttl=0)
+    metrics = ProductivityMetrics(sqlite_engine, cache=cache)
+
+    esperado = metrics.get_dashboard_data()
+    pd.testing.assert_frame_equal(metrics.get_dashboard_data(), esperado)
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits_memoria'] == 1
+
+    # Otra instancia (otro proceso) reutiliza el nivel de disco
+    otra = MetricsCache(str(tmp_path), marker_ttl=0)
+    pd.testing.assert_frame_equal(
+        ProductivityMetrics(sqlite_engine, cache=otra).get_dashboard_data(), esperado)
+    assert otra.stats()['hits_disco'] == 1
+
+
+def test_invalidacion_por_marcadores(sqlite_engine, tmp_path):
+    """Un registro nuevo cambia los marcadores y fuerza a recalcular"""
+    cache = MetricsCache(str(tmp_path), marker_ttl=0)
+    metrics = ProductivityMetrics(sqlite_engine, use_rollup=False, cache=cache)
+    antes = metrics.get_project_time_investment()
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(RegistroTiempo.__table__.insert(), [
+            registro_tiempo(6, 'EM01', 1, date(2025, 4, 7), time(8), time(10)),
+        ])
+    despues = metrics.get_project_time_investment()
+
+    assert cache.stats()['misses'] == 2
+    assert despues['total_horas_trabajadas'].sum() == antes['total_horas_trabajadas'].sum() + 2
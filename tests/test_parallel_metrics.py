@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.daily_rollup import refresh_daily_rollup
+from scripts.parallel_metrics import ParallelMetricsRunner, METRIC_QUERIES
+from scripts.sql_metrics import ProductivityMetrics
+
+
+class MetricasLentas(ProductivityMetrics):
+    """Consultas simuladas con latencia y fallos"""
+
+    def get_approved_deliverables_percentage(self):
+        time.sleep(0.3)
+        return pd.DataFrame({'a': [1, 2]})
+
+    def get_average_time_per_task(self):
+        time.sleep(0.3)
+        return pd.DataFrame({'a': [1]})
+
+    def get_deliverable_quality_metrics(self):
+        raise RuntimeError("consulta rota")
+
+    def get_project_time_investment(self):
+        time.sleep(5)
+        return pd.DataFrame({'a': [1]})
+
+
+def test_resultados_iguales_a_secuencial(sqlite_engine):
+    """El ejecutor paralelo devuelve lo mismo que llamar a cada método"""
+    refresh_daily_rollup(sqlite_engine)
+    metrics = ProductivityMetrics(sqlite_engine)
+    resultados = ParallelMetricsRunner(metrics, max_workers=4).run()
+
+    assert list(resultados) == list(METRIC_QUERIES)
+    for name, method in METRIC_QUERIES.items():
+        assert resultados[name].ok, resultados[name]
+        assert resultados[name].rows > 0
+        pd.testing.assert_frame_equal(resultados[name].df, getattr(metrics, method)())
+
+
+def test_aislamiento_de_fallos_y_tiempo_limite(sqlite_engine):
+    """Un error o una consulta agotada no descartan las demás métricas"""
+    queries = {k: METRIC_QUERIES[k] for k in
+               ['porcentaje_aprobados', 'tiempo_por_tarea', 'calidad_entregables', 'tiempo_proyecto']}
+    inicio = time.perf_counter()
+    resultados = ParallelMetricsRunner(MetricasLentas(sqlite_engine), max_workers=4,
+                                       timeout=1, queries=queries).run()
+    total = time.perf_counter() - inicio
+
+    assert resultados['porcentaje_aprobados'].rows == 2
+    assert resultados['tiempo_por_tarea'].ok
+    assert isinstance(resultados['calidad_entregables'].error, RuntimeError)
+    assert isinstance(resultados['tiempo_proyecto'].error, TimeoutError)
+    # Las dos consultas de 0.3s se solapan y la lenta se corta al segundo
+    assert resultados['porcentaje_aprobados'].seconds >= 0.3
+    assert total < 2
@@ -0,0 +1,55 @@
+import os
+import sys
+import threading
+import time
+
+from sqlalchemy import text
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.health import check_database, table_row_estimates
+from models.pooling import create_pooled_engine, pool_status
+
+
+def test_metricas_del_pool(tmp_path):
+    """Se cuentan checkouts, overflow y las esperas por una conexión libre"""
+    engine = create_pooled_engine(f"sqlite:///{tmp_path / 'pool.db'}",
+                                  pool_size=1, max_overflow=1, pool_timeout=5)
+    ocupada = threading.Event()
+
+    def retener():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            ocupada.set()
+            time.sleep(0.2)
+
+    hilos = [threading.Thread(target=retener) for _ in range(2)]
+    for hilo in hilos:
+        hilo.start()
+    ocupada.wait()
+    time.sleep(0.05)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    for hilo in hilos:
+        hilo.join()
+
+    estado = pool_status(engine)
+    assert estado['tamano'] == 1 and estado['max_overflow'] == 1
+    assert estado['checkouts'] == 3 and estado['en_uso'] == 0
+    assert estado['max_overflow_usado'] == 1
+    assert estado['esperas'] == 1 and estado['segundos_espera'] > 0.05
+
+    engine.dispose()
+    assert pool_status(engine)['checkouts'] == 3
+
+
+def test_verificacion_en_una_consulta(sqlite_engine, capsys):
+    """Las filas de todas las tablas (incluida gmadministracion) salen de una consulta"""
+    with sqlite_engine.connect() as connection:
+        filas = {(esquema, tabla): n for esquema, tabla, n in table_row_estimates(connection)}
+    assert filas[('gm_monitor_system', 'registro_tiempo')] == 5
+    assert filas[('gmadministracion', 'empleados')] == 3
+
+    assert check_database(sqlite_engine)
+    assert 'empleados: ~3 registros' in capsys.readouterr().out
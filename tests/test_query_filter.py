@@ -0,0 +1,79 @@
+import contextlib
+import io
+import os
+import sys
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.entities import MetricaProductividad
+from models.query_filter import QueryFilter
+from scripts.data_standardization import DataStandardizer
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+from scripts.index_advisor import IndexAdvisor
+from scripts.sql_metrics import ProductivityMetrics
+
+
+def generar(engine):
+    with contextlib.redirect_stdout(io.StringIO()):
+        SyntheticDataGenerator(engine, registros=3000, seed=7).generate()
+
+
+def test_metricas_filtradas_coinciden_con_la_extraccion(sqlite_engine):
+    """Las métricas de un mes y un cliente salen de las mismas filas que la extracción filtrada"""
+    generar(sqlite_engine)
+    semana = QueryFilter.week('2025-06-11')
+    assert (semana.fecha_desde, semana.fecha_hasta) == (date(2025, 6, 9), date(2025, 6, 15))
+    mes = QueryFilter('2025-06-01', '2025-06-30', clientes='Cliente 3')
+
+    standardizer = DataStandardizer(sqlite_engine, filters=mes)
+    tiempo = standardizer.get_standardized_time_records()
+    actividades = standardizer.get_activities_data()
+    assert set(actividades['cliente']) == {'Cliente 3'}
+    assert tiempo['fecha'].between(date(2025, 6, 1), date(2025, 6, 30)).all()
+    assert set(tiempo['id_actividad']) <= set(actividades['id_actividad'])
+    entregables = standardizer.get_deliverables_data()
+    assert len(entregables) and entregables['fecha_entrega'].between('2025-06-01', '2025-07-01').all()
+
+    horas = tiempo.merge(actividades, on='id_actividad').groupby(
+        'nombre_proyecto', observed=True)['horas_trabajadas'].sum()
+    for use_rollup in (True, False):
+        metricas = ProductivityMetrics(sqlite_engine, use_rollup=use_rollup)
+        proyectos = metricas.get_project_time_investment(filters=mes).set_index('nombre_proyecto')
+        assert proyectos['total_horas_trabajadas'].astype(float).to_dict() == pytest.approx(
+            {str(k): v for k, v in horas.items()})
+        aprobados = metricas.get_approved_deliverables_percentage(filters=mes)
+        assert aprobados['total_entregables'].sum() == len(
+            entregables[entregables['id_actividad'].isin(actividades['id_actividad'])])
+
+    # Sin filtro se recorre todo el historial
+    todo = ProductivityMetrics(sqlite_engine).get_project_time_investment()
+    assert todo['total_horas_trabajadas'].sum() > horas.sum()
+
+
+def test_periodo_usa_indices_y_se_guarda(sqlite_engine):
+    """Las consultas de un periodo buscan por fecha en el índice y se guardan en metricas_productividad"""
+    generar(sqlite_engine)
+    semana = QueryFilter.week('2025-06-11')
+    advisor = IndexAdvisor(sqlite_engine, filters=semana)
+    planes, _ = advisor.review()
+    for nombre in ('tiempo_por_tarea', 'tiempo_por_tarea:registro_tiempo', 'rechazo_proyecto'):
+        detalle = ' '.join(planes[nombre]['detail'])
+        assert 'SEARCH' in detalle and '_fecha' in detalle, detalle
+
+    metricas = ProductivityMetrics(sqlite_engine)
+    assert metricas.save_period_metrics(QueryFilter('2025-06-01')) is False
+    assert metricas.save_period_metrics(semana) is True
+    assert metricas.save_period_metrics(semana) is True
+    with sqlite_engine.connect() as connection:
+        filas = connection.execute(select(
+            MetricaProductividad.periodo_inicio, MetricaProductividad.periodo_fin,
+            MetricaProductividad.horas_trabajadas)).all()
+    assert {(f.periodo_inicio, f.periodo_fin) for f in filas} == {(date(2025, 6, 9), date(2025, 6, 15))}
+    horas = DataStandardizer(sqlite_engine, filters=semana).get_standardized_time_records()['horas_trabajadas']
+    assert abs(sum(float(f.horas_trabajadas) for f in filas) - horas.sum()) < 0.01 * len(filas)
+    assert len(filas) == len(metricas.get_period_metrics(semana))
@@ -0,0 +1,43 @@
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.data_standardization import DataStandardizer
+from scripts.generate_deliverables import KPI_COLUMNS
+from scripts.snapshot_store import UnifiedSnapshotStore
+
+
+def test_instantanea_conserva_tipos(sqlite_engine, tmp_path):
+    """Fechas, horas en segundos, categóricas y aplicaciones sobreviven a la instantánea"""
+    standardizer = DataStandardizer(sqlite_engine)
+    df = standardizer.create_unified_dataset()
+    apps = standardizer.standardize_app_usage(df)
+    store = UnifiedSnapshotStore(str(tmp_path))
+    store.save(df, '20250406', apps=apps)
+
+    cargado = store.load().sort_values('id_registro', ignore_index=True)
+    assert len(cargado) == len(df)
+    assert isinstance(cargado.loc[0, 'fecha'], date)
+    assert cargado['hora_inicio'].tolist() == df.sort_values('id_registro')['hora_inicio'].tolist()
+    assert isinstance(cargado['estado'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(store.load_app_usage(), apps)
+    pd.testing.assert_series_equal(cargado['horas_trabajadas'], df['horas_trabajadas'])
+
+
+def test_carga_filtrada_por_particiones(sqlite_engine, tmp_path):
+    """Los filtros de fecha y proyecto y la selección de columnas se aplican al leer"""
+    df = DataStandardizer(sqlite_engine).create_unified_dataset()
+    store = UnifiedSnapshotStore(str(tmp_path))
+    store.save(df, '20250406')
+
+    cargado = store.load(columns=KPI_COLUMNS, fecha_desde=date(2025, 4, 2),
+                         fecha_hasta=date(2025, 4, 3), proyectos=[1])
+    assert sorted(cargado.columns) == sorted(KPI_COLUMNS)
+    esperado = df[(df['id_proyecto'] == 1) &
+                  (df['fecha'] >= date(2025, 4, 2)) & (df['fecha'] <= date(2025, 4, 3))]
+    assert sorted(cargado['horas_trabajadas']) == sorted(esperado['horas_trabajadas'])
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.sql_metrics import ProductivityMetrics
+
+
+def test_porcentajes_sin_division_entera(sqlite_engine):
+    """Los porcentajes no se truncan a 0 en SQLite (división entera) y coinciden con MySQL"""
+    metricas = ProductivityMetrics(sqlite_engine)
+
+    aprobados = metricas.get_approved_deliverables_percentage().set_index('id_empleado')
+    assert aprobados['porcentaje_aprobados'].to_dict() == {'EM01': 50.0, 'EM02': 0.0}
+
+    calidad = metricas.get_deliverable_quality_metrics().set_index('id_empleado')
+    assert calidad.loc['EM01', ['pct_cumple_formato', 'pct_cumple_contenido',
+                                'pct_cumple_normativa']].tolist() == [100.0, 50.0, 50.0]
+    assert calidad.loc['EM02', 'pct_cumple_formato'] == 0.0
+
+    rechazo = metricas.get_project_rejection_rate()
+    assert rechazo[['id_proyecto', 'tasa_rechazo']].values.tolist() == [[1, 33.33]]
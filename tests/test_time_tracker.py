@@ -0,0 +1,50 @@
+import os
+import sys
+from datetime import time, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.time_tracker import TimeTracker
+
+
+def test_to_seconds_acepta_time_timedelta_y_cadenas():
+    """Los distintos formatos de hora producen los mismos segundos"""
+    esperado = [9 * 3600, 18 * 3600 + 30 * 60 + 15]
+    assert TimeTracker.to_seconds([time(9, 0), time(18, 30, 15)]).tolist() == esperado
+    assert TimeTracker.to_seconds(pd.Series(pd.to_timedelta(['09:00:00', '18:30:15']))).tolist() == esperado
+    assert TimeTracker.to_seconds([timedelta(hours=9), timedelta(hours=18, minutes=30, seconds=15)]).tolist() == esperado
+    assert TimeTracker.to_seconds(['09:00:00', '18:30:15']).tolist() == esperado
+
+
+def test_worked_seconds_cruce_de_medianoche():
+    """Si la hora de fin es menor que la de inicio se suma un día"""
+    inicio = TimeTracker.to_seconds([time(22, 0), time(9, 0), time(9, 0)])
+    fin = TimeTracker.to_seconds([time(2, 0), time(17, 0), time(9, 0)])
+    assert TimeTracker.worked_seconds(inicio, fin).tolist() == [4 * 3600, 8 * 3600, 0]
+
+
+def test_hora_fin_nula_no_es_turno_nocturno():
+    """Una hora nula da NaN en lugar de contarse como cruce de medianoche"""
+    horas = TimeTracker.calculate_worked_hours_columns([time(8, 0), time(8, 0)], [None, time(17, 0)])
+    assert np.isnan(horas[0]) and horas[1] == 9.0
+    # -1 es como DtypePolicy guarda las horas nulas
+    for fin in (pd.Series([None], dtype=object), pd.Series([-1], dtype='int32')):
+        assert np.isnan(TimeTracker.worked_seconds(TimeTracker.to_seconds([time(8, 0)]),
+                                                   TimeTracker.to_seconds(fin))).all()
+    assert TimeTracker.seconds_to_time([np.nan, 8 * 3600]).tolist() == [None, time(8, 0)]
+
+
+def test_seconds_to_hours_igual_a_round():
+    """El redondeo columnar coincide con round(segundos / 3600, 2) en todos los casos"""
+    segundos = np.arange(0, 2 * 86400)
+    esperado = [round(s / 3600, 2) for s in segundos.tolist()]
+    assert TimeTracker.seconds_to_hours(segundos).tolist() == esperado
+
+
+def test_calculate_worked_hours_escalar():
+    """La versión escalar usa el mismo motor"""
+    assert TimeTracker.calculate_worked_hours(time(23, 30), time(1, 0), None) == 1.5
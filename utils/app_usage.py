@@ -0,0 +1,96 @@
+import pandas as pd
+import numpy as np
+import json
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+APP_USAGE_COLUMNS = ['id_registro', 'app']
+
+
+class AppUsage:
+    @staticmethod
+    def _decode(value):
+        """Lista de aplicaciones de un valor de aplicaciones_usadas (None si no es válido).
+
+        Acepta {"apps": [...]}, una lista, y el JSON codificado dos veces con
+        el que llega la columna desde MySQL.
+        """
+        for _ in range(3):
+            if isinstance(value, (str, bytes)):
+                try:
+                    value = _loads(value)
+                except ValueError:
+                    return None
+            else:
+                break
+        if isinstance(value, dict):
+            value = value.get('apps', [])
+        if isinstance(value, list):
+            return [str(app) for app in value if app is not None]
+        return None
+
+    @staticmethod
+    def parse(values, ids):
+        """Convierte aplicaciones_usadas en una tabla larga (id_registro, app).
+
+        Cada texto JSON distinto se decodifica una sola vez y la expansión a
+        filas se hace con índices de numpy. `app` es categórica, sin columnas
+        object. Los valores que no son JSON válido se ignoran y se informa
+        cuántos hubo.
+        """
+        serie = pd.Series(values, copy=False)
+        ids = np.asarray(ids)
+        try:
+            codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        except TypeError:
+            # dict/list ya decodificados no son hashables: se normalizan a texto
+            serie = serie.map(lambda v: json.dumps(v, sort_keys=True) if isinstance(v, (dict, list)) else v)
+            codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+
+        listas = [AppUsage._decode(v) for v in unicos]
+        invalidos = np.isin(codigos, [i for i, apps in enumerate(listas) if apps is None]).sum()
+        if invalidos:
+            print(f"Se ignoraron {invalidos} valores de aplicaciones_usadas que no son JSON válido")
+
+        categorias = sorted({app for apps in listas if apps for app in apps})
+        posicion = {app: i for i, app in enumerate(categorias)}
+        # Códigos de todas las listas únicas concatenados, con su inicio y longitud
+        longitudes = np.array([len(apps) if apps else 0 for apps in listas] + [0], dtype=np.int64)
+        planos = np.fromiter((posicion[app] for apps in listas if apps for app in apps),
+                             dtype=np.int32, count=int(longitudes.sum()))
+        inicios = np.concatenate([[0], np.cumsum(longitudes)[:-1]])
+
+        # El centinela -1 de los nulos apunta a la lista vacía del final
+        por_fila = longitudes[codigos]
+        total = int(por_fila.sum())
+        desplazamiento = np.arange(total) - np.repeat(np.cumsum(por_fila) - por_fila, por_fila)
+        app_codes = planos[np.repeat(inicios[codigos], por_fila) + desplazamiento]
+
+        return pd.DataFrame({
+            'id_registro': np.repeat(ids, por_fila),
+            'app': pd.Categorical.from_codes(app_codes, categories=categorias),
+        })
+
+    @staticmethod
+    def hours_by_app(df_apps, df_tiempo, by=()):
+        """Horas y registros por aplicación (y por las columnas `by` de df_tiempo).
+
+        Cada registro aporta todas sus horas a cada aplicación que usó, ya que
+        las aplicaciones se usan en paralelo durante el registro.
+        """
+        by = list(by)
+        columnas = ['app'] + by + ['horas_trabajadas', 'total_registros']
+        if df_apps.empty or df_tiempo.empty:
+            return pd.DataFrame(columns=columnas)
+
+        tiempo = df_tiempo[['id_registro', 'horas_trabajadas'] + by].drop_duplicates('id_registro')
+        df = df_apps.merge(tiempo, on='id_registro', how='inner')
+        resultado = df.groupby(['app'] + by, observed=True).agg(
+            horas_trabajadas=('horas_trabajadas', 'sum'),
+            total_registros=('id_registro', 'count')).reset_index()
+        return resultado.sort_values('horas_trabajadas', ascending=False, ignore_index=True)[columnas]
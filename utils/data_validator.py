@@ -1,5 +1,76 @@
 import re
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+SEGUNDOS_DIA = 86400
+# Valores de ejemplo que guarda el informe por cada columna y regla
+MAX_EJEMPLOS = 5
+# Tipos inferidos (pd.api.types.infer_dtype) que ya cumplen cada regla de formato
+TIPOS_VALIDOS = {
+    'date': {'date', 'datetime', 'datetime64'},
+    'datetime': {'date', 'datetime', 'datetime64'},
+    'time': {'time', 'timedelta', 'timedelta64'},
+    'numeric': {'integer', 'floating', 'decimal', 'mixed-integer-float'},
+}
+
+
+class ValidationReport:
+    """Resultado de validar un DataFrame: filas válidas y errores por columna y regla.
+
+    `valid` es la máscara de las filas que cumplen todas las reglas; los
+    informes de varios bloques se acumulan con merge().
+    """
+
+    def __init__(self, total=0):
+        self.total = total
+        self.valid = np.ones(total, dtype=bool)
+        self.errors = {}
+        self.examples = {}
+
+    def add(self, columna, regla, validos, valores=None):
+        """Registra la máscara de una regla sobre una columna"""
+        fallan = ~np.asarray(validos, dtype=bool)
+        n = int(fallan.sum())
+        if not n:
+            return
+        self.valid &= ~fallan
+        clave = (columna, regla)
+        self.errors[clave] = self.errors.get(clave, 0) + n
+        ejemplos = self.examples.setdefault(clave, [])
+        if valores is not None and len(ejemplos) < MAX_EJEMPLOS:
+            muestra = pd.Series(valores, copy=False)[fallan].head(MAX_EJEMPLOS - len(ejemplos))
+            ejemplos.extend(muestra.tolist())
+
+    def merge(self, otro):
+        """Acumula el informe de otro bloque (sus filas van a continuación)"""
+        self.total += otro.total
+        self.valid = np.concatenate([self.valid, otro.valid])
+        for clave, n in otro.errors.items():
+            self.errors[clave] = self.errors.get(clave, 0) + n
+            ejemplos = self.examples.setdefault(clave, [])
+            ejemplos.extend(otro.examples.get(clave, [])[:MAX_EJEMPLOS - len(ejemplos)])
+        return self
+
+    @property
+    def invalid(self):
+        return int(self.total - self.valid.sum())
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def to_frame(self):
+        """Errores como DataFrame (columna, regla, filas_invalidas, ejemplos)"""
+        filas = [(columna, regla, n, self.examples.get((columna, regla), []))
+                 for (columna, regla), n in self.errors.items()]
+        return pd.DataFrame(filas, columns=['columna', 'regla', 'filas_invalidas', 'ejemplos'])
+
+    def __repr__(self):
+        errores = ", ".join(f"{c}: {r} ({n})" for (c, r), n in self.errors.items())
+        return f"ValidationReport({self.invalid}/{self.total} filas inválidas{'; ' + errores if errores else ''})"
 
 
 class DataValidator:
@@ -24,8 +95,7 @@ class DataValidator:
     @staticmethod
     def validate_email(email):
         """Valida un formato de correo electronico"""
-        pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-        return bool(re.match(pattern, email))
+        return bool(EMAIL_PATTERN.match(email))
 
     @staticmethod
     def validate_non_empty(value):
@@ -53,3 +123,135 @@ class DataValidator:
             return min_val <= num_val <= max_val
         except (ValueError, TypeError):
             return False
+
+    @staticmethod
+    def _unique_mask(values, valid_uniques):
+        """Máscara por fila a partir de la validez de los valores únicos de la columna.
+
+        `valid_uniques` recibe los valores únicos (sin nulos) y devuelve su
+        máscara; los nulos son inválidos.
+        """
+        codigos, unicos = pd.factorize(pd.Series(values, copy=False), use_na_sentinel=True)
+        validos = np.append(np.asarray(valid_uniques(unicos), dtype=bool), False)
+        return validos[codigos]
+
+    @staticmethod
+    def validate_date_column(values, format='%Y-%m-%d'):
+        """Máscara de los valores con formato de fecha correcto (date/datetime son válidos)"""
+        serie = pd.Series(values, copy=False)
+        # Columnas ya tipadas (las que devuelve la base de datos): basta con los nulos
+        if pd.api.types.is_datetime64_any_dtype(serie) or \
+                pd.api.types.infer_dtype(serie, skipna=True) in ('date', 'datetime'):
+            return serie.notna().to_numpy()
+
+        def validar(unicos):
+            texto = [v if isinstance(v, str) else None for v in unicos]
+            fechas = pd.to_datetime(pd.Series(texto, dtype=object), format=format, errors='coerce')
+            return fechas.notna().to_numpy() | [isinstance(v, (date, pd.Timestamp)) for v in unicos]
+        return DataValidator._unique_mask(values, validar)
+
+    @staticmethod
+    def validate_time_column(values, format='%H:%M:%S'):
+        """Máscara de los valores con formato de hora correcto (time/timedelta son válidos).
+
+        Los enteros se toman como segundos desde medianoche (ver
+        utils/dtype_policy.py) y son válidos en [0, 86400).
+        """
+        serie = pd.Series(values, copy=False)
+        if pd.api.types.is_integer_dtype(serie):
+            segundos = serie.to_numpy(dtype=float, na_value=np.nan)
+            with np.errstate(invalid='ignore'):
+                return (segundos >= 0) & (segundos < SEGUNDOS_DIA)
+        if pd.api.types.is_timedelta64_dtype(serie) or \
+                pd.api.types.infer_dtype(serie, skipna=True) in ('time', 'timedelta'):
+            return serie.notna().to_numpy()
+
+        def validar(unicos):
+            texto = [v if isinstance(v, str) else None for v in unicos]
+            horas = pd.to_datetime(pd.Series(texto, dtype=object), format=format, errors='coerce')
+            return horas.notna().to_numpy() | [isinstance(v, (time, timedelta)) for v in unicos]
+        return DataValidator._unique_mask(values, validar)
+
+    @staticmethod
+    def validate_email_column(values):
+        """Máscara de los valores con formato de correo electrónico"""
+        return DataValidator._unique_mask(
+            values, lambda unicos: [isinstance(v, str) and EMAIL_PATTERN.match(v) is not None
+                                    for v in unicos])
+
+    @staticmethod
+    def validate_numeric_column(values):
+        """Máscara de los valores numéricos (o texto convertible a número)"""
+        serie = pd.Series(values, copy=False)
+        if pd.api.types.is_numeric_dtype(serie):
+            return serie.notna().to_numpy()
+        return pd.to_numeric(serie.astype(object), errors='coerce').notna().to_numpy()
+
+    @staticmethod
+    def validate_choice_column(values, choices):
+        """Máscara de los valores que están en `choices`"""
+        return pd.Series(values, copy=False).isin(list(choices)).to_numpy()
+
+    @staticmethod
+    def validate_non_empty_column(values):
+        """Máscara de los valores no nulos y, si son texto, no vacíos"""
+        serie = pd.Series(values, copy=False)
+        # Solo el texto puede estar vacío sin ser nulo
+        inferido = pd.api.types.infer_dtype(serie, skipna=True)
+        if inferido != 'categorical' and 'string' not in inferido and 'mixed' not in inferido:
+            return serie.notna().to_numpy()
+        return DataValidator._unique_mask(
+            values, lambda unicos: [not isinstance(v, str) or v.strip() != '' for v in unicos])
+
+    @staticmethod
+    def validate_range_column(values, min_val, max_val):
+        """Máscara de los valores numéricos dentro del rango [min_val, max_val]"""
+        serie = pd.Series(values, copy=False)
+        if not pd.api.types.is_numeric_dtype(serie):
+            serie = pd.to_numeric(serie.astype(object), errors='coerce')
+        numeros = serie.to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            return (numeros >= min_val) & (numeros <= max_val)
+
+    def validate_frame(self, df, rules):
+        """Valida las columnas de `df` y devuelve un ValidationReport.
+
+        `rules` asocia cada columna a sus reglas: 'non_empty', 'date',
+        'datetime', 'time', 'email', 'numeric', ('range', min, max) o
+        ('choice', valores). Salvo 'non_empty', los nulos cumplen las reglas.
+        """
+        report = ValidationReport(len(df))
+        for columna, reglas in rules.items():
+            if columna not in df.columns:
+                report.add(columna, 'ausente', np.zeros(len(df), dtype=bool))
+                continue
+            serie = df[columna]
+            nulos = serie.isna().to_numpy()
+            inferido = pd.api.types.infer_dtype(serie, skipna=True)
+            for regla in reglas:
+                nombre, *args = (regla,) if isinstance(regla, str) else regla
+                if nombre == 'non_empty':
+                    texto = inferido == 'categorical' or 'string' in inferido or 'mixed' in inferido
+                    report.add(columna, nombre, self.validate_non_empty_column(serie) if texto else ~nulos,
+                               serie)
+                    continue
+                if nulos.all() or inferido in TIPOS_VALIDOS.get(nombre, ()):
+                    continue
+                if nombre == 'date':
+                    validos = self.validate_date_column(serie, *args)
+                elif nombre == 'datetime':
+                    validos = self.validate_date_column(serie, format='ISO8601')
+                elif nombre == 'time':
+                    validos = self.validate_time_column(serie, *args)
+                elif nombre == 'email':
+                    validos = self.validate_email_column(serie)
+                elif nombre == 'numeric':
+                    validos = self.validate_numeric_column(serie)
+                elif nombre == 'range':
+                    validos = self.validate_range_column(serie, *args)
+                elif nombre == 'choice':
+                    validos = self.validate_choice_column(serie, *args)
+                else:
+                    raise ValueError(f"Regla de validación desconocida: {nombre}")
+                report.add(columna, nombre, validos | nulos, serie)
+        return report
@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+from pandas.api.types import union_categoricals
+from utils.time_tracker import TimeTracker
+
+# Tipos compactos por nombre de columna. Se aplican a cualquier DataFrame del
+# pipeline: las columnas que no existen en él se ignoran.
+DEFAULT_SCHEMA = {
+    # Enumeraciones y cadenas de baja cardinalidad repetidas en cada fila
+    'category': ['id_empleado', 'idempleado', 'nombres', 'apellidos', 'estado', 'prioridad',
+                 'estado_proyecto', 'ubicacion', 'cliente', 'nombre_proyecto', 'nombre_actividad',
+                 'clasificacion_calidad', 'id_evaluador'],
+    'int32': ['id_registro', 'id_actividad', 'id_proyecto', 'id_entregable', 'id_evaluacion',
+              'id_tipo_entregable'],
+    'int16': ['version', 'calificacion_general'],
+    'boolean': ['cumple_formato', 'cumple_contenido', 'cumple_normativa'],
+    # Horas como segundos desde medianoche (-1 si es nula), en lugar de datetime.time
+    'seconds': ['hora_inicio', 'hora_fin'],
+}
+
+
+class DtypePolicy:
+    """Aplica un esquema de tipos compactos a los DataFrames del pipeline"""
+
+    def __init__(self, schema=None):
+        self.schema = schema or DEFAULT_SCHEMA
+
+    @staticmethod
+    def _to_int(serie, tipo):
+        """Entero compacto; nullable (Int32/Int16) solo si la columna tiene nulos"""
+        numeros = pd.to_numeric(serie, errors='coerce')
+        if numeros.isna().any():
+            return numeros.astype(tipo.capitalize())
+        return numeros.astype(tipo)
+
+    @staticmethod
+    def _to_category(serie):
+        """Categórica con las categorías ordenadas, para que sea determinista"""
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            categorias = serie.cat.categories
+            if categorias.is_monotonic_increasing:
+                return serie
+            return serie.cat.reorder_categories(sorted(categorias))
+        return serie.astype('category')
+
+    def apply(self, df):
+        """Devuelve `df` con las columnas del esquema convertidas (en el mismo DataFrame)"""
+        if df is None or df.empty:
+            return df
+        for tipo, columnas in self.schema.items():
+            for columna in columnas:
+                if columna not in df.columns:
+                    continue
+                serie = df[columna]
+                if tipo == 'category':
+                    df[columna] = self._to_category(serie)
+                elif tipo in ('int32', 'int16'):
+                    if str(serie.dtype).lower() != tipo:
+                        df[columna] = self._to_int(serie, tipo)
+                elif tipo == 'boolean':
+                    if serie.dtype != 'boolean':
+                        df[columna] = serie.astype('boolean')
+                elif tipo == 'seconds':
+                    if not pd.api.types.is_integer_dtype(serie):
+                        segundos = TimeTracker.to_seconds(serie)
+                        df[columna] = np.where(np.isnan(segundos), -1, segundos).astype(np.int32)
+        return df
+
+    def restore_times(self, df):
+        """Copia de `df` con las horas en segundos de vuelta a datetime.time.
+
+        Para exportar (CSV) con el mismo formato HH:MM:SS que sin la política
+        de tipos; las horas nulas (-1) quedan vacías.
+        """
+        columnas = [c for c in self.schema.get('seconds', [])
+                    if df is not None and c in df.columns and pd.api.types.is_integer_dtype(df[c])]
+        if not columnas:
+            return df
+        return df.assign(**{c: TimeTracker.seconds_to_time(df[c].to_numpy()) for c in columnas})
+
+    def concat(self, frames):
+        """pd.concat que conserva las categóricas aunque cada bloque tenga otras categorías"""
+        frames = [f for f in frames if f is not None and not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0].reset_index(drop=True)
+
+        categoricas = {}
+        for columna in frames[0].columns:
+            series = [f[columna] for f in frames if columna in f.columns]
+            if len(series) == len(frames) and all(isinstance(s.dtype, pd.CategoricalDtype) for s in series):
+                categoricas[columna] = union_categoricals(series, sort_categories=True)
+
+        df = pd.concat([f.drop(columns=list(categoricas)) for f in frames], ignore_index=True)
+        for columna, valores in categoricas.items():
+            df[columna] = pd.Series(valores, index=df.index)
+        df = df[frames[0].columns.tolist() + [c for c in df.columns if c not in frames[0].columns]]
+        return self.apply(df)
+
+    @staticmethod
+    def memory_report(antes, despues):
+        """Bytes por fila de cada columna antes y después de compactar"""
+        filas = max(len(antes), 1)
+        memoria_antes = antes.memory_usage(deep=True, index=False)
+        memoria_despues = despues.memory_usage(deep=True, index=False)
+        reporte = pd.DataFrame({
+            'tipo_antes': antes.dtypes.astype(str),
+            'tipo_despues': despues.dtypes.reindex(antes.columns).astype(str),
+            'bytes_fila_antes': (memoria_antes / filas).round(1),
+            'bytes_fila_despues': (memoria_despues.reindex(antes.columns) / filas).round(1),
+        })
+        reporte.loc['TOTAL'] = ['', '', round(memoria_antes.sum() / filas, 1),
+                                round(memoria_despues.sum() / filas, 1)]
+        reporte['reduccion'] = (1 - reporte['bytes_fila_despues'] /
+                                reporte['bytes_fila_antes'].replace(0, np.nan)).round(3)
+        return reporte
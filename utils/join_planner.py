@@ -0,0 +1,99 @@
+import pandas as pd
+import numpy as np
+
+# Claves de las dimensiones y de los agregados de entregables en la tabla de hechos
+CLAVES_ENTREGABLES = ['id_empleado', 'id_actividad']
+DELIVERABLE_AGG_COLUMNS = ['total_entregables', 'calidad_promedio', 'entregables_aprobados',
+                           'entregables_rechazados']
+
+
+class JoinPlanner:
+    """Une dimensiones indexadas a una tabla de hechos sin encadenar pd.merge.
+
+    Cada dimensión se indexa una vez por su clave y sus columnas se llevan a
+    la tabla de hechos con take() sobre las posiciones encontradas, igual que
+    un merge left (mismo orden de filas, NaN donde no hay coincidencia). Si
+    la clave de una dimensión no es única se usa pd.merge, que multiplica las
+    filas como antes.
+    """
+
+    def __init__(self, fact):
+        """Inicializa el planificador sobre la tabla de hechos (no se modifica)"""
+        self.fact = fact
+        self.columnas = {c: fact[c] for c in fact.columns}
+        self._merges = []
+
+    @staticmethod
+    def _positions(fact_keys, dim_keys):
+        """Posición en la dimensión de cada fila de hechos (-1 si no existe)"""
+        if len(fact_keys) == 1:
+            clave, indice = fact_keys[0], pd.Index(dim_keys[0])
+            if isinstance(clave.dtype, pd.CategoricalDtype):
+                # Se busca cada categoría una sola vez y se expande con los códigos
+                por_categoria = indice.get_indexer(clave.cat.categories)
+                codigos = clave.cat.codes.to_numpy()
+                return np.where(codigos >= 0, por_categoria[codigos], -1)
+            return indice.get_indexer(clave)
+        indice = pd.MultiIndex.from_arrays(dim_keys)
+        return indice.get_indexer(pd.MultiIndex.from_arrays(fact_keys))
+
+    @staticmethod
+    def _is_unique(dim_keys):
+        if len(dim_keys) == 1:
+            return pd.Index(dim_keys[0]).is_unique
+        return pd.MultiIndex.from_arrays(dim_keys).is_unique
+
+    def join(self, dim, left_on, right_on=None, columns=None):
+        """Añade las columnas `columns` de `dim` (por defecto todas menos la clave común)"""
+        left_on = [left_on] if isinstance(left_on, str) else list(left_on)
+        right_on = left_on if right_on is None else (
+            [right_on] if isinstance(right_on, str) else list(right_on))
+        if columns is None:
+            # Como pd.merge: la clave solo se repite si tiene otro nombre en la dimensión
+            columns = [c for c in dim.columns if not (c in right_on and c in left_on)]
+
+        dim_keys = [dim[c].reset_index(drop=True) for c in right_on]
+        colisiones = set(columns) & set(self.columnas)
+        if self._merges or colisiones or not self._is_unique(dim_keys):
+            # Tras un merge que multiplica filas las posiciones ya no sirven
+            self._merges.append((dim, left_on, right_on, columns))
+            return self
+
+        posiciones = self._positions([self.columnas[c] for c in left_on], dim_keys)
+        for columna in columns:
+            serie = dim[columna]
+            arreglo = serie.array if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype) \
+                else serie.to_numpy()
+            valores = pd.api.extensions.take(arreglo, posiciones, allow_fill=True)
+            self.columnas[columna] = pd.Series(valores, index=self.fact.index, name=columna)
+        return self
+
+    def result(self):
+        """DataFrame con todas las uniones aplicadas, en el orden en que se pidieron"""
+        df = pd.DataFrame(self.columnas, index=self.fact.index).reset_index(drop=True)
+        for dim, left_on, right_on, columns in self._merges:
+            df = pd.merge(df, dim[list(dict.fromkeys(right_on + columns))],
+                          left_on=left_on, right_on=right_on, how='left')
+        return df
+
+    @staticmethod
+    def aggregate_deliverables(df_entregables):
+        """Entregables, calidad media, aprobados y rechazados por (empleado, actividad) en una pasada"""
+        estado = df_entregables['estado']
+        return df_entregables.assign(
+            aprobado=(estado == 'Aprobado').astype(np.int64),
+            rechazado=(estado == 'Rechazado').astype(np.int64),
+        ).groupby(CLAVES_ENTREGABLES, observed=True).agg(
+            total_entregables=('id_entregable', 'count'),
+            calidad_promedio=('score_calidad', 'mean'),
+            entregables_aprobados=('aprobado', 'sum'),
+            entregables_rechazados=('rechazado', 'sum'),
+        ).reset_index()
+
+    @staticmethod
+    def rejection_rate(total, rechazados):
+        """Porcentaje de rechazos; 0 si no hay entregables"""
+        total = pd.to_numeric(total).to_numpy(dtype=np.float64, na_value=np.nan)
+        rechazados = pd.to_numeric(rechazados).to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, rechazados / total * 100, 0.0)
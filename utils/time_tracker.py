@@ -1,21 +1,113 @@
 # Añadir/actualizar este archivo
 import pandas as pd
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import time, timedelta
+
+SEGUNDOS_DIA = 24 * 3600
 
 
 class TimeTracker:
     @staticmethod
-    def calculate_worked_hours(start_time, end_time, date):
-        """Calcula las horas trabajadas entre dos tiempos en una fecha"""
-        start_dt = datetime.combine(date, start_time)
-        end_dt = datetime.combine(date, end_time)
+    def _value_to_seconds(value):
+        """Convierte una hora (time, timedelta o 'HH:MM:SS') a segundos desde medianoche (NaN si es nula)"""
+        if value is None or (not isinstance(value, (time, timedelta, str)) and pd.isnull(value)):
+            return np.nan
+        if isinstance(value, time):
+            return value.hour * 3600 + value.minute * 60 + value.second
+        if isinstance(value, timedelta):
+            return int(value.total_seconds())
+        if isinstance(value, str):
+            partes = value.strip().split('.')[0].split(':')
+            horas, minutos = int(partes[0]), int(partes[1])
+            segundos = int(partes[2]) if len(partes) > 2 else 0
+            return horas * 3600 + minutos * 60 + segundos
+        return int(pd.Timedelta(value).total_seconds())
+
+    @staticmethod
+    def to_seconds(values):
+        """Convierte una columna de horas a un arreglo float64 de segundos desde medianoche.
+
+        Acepta Series/arreglos de datetime.time, timedelta (o timedelta64),
+        cadenas 'HH:MM:SS' y enteros que ya son segundos. Los nulos (y los
+        -1 con los que DtypePolicy guarda las horas nulas) se devuelven como
+        NaN. Como una columna de horas tiene como mucho 86400 valores
+        distintos, solo se convierten los valores únicos y el resultado se
+        expande con sus códigos.
+        """
+        serie = pd.Series(values, copy=False)
+        if pd.api.types.is_integer_dtype(serie):
+            # Ya son segundos (ver utils/dtype_policy.py)
+            segundos = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+            segundos[segundos < 0] = np.nan
+            return segundos
+        if pd.api.types.is_timedelta64_dtype(serie):
+            return serie.dt.total_seconds().to_numpy(dtype=np.float64)
+
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        segundos_unicos = np.fromiter(
+            (TimeTracker._value_to_seconds(v) for v in unicos),
+            dtype=np.float64, count=len(unicos))
+        # El centinela -1 de los nulos apunta al último elemento añadido
+        segundos_unicos = np.append(segundos_unicos, np.nan)
+        return segundos_unicos[codigos]
+
+    @staticmethod
+    def seconds_to_time(seconds):
+        """Convierte un arreglo de segundos desde medianoche a objetos datetime.time (None si es nulo)"""
+        segundos = np.asarray(seconds, dtype=np.float64)
+        codigos, unicos = pd.factorize(segundos, use_na_sentinel=True)
+        horas_unicas = np.array(
+            [time(s // 3600 % 24, s // 60 % 60, s % 60) if s >= 0 else None
+             for s in unicos.astype(np.int64).tolist()] + [None],
+            dtype=object)
+        return horas_unicas[codigos]
+
+    @staticmethod
+    def worked_seconds(start_seconds, end_seconds):
+        """Duración en segundos entre dos arreglos de horas.
+
+        Si la hora de fin es menor que la de inicio se asume que el trabajo
+        terminó al día siguiente (se suman 24 horas). Si falta alguna de las
+        dos horas (NaN) la duración es NaN, no un turno nocturno.
+        """
+        inicio = np.asarray(start_seconds, dtype=np.float64)
+        fin = np.asarray(end_seconds, dtype=np.float64)
+        return np.where(fin < inicio, fin + SEGUNDOS_DIA, fin) - inicio
+
+    @staticmethod
+    def seconds_to_hours(seconds):
+        """Convierte segundos a horas redondeadas a 2 decimales.
+
+        Da exactamente el mismo resultado que round(segundos / 3600, 2): el
+        redondeo se hace en aritmética entera (centésimas de hora = segundos / 36)
+        y solo los empates exactos (segundos % 36 == 18) se resuelven con round().
+        Los segundos nulos (NaN) dan NaN.
+        """
+        valores = np.asarray(seconds, dtype=np.float64)
+        nulos = np.isnan(valores)
+        segundos = np.where(nulos, 0, valores).astype(np.int64)
+        centesimas = (2 * segundos + 36) // 72
+        horas = centesimas / 100
+        horas[nulos] = np.nan
 
-        # Si la hora de fin es menor que la de inicio, se asume que terminó al día siguiente
-        if end_dt < start_dt:
-            end_dt += timedelta(days=1)
+        empates = np.flatnonzero(segundos % 36 == 18)
+        if len(empates):
+            horas[empates] = [round(s / 3600, 2) for s in segundos[empates].tolist()]
+        return horas
 
-        duration = (end_dt - start_dt).total_seconds() / 3600
-        return round(duration, 2)
+    @staticmethod
+    def calculate_worked_hours_columns(start_times, end_times):
+        """Calcula las horas trabajadas de columnas completas de horas de inicio y fin"""
+        return TimeTracker.seconds_to_hours(TimeTracker.worked_seconds(
+            TimeTracker.to_seconds(start_times), TimeTracker.to_seconds(end_times)))
+
+    @staticmethod
+    def calculate_worked_hours(start_time, end_time, date):
+        """Calcula las horas trabajadas entre dos tiempos en una fecha"""
+        # La fecha no cambia la duración: el cruce de medianoche lo resuelve worked_seconds
+        segundos = TimeTracker.worked_seconds(
+            TimeTracker._value_to_seconds(start_time), TimeTracker._value_to_seconds(end_time))
+        return float(TimeTracker.seconds_to_hours(np.atleast_1d(segundos))[0])
 
     @staticmethod
     def summarize_productivity(df_tiempo):
@@ -28,7 +120,7 @@ class TimeTracker:
             return pd.DataFrame()
 
         # Agrupar por empleado
-        resumen = df_tiempo.groupby('id_empleado').agg({
+        resumen = df_tiempo.groupby('id_empleado', observed=True).agg({
             'horas_trabajadas': 'sum',
             'id_registro': 'count'
         }).reset_index()